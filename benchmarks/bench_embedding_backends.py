@@ -0,0 +1,71 @@
+"""
+Benchmark de throughput (documentos/s) dos backends de embeddings.
+
+Gera textos no formato de VectorStore._prepare_rule_text e mede cada
+backend sem o cache de embeddings. O backend "openai" precisa de
+OPENAI_API_KEY válida ou de VECTOR_STORE_EMBEDDING_API_BASE apontando para
+um servidor compatível; o "onnx" roda local (modelo em
+VECTOR_STORE_ONNX_MODEL_DIR ou o all-MiniLM-L6-v2 do Chroma).
+
+Uso: python -m benchmarks.bench_embedding_backends [documentos] [backend ...]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+
+from src.config.settings import get_settings
+from src.repositories.vector_store.embedding_backends import create_embedding_function
+
+RULE_TEMPLATE = """Function: validarLimite{i}
+Description: Valida o limite de crédito do cliente {i}
+Type: business_rule
+Business Impact: high
+Code:
+bool validarLimite{i}(const Cliente& cliente, double valor) {{
+    if (valor > cliente.limite() * {factor}) {{
+        return false;
+    }}
+    return cliente.ativo();
+}}"""
+
+
+def build_documents(count: int):
+    return [RULE_TEMPLATE.format(i=i, factor=1 + i % 7) for i in range(count)]
+
+
+def bench_backend(backend: str, documents) -> float:
+    settings = get_settings().vector_store.model_copy(update={"embedding_backend": backend})
+    embedding_function, model_name = create_embedding_function(settings)
+
+    # Aquecimento: carga do modelo / abertura da conexão fora da medição
+    embedding_function(documents[:1])
+
+    start = time.perf_counter()
+    embeddings = embedding_function(documents)
+    elapsed = time.perf_counter() - start
+    assert len(embeddings) == len(documents)
+    return model_name, len(embeddings[0]), elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    backends = sys.argv[2:] or ["onnx", "openai"]
+    documents = build_documents(count)
+
+    print(f"Documentos: {count}")
+    for backend in backends:
+        try:
+            model_name, dimensions, elapsed = bench_backend(backend, documents)
+        except Exception as e:
+            print(f"{backend:>8}: indisponível ({str(e)})")
+            continue
+        print(f"{backend:>8}: {count / elapsed:8.1f} docs/s "
+              f"({elapsed:.2f} s, {model_name}, {dimensions} dimensões)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark do cálculo de números de linha no CppProjectLoader.
+
+Compara a contagem por prefixo (content[:pos].count('\\n')) com o LineIndex
+em um arquivo sintético de ~50k linhas com milhares de funções.
+
+Uso: python -m benchmarks.bench_line_index
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+
+from src.services.project_loader.cpp_loader import CppProjectLoader
+from src.services.project_loader.line_index import LineIndex
+
+FUNCTION_TEMPLATE = """
+bool validateRule{i}(int value) {{
+    if (value < {i}) {{
+        return false;
+    }}
+    return true;
+}}
+"""
+
+
+def build_content(target_lines: int = 50_000) -> str:
+    chunks = ['#include "rules.h"\n', 'namespace generated {\n']
+    lines = 2
+    i = 0
+    while lines < target_lines:
+        chunk = FUNCTION_TEMPLATE.format(i=i)
+        chunks.append(chunk)
+        lines += chunk.count('\n')
+        i += 1
+    chunks.append('}\n')
+    return ''.join(chunks)
+
+
+def match_positions(loader: CppProjectLoader, content: str):
+    patterns = [
+        loader._template_pattern,
+        loader._operator_pattern,
+        loader._class_pattern,
+        loader._function_pattern,
+    ]
+    return [match.start() for pattern in patterns for match in pattern.finditer(content)]
+
+
+def bench_prefix_count(content: str, positions) -> float:
+    start = time.perf_counter()
+    lines = [content[:pos].count('\n') + 1 for pos in positions]
+    elapsed = time.perf_counter() - start
+    return elapsed, lines
+
+
+def bench_line_index(content: str, positions) -> float:
+    start = time.perf_counter()
+    index = LineIndex(content)
+    lines = [index.line_of(pos) for pos in positions]
+    elapsed = time.perf_counter() - start
+    return elapsed, lines
+
+
+def main():
+    content = build_content()
+    loader = CppProjectLoader(workers=1)
+    positions = match_positions(loader, content)
+
+    prefix_time, prefix_lines = bench_prefix_count(content, positions)
+    index_time, index_lines = bench_line_index(content, positions)
+    assert prefix_lines == index_lines
+
+    print(f"Linhas: {content.count(chr(10)) + 1}, matches: {len(positions)}")
+    print(f"Contagem por prefixo: {prefix_time * 1000:.1f} ms")
+    print(f"LineIndex (bisect):   {index_time * 1000:.1f} ms")
+    print(f"Speedup: {prefix_time / index_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Benchmark de memória do CppProjectLoader em uma árvore sintética de 20k
+arquivos.
+
+Compara a memória retida por duas cargas da mesma árvore:
+- atual: componentes com slots e strings internadas;
+- baseline: registros no formato do loader original (um dict por
+  função/classe, sets para includes e dependências, strings não
+  internadas) mais o project_info que ele montava.
+
+Uso: python -m benchmarks.bench_loader_memory [quantidade_de_arquivos]
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("LOADER_CACHE_ENABLED", "false")
+
+from src.services.project_loader.cpp_loader import CppProjectLoader
+
+SOURCE_TEMPLATE = """#include "common.h"
+#include "module{module}.h"
+
+namespace legacy {{
+
+class Entity{i} : public Entity {{
+}};
+
+int counter{i} = 0;
+
+bool validateEntity{i}(const Entity& entity) {{
+    if (entity.id < 0) {{
+        return false;
+    }}
+    return true;
+}}
+
+double calculateTotal{i}(double value) {{
+    return value * 1.1;
+}}
+
+void processEntity{i}(Entity& entity) {{
+    entity.total = calculateTotal{i}(entity.total);
+}}
+
+}}
+"""
+
+
+def build_tree(root: str, file_count: int):
+    for i in range(file_count):
+        module = i % 200
+        directory = os.path.join(root, f"module{module}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"entity{i}.cpp"), "w") as f:
+            f.write(SOURCE_TEMPLATE.format(i=i, module=module))
+
+
+class BaselineComponent:
+    """
+    CppComponent do loader original: atributos em __dict__ e sets
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.type = 'header' if path.suffix in ['.h', '.hpp'] else 'source'
+        self.includes = set()
+        self.namespaces = set()
+        self.classes = []
+        self.functions = []
+        self.templates = []
+        self.operators = []
+        self.dependencies = set()
+        self.used_by = set()
+
+
+def _unshared(text):
+    """
+    Cópia nova da string, como as devolvidas por match.group() sem intern()
+    """
+    return text.encode().decode() if text is not None else None
+
+
+def baseline_load(root):
+    """
+    Carga no formato do loader original. A análise é a mesma do loader
+    atual (para comparar só a representação); cada registro é convertido
+    para dicts/sets com strings próprias, e o loader é descartado.
+    """
+    loader = CppProjectLoader(workers=1)
+    loader.load(root)
+
+    components = {}
+    for path, comp in loader.components.items():
+        baseline = BaselineComponent(Path(comp.path))
+        baseline.includes = {_unshared(i) for i in comp.includes}
+        baseline.namespaces = {_unshared(n) for n in comp.namespaces}
+        baseline.classes = [
+            {'name': _unshared(c.name), 'base_class': _unshared(c.base_class), 'line': c.line}
+            for c in comp.classes
+        ]
+        baseline.functions = [
+            {
+                'return_type': _unshared(f.return_type),
+                'name': _unshared(f.name),
+                'line': f.line,
+                'content': _unshared(f.content)
+            }
+            for f in comp.functions
+        ]
+        baseline.templates = [
+            {'type': _unshared(t.type), 'name': _unshared(t.name), 'line': t.line}
+            for t in comp.templates
+        ]
+        baseline.operators = [
+            {'operator': _unshared(o.operator), 'line': o.line}
+            for o in comp.operators
+        ]
+        baseline.dependencies = {_unshared(d) for d in comp.dependencies}
+        baseline.used_by = {_unshared(u) for u in comp.used_by}
+        components[_unshared(str(path))] = baseline
+    del loader
+
+    # project_info do loader original: listas novas, registros compartilhados
+    project_info = {
+        'components': [
+            {
+                'path': str(comp.path),
+                'type': comp.type,
+                'includes': list(comp.includes),
+                'namespaces': list(comp.namespaces),
+                'classes': comp.classes,
+                'functions': comp.functions,
+                'templates': comp.templates,
+                'operators': comp.operators,
+                'dependencies': list(comp.dependencies),
+                'used_by': list(comp.used_by)
+            }
+            for comp in components.values()
+        ]
+    }
+    return components, project_info
+
+
+def measure(load):
+    """
+    Memória retida pelo resultado de load() após a coleta de lixo, e o pico
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak, elapsed
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root, file_count)
+
+        project_info, retained, peak, elapsed = measure(
+            lambda: CppProjectLoader(workers=1).load(root)
+        )
+        functions = sum(len(c['functions']) for c in project_info['components'])
+        del project_info
+
+        baseline, baseline_retained, baseline_peak, baseline_elapsed = measure(
+            lambda: baseline_load(root)
+        )
+        del baseline
+
+        print(f"Arquivos: {file_count}, funções: {functions}")
+        print(f"Atual (slots + intern):  {retained / 2**20:.1f} MiB retidos "
+              f"(pico {peak / 2**20:.1f} MiB, carga {elapsed:.1f} s)")
+        print(f"Baseline (dicts/sets):   {baseline_retained / 2**20:.1f} MiB retidos "
+              f"(pico {baseline_peak / 2**20:.1f} MiB, conversão incluída {baseline_elapsed:.1f} s)")
+        print(f"Economia: {(baseline_retained - retained) / 2**20:.1f} MiB "
+              f"({1 - retained / baseline_retained:.0%})")
+
+
+if __name__ == "__main__":
+    main()
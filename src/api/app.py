@@ -0,0 +1,31 @@
+# src/api/app.py
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+import uvicorn
+from src.api.router import router
+from src.config.settings import get_settings
+from src.services.llm_factory import aclose_clients, close_clients
+from src.tasks.jobs import shutdown_job_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Índices, clients e pipelines ficam no processo entre as requisições
+    yield
+    shutdown_job_queue()
+    await aclose_clients()
+    close_clients()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title=get_settings().app_name, lifespan=lifespan)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    settings = get_settings().api
+    uvicorn.run(app, host=settings.host, port=settings.port)
@@ -23,12 +23,16 @@ class WelcomeTaskInput(BaseTaskInput):
 
 class DiscoveryTaskInput(BaseTaskInput):
     command_name: str = "discovery"
-    topic: ProcessCategory
+    topic: ProcessCategory = ProcessCategory.PROJECT_DISCOVERY
     project_details: Optional[Dict[str, Any]] = None
+    # Informado: execução não interativa (API); ausente: pergunta ao usuário
+    project_path: Optional[str] = None
 
 class QueryTaskInput(BaseTaskInput):
     command_name: str = "query"
     query: str
+    # Projeto cujo índice será consultado; ausente: último projeto indexado
+    project_path: Optional[str] = None
 
 # Other Models
 class ProcessingContext(BaseModel):
@@ -47,6 +51,35 @@ class TaskResult(BaseModel):
     output_data: Optional[OutputDataModel] = None
     created_at: datetime = datetime.now()
 
+class DiscoveryRequest(BaseModel):
+    project_path: str = Field(description="Caminho da raiz do repositório no servidor")
+    project_details: Optional[Dict[str, Any]] = None
+
+class QueryRequest(BaseModel):
+    query: str = Field(description="Pergunta sobre as regras de negócio")
+    project_path: Optional[str] = Field(
+        default=None, description="Projeto consultado; padrão: último indexado")
+
+class TaskResponse(BaseModel):
+    task_id: str
+    status: str
+    result: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    events: List[Dict[str, Any]] = Field(default_factory=list)
+
+class JobStatus(BaseModel):
+    job_id: str = Field(description="Também é o task_id do resultado")
+    command_name: str
+    status: str = Field(description="queued, running, completed ou failed")
+    progress: float = Field(default=0.0, description="Fração dos steps concluídos (0 a 1)")
+    message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
 class EventModel(BaseModel):
     event_type: str
     data: BaseTaskInput
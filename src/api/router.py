@@ -0,0 +1,155 @@
+# src/api/router.py
+from typing import Any, Callable, Dict, List
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from src.api.models import (
+    BaseTaskInput,
+    DiscoveryRequest,
+    DiscoveryTaskInput,
+    JobStatus,
+    QueryRequest,
+    QueryTaskInput,
+    TaskResponse,
+)
+from src.config.settings import get_settings
+from src.services.output_sink import JsonEventsSink, use_output_sink
+from src.tasks.jobs import get_job_queue
+from src.tasks.tasks import process_task
+
+router = APIRouter()
+
+
+def _task_slots(request: Request) -> asyncio.Semaphore:
+    """
+    Limita as tarefas simultâneas (cada uma roda em uma thread própria).
+    Criado no event loop da aplicação, na primeira requisição.
+    """
+    state = request.app.state
+    if getattr(state, "task_slots", None) is None:
+        state.task_slots = asyncio.Semaphore(get_settings().api.max_concurrent_tasks)
+    return state.task_slots
+
+
+def _no_interactive_input(prompt: str) -> str:
+    raise RuntimeError("Interactive input is not available through the API")
+
+
+def _run_task(task_input: BaseTaskInput,
+              on_event: Callable[[Dict[str, Any]], None],
+              streams_deltas: bool = False) -> dict:
+    """
+    Executa a tarefa na thread atual, com a saída dos steps convertida em
+    eventos JSON em vez de escrita no terminal. Só os endpoints de
+    streaming pedem a resposta em trechos.
+    """
+    sink = JsonEventsSink(callback=on_event, input_func=_no_interactive_input, streams_deltas=streams_deltas)
+    with use_output_sink(sink):
+        return process_task(task_input)
+
+
+async def _execute(http_request: Request, task_input: BaseTaskInput) -> TaskResponse:
+    events: List[Dict[str, Any]] = []
+    async with _task_slots(http_request):
+        try:
+            task_result = await asyncio.to_thread(_run_task, task_input, events.append)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    output_data = task_result["output_data"] or {}
+    return TaskResponse(
+        task_id=task_result["task_id"],
+        status=task_result["status"],
+        result=output_data.get("result", {}),
+        metadata=output_data.get("metadata", {}),
+        events=events
+    )
+
+
+@router.get("/health")
+async def health() -> Dict[str, str]:
+    return {"status": "ok"}
+
+
+@router.post("/discovery", response_model=TaskResponse)
+async def discovery(request: DiscoveryRequest, http_request: Request) -> TaskResponse:
+    return await _execute(http_request, DiscoveryTaskInput(
+        project_path=request.project_path,
+        project_details=request.project_details
+    ))
+
+
+@router.post("/query", response_model=TaskResponse)
+async def query(request: QueryRequest, http_request: Request) -> TaskResponse:
+    return await _execute(http_request, QueryTaskInput(query=request.query, project_path=request.project_path))
+
+
+@router.post("/query/stream")
+async def query_stream(request: QueryRequest, http_request: Request) -> StreamingResponse:
+    """
+    Resposta em NDJSON: os eventos (incluindo os trechos da resposta) são
+    enviados assim que produzidos; o último evento traz o resultado final
+    """
+    task_input = QueryTaskInput(query=request.query, project_path=request.project_path)
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_event(event: Dict[str, Any]):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    task_slots = _task_slots(http_request)
+
+    async def run():
+        async with task_slots:
+            try:
+                task_result = await asyncio.to_thread(_run_task, task_input, on_event, True)
+                output_data = task_result["output_data"] or {}
+                final = {
+                    "type": "result",
+                    "task_id": task_result["task_id"],
+                    "status": task_result["status"],
+                    "result": output_data.get("result", {}),
+                }
+            except Exception as e:
+                final = {"type": "error", "detail": str(e)}
+        await events.put(final)
+
+    async def stream():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event = await events.get()
+                yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+                if event["type"] in ("result", "error"):
+                    break
+        finally:
+            await task
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/jobs/discovery", response_model=JobStatus, status_code=202)
+async def submit_discovery(request: DiscoveryRequest) -> JobStatus:
+    """
+    Enfileira a descoberta do projeto e responde na hora; o andamento é
+    consultado em GET /jobs/{job_id}
+    """
+    task_input = DiscoveryTaskInput(
+        project_path=request.project_path,
+        project_details=request.project_details
+    )
+
+    def submit() -> JobStatus:
+        queue = get_job_queue()
+        return queue.get(queue.submit(task_input))
+
+    return await asyncio.to_thread(submit)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def job_status(job_id: str) -> JobStatus:
+    job = await asyncio.to_thread(lambda: get_job_queue().get(job_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
@@ -1,9 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+import contextvars
+import time
 from src.api.models import BaseTaskInput, ProcessingContext, OutputDataModel
 
 
 class PipelineStep(ABC):
+    # Chaves de context.intermediates lidas/escritas pelo step. Com ao menos
+    # uma das duas declarada, o step pode rodar em paralelo com steps
+    # independentes; sem declaração, é uma barreira (roda sozinho, em ordem)
+    reads: Optional[FrozenSet[str]] = None
+    writes: Optional[FrozenSet[str]] = None
+
     @abstractmethod
     def process(
         self,
@@ -13,23 +22,159 @@ class PipelineStep(ABC):
     ) -> Tuple[BaseTaskInput, ProcessingContext, OutputDataModel]:
         pass
 
+    @property
+    def declared(self) -> bool:
+        return self.reads is not None or self.writes is not None
+
 class BasePipeline(ABC):
+    # True quando os steps não guardam estado entre execuções e a mesma
+    # instância pode atender várias tarefas (ver PipelineRegistry)
+    reusable: bool = False
+    # Steps independentes executados ao mesmo tempo (threads)
+    max_workers: int = 4
+
     def __init__(self):
         self.steps: List[PipelineStep] = []
         self.parameters: Dict = {}
+        # índice do step -> tempo máximo de execução (segundos)
+        self.timeouts: Dict[int, float] = {}
 
-    def add_step(self, step: PipelineStep):
+    def add_step(self, step: PipelineStep, timeout: Optional[float] = None):
+        if timeout is not None:
+            self.timeouts[len(self.steps)] = timeout
         self.steps.append(step)
 
     def run(
-        self, input_data: BaseTaskInput
+        self,
+        input_data: BaseTaskInput,
+        on_progress: Optional[Callable[[int, int, str], None]] = None,
     ) -> Tuple[ProcessingContext, OutputDataModel]:
+        """
+        Executa os steps respeitando as dependências declaradas (reads/writes).
+        on_progress(concluídos, total, step) é chamado ao fim de cada step
+        (ex.: para o status de um job).
+        """
         context = ProcessingContext()
         output_data = OutputDataModel()
 
-        for step in self.steps:
-            input_data, context, output_data = step.process(
-                input_data, context, output_data
-            )
-        
-        return context, output_data
\ No newline at end of file
+        if not self.timeouts and not any(step.declared for step in self.steps):
+            # Nada a paralelizar ou limitar: execução sequencial na thread atual
+            for index, step in enumerate(self.steps, start=1):
+                input_data, context, output_data = step.process(
+                    input_data, context, output_data
+                )
+                if on_progress is not None:
+                    on_progress(index, len(self.steps), type(step).__name__)
+            return context, output_data
+
+        return self._run_graph(input_data, context, output_data, on_progress)
+
+    def dependencies(self) -> List[Set[int]]:
+        """
+        Para cada step, os índices dos steps anteriores que precisam terminar
+        antes dele: leitura após escrita, escrita após leitura/escrita da
+        mesma chave, ou qualquer um dos dois sem declaração (barreira)
+        """
+        graph = []
+        for index, step in enumerate(self.steps):
+            if not step.declared:
+                graph.append(set(range(index)))
+                continue
+            reads, writes = step.reads or frozenset(), step.writes or frozenset()
+            depends = set()
+            for previous_index in range(index):
+                previous = self.steps[previous_index]
+                if not previous.declared:
+                    depends.add(previous_index)
+                    continue
+                previous_reads = previous.reads or frozenset()
+                previous_writes = previous.writes or frozenset()
+                if reads & previous_writes or writes & (previous_reads | previous_writes):
+                    depends.add(previous_index)
+            graph.append(depends)
+        return graph
+
+    def _run_graph(
+        self,
+        input_data: BaseTaskInput,
+        context: ProcessingContext,
+        output_data: OutputDataModel,
+        on_progress: Optional[Callable[[int, int, str], None]],
+    ) -> Tuple[ProcessingContext, OutputDataModel]:
+        """
+        Steps cujas dependências terminaram rodam em um pool de threads.
+        context/output_data são compartilhados e alterados no lugar; só
+        barreiras (que rodam sozinhas) podem substituí-los pelo retorno.
+        Na primeira falha ou timeout, nenhum step novo é iniciado e o erro
+        é propagado; steps já em execução não são interrompidos.
+        """
+        graph = self.dependencies()
+        pending = set(range(len(self.steps)))
+        done: Set[int] = set()
+        running: Dict[Future, int] = {}
+        started: Dict[int, float] = {}
+
+        def call(index: int, *args):
+            started[index] = time.monotonic()
+            return self.steps[index].process(*args)
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, self.max_workers),
+            thread_name_prefix=type(self).__name__
+        )
+        failed = True
+        try:
+            while pending or running:
+                for index in sorted(pending):
+                    if graph[index] <= done:
+                        pending.discard(index)
+                        # Cada step herda o contexto atual (ex.: output sink da requisição)
+                        step_context = contextvars.copy_context()
+                        future = executor.submit(
+                            step_context.run, call, index, input_data, context, output_data
+                        )
+                        running[future] = index
+
+                finished, _ = wait(
+                    running, timeout=self._next_deadline(running, started), return_when=FIRST_COMPLETED
+                )
+                for future in finished:
+                    index = running.pop(future)
+                    step = self.steps[index]
+                    result = future.result()
+                    if not step.declared:
+                        input_data, context, output_data = result
+                    done.add(index)
+                    if on_progress is not None:
+                        on_progress(len(done), len(self.steps), type(step).__name__)
+
+                self._check_timeouts(running, started)
+            failed = False
+        finally:
+            # Em caso de erro não espera steps que ainda estejam rodando
+            executor.shutdown(wait=not failed, cancel_futures=True)
+
+        return context, output_data
+
+    def _next_deadline(self, running: Dict[Future, int], started: Dict[int, float]) -> Optional[float]:
+        deadline = None
+        for index in running.values():
+            timeout = self.timeouts.get(index)
+            if timeout is None:
+                continue
+            if index not in started:
+                # Ainda na fila do pool: confere de novo em breve
+                remaining = 0.05
+            else:
+                remaining = max(0.0, started[index] + timeout - time.monotonic())
+            deadline = remaining if deadline is None else min(deadline, remaining)
+        return deadline
+
+    def _check_timeouts(self, running: Dict[Future, int], started: Dict[int, float]):
+        now = time.monotonic()
+        for index in running.values():
+            timeout = self.timeouts.get(index)
+            if timeout is not None and index in started and now - started[index] >= timeout:
+                raise TimeoutError(
+                    f"Step {type(self.steps[index]).__name__} exceeded its timeout of {timeout}s"
+                )
@@ -1,15 +1,14 @@
 from src.pipelines.base import PipelineStep
 from src.api.models import BaseTaskInput, ProcessingContext, OutputDataModel
 from pydantic import BaseModel, BeforeValidator
-import instructor
-from openai import OpenAI
 from src.api.models import Reply, ProcessCategory
 from typing_extensions import Annotated
 from instructor import llm_validator
-from src.services.llm_factory import LLMFactory
+from src.services.container import get_container
+from src.services.llm_factory import get_client
 from src.prompts.role import RolePrompt
 
-client = instructor.from_openai(OpenAI())
+client = get_client("openai")
 
 
 class ResponseTopicModel(BaseModel):
@@ -32,6 +31,8 @@ class ValidateReply(BaseModel):
     ]
 
 class CategorizeSubject(PipelineStep):
+    reads = frozenset({"message"})
+    writes = frozenset({"topic"})
 
     def __init__(self):
         super().__init__()
@@ -56,7 +57,7 @@ class CategorizeSubject(PipelineStep):
     
     def categorize_subject(self, data: BaseTaskInput) -> ResponseTopicModel:
         
-        llm = LLMFactory("openai")
+        llm = get_container().llm("openai")
         prompt = RolePrompt(self.message)
 
         completion = llm.create_completion(
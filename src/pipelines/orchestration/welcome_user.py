@@ -1,7 +1,7 @@
 from src.pipelines.base import PipelineStep
 from src.api.models import BaseTaskInput, ProcessingContext, OutputDataModel
 from pydantic import BaseModel
-from src.utils import LLMStyleConsole
+from src.services.output_sink import get_output_sink
 
 class ResponseCheckLanguageModel(BaseModel):
     loaded: bool = True
@@ -20,11 +20,11 @@ class WelcomeUser(PipelineStep):
                 context: ProcessingContext, 
                 output_data=OutputDataModel):
         
-        console = LLMStyleConsole(callback=self.handle_response)
+        console = get_output_sink()
 
         welcome_text = """Olá! Sou seu assistente pessoal de desenvolvimento. \nQual nosso desafio de hoje?"""
 
-        console.display_and_get_response(welcome_text)
+        self.handle_response(console.ask(welcome_text))
         
         completion = self.check_language(input_data)
         context.intermediates["message"] = self.user_response
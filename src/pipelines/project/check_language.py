@@ -5,9 +5,12 @@ from typing import List, Dict
 import os
 from pathlib import Path
 from src.services.language_detection import LanguageDetectionStrategy, ResponseCheckLanguageModel
-from src.utils import LLMStyleConsole
+from src.services.output_sink import get_output_sink
 
 class CheckLanguage(PipelineStep):
+    reads = frozenset({"project_path", "file_inventory"})
+    writes = frozenset({"language", "language_confidence", "detected_files", "main_files"})
+
     def __init__(self):
         self.detector = LanguageDetectionStrategy()
 
@@ -16,20 +19,23 @@ class CheckLanguage(PipelineStep):
                 context: ProcessingContext, 
                 output_data=OutputDataModel):
         
-        completion = self.check_language(context.intermediates["project_path"])
+        completion = self.check_language(
+            context.intermediates["project_path"],
+            context.intermediates.get("file_inventory")
+        )
 
         context.intermediates["language"] = completion.language
         context.intermediates["language_confidence"] = completion.confidence
         context.intermediates["detected_files"] = completion.detected_files
         context.intermediates["main_files"] = completion.main_files
 
-        console = LLMStyleConsole()
+        console = get_output_sink()
 
         welcome_text = f"Identifiquei que trata-se de um projeto em {completion.language}"
 
-        console._type_text(welcome_text)
+        console.write(welcome_text)
 
         return input_data, context, output_data
     
-    def check_language(self, project_path: str) -> ResponseCheckLanguageModel:
-        return self.detector.detect(project_path)
\ No newline at end of file
+    def check_language(self, project_path: str, inventory=None) -> ResponseCheckLanguageModel:
+        return self.detector.detect(project_path, inventory)
\ No newline at end of file
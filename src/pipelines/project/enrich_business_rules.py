@@ -1,28 +1,57 @@
 # src/pipelines/steps/enrich_business_rules.py
 from src.pipelines.base import PipelineStep
 from src.api.models import BaseTaskInput, ProcessingContext, OutputDataModel, BusinessRulesAnalysis
-from src.services.llm_factory import LLMFactory
+from src.services.container import get_container
+from src.services.llm_factory import aclose_clients
 from src.prompts.role import BusinessRuleEnrichmentPrompt
+from src.config.settings import get_settings
+from src.services.token_estimation import chunk_by_tokens
+from contextlib import contextmanager
+import asyncio
 import json
 
 class EnrichBusinessRules(PipelineStep):
+    reads = frozenset({"rule_batches", "initial_business_rules"})
+    writes = frozenset({"enriched_rule_batches", "enriched_business_rules"})
+
     def __init__(self):
-        self.llm_client = LLMFactory("openai")
+        self.llm_client = get_container().llm("openai")
     
     def process(self, 
                 input_data: BaseTaskInput, 
                 context: ProcessingContext, 
                 output_data=OutputDataModel):
         
+        rule_batches = context.intermediates.get("rule_batches")
+        if rule_batches is not None:
+            context.intermediates["enriched_rule_batches"] = self._enrich_stream(rule_batches)
+            return input_data, context, output_data
+
         rules = context.intermediates.get("initial_business_rules", [])
+        context.intermediates["enriched_business_rules"] = self._enrich_batch(rules)
+        return input_data, context, output_data
+
+    def _enrich_stream(self, rule_batches):
+        """
+        Enriquece os lotes à medida que chegam, todos no mesmo event loop;
+        os clients assíncronos do loop são fechados ao fim do stream
+        """
+        with _event_loop() as loop:
+            for rules in rule_batches:
+                yield self._enrich_batch(rules, loop)
+
+    def _enrich_batch(self, rules, loop=None):
+        if loop is None:
+            with _event_loop() as loop:
+                return self._enrich_batch(rules, loop)
+
         uncertain_rules = [r for r in rules if r['confidence'] != 'high']
         
         if uncertain_rules:
-            enriched_rules = self._enrich_rules(uncertain_rules)
+            enriched_rules = self._enrich_rules(uncertain_rules, loop)
             self._update_rules(rules, enriched_rules)
         
-        context.intermediates["enriched_business_rules"] = rules
-        return input_data, context, output_data
+        return rules
     
     # def _enrich_rules(self, uncertain_rules):
     #     try:
@@ -43,41 +72,51 @@ class EnrichBusinessRules(PipelineStep):
     #     except Exception as e:
     #         print(f"Error during LLM completion: {str(e)}")
     #         return uncertain_rules
-    def _enrich_rules(self, uncertain_rules):
-        try:
-            prompt = BusinessRuleEnrichmentPrompt(uncertain_rules)
-            
-            # Para debug
-            print("Prompt enviado:")
-            print(prompt.format())
-
-            completion = self.llm_client.create_completion(
-                response_model=BusinessRulesAnalysis,
-                temperature=0,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt.format()
-                    }
-                ]
-            )
+    def _enrich_rules(self, uncertain_rules, loop):
+        """
+        Divide as regras em chunks que cabem no orçamento de tokens do
+        prompt e os envia ao LLM em paralelo (limitado pela configuração),
+        no event loop recebido
+        """
+        settings = get_settings().enrichment
+        chunks = list(chunk_by_tokens(
+            uncertain_rules,
+            max_tokens=settings.max_prompt_tokens,
+            text=lambda rule: rule['content'],
+            max_items=settings.max_rules_per_chunk
+        ))
+        enriched_chunks = loop.run_until_complete(self._enrich_chunks(chunks, settings.concurrency))
+        return [rule for chunk in enriched_chunks for rule in chunk]
 
-            # Para debug mais detalhado
-            print("\nResposta do LLM (raw):")
-            print(completion)
-            
-            print("\nTipo da resposta:")
-            print(type(completion))
-            
-            print("\nAtributos da resposta:")
-            print(dir(completion))
+    async def _enrich_chunks(self, chunks, concurrency: int):
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        return await asyncio.gather(*(
+            self._enrich_chunk(index, chunk, semaphore)
+            for index, chunk in enumerate(chunks)
+        ))
 
-            return self._process_llm_response(uncertain_rules, completion)
-        except Exception as e:
-            print(f"Error during LLM completion: {str(e)}")
-            print(f"Error type: {type(e)}")
-            print(f"Error args: {e.args}")
-            return uncertain_rules
+    async def _enrich_chunk(self, index: int, chunk, semaphore: asyncio.Semaphore):
+        """
+        Enriquece um chunk; em caso de falha, só as regras deste chunk
+        voltam sem enriquecimento
+        """
+        async with semaphore:
+            try:
+                prompt = BusinessRuleEnrichmentPrompt(chunk)
+                completion = await self.llm_client.acreate_completion(
+                    response_model=BusinessRulesAnalysis,
+                    temperature=0,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": prompt.format()
+                        }
+                    ]
+                )
+                return self._process_llm_response(chunk, completion)
+            except Exception as e:
+                print(f"Error enriching chunk {index} ({len(chunk)} rules): {str(e)}")
+                return chunk
     
     def _process_llm_response(self, original_rules, enriched_analysis: BusinessRulesAnalysis):
         """
@@ -122,4 +161,18 @@ class EnrichBusinessRules(PipelineStep):
         enriched_dict = {rule['id']: rule for rule in enriched_rules}
         for i, rule in enumerate(original_rules):
             if rule['id'] in enriched_dict:
-                original_rules[i] = enriched_dict[rule['id']]
\ No newline at end of file
+                original_rules[i] = enriched_dict[rule['id']]
+
+
+@contextmanager
+def _event_loop():
+    """
+    Event loop usado por toda a execução do step; ao sair, fecha os clients
+    assíncronos criados nele
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        yield loop
+    finally:
+        loop.run_until_complete(aclose_clients())
+        loop.close()
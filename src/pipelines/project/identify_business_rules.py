@@ -1,8 +1,13 @@
 from src.pipelines.base import PipelineStep
 from src.api.models import BaseTaskInput, ProcessingContext, OutputDataModel
 from src.services.business_rules.analyzer import BusinessRuleAnalyzer
+from src.config.settings import get_settings
+from src.utils import batched
 
 class IdentifyBusinessRules(PipelineStep):
+    reads = frozenset({"component_stream", "components"})
+    writes = frozenset({"rule_batches", "initial_business_rules"})
+
     def __init__(self):
         self.rule_analyzer = BusinessRuleAnalyzer()
     
@@ -11,6 +16,13 @@ class IdentifyBusinessRules(PipelineStep):
                 context: ProcessingContext, 
                 output_data=OutputDataModel):
         
+        stream = context.intermediates.get("component_stream")
+        if stream is not None:
+            context.intermediates["rule_batches"] = self._stream_rules(
+                stream, get_settings().loader.stream_batch_size
+            )
+            return input_data, context, output_data
+
         components = context.intermediates.get("components", [])
         business_rules = []
         
@@ -19,4 +31,15 @@ class IdentifyBusinessRules(PipelineStep):
             business_rules.extend(rules)
         
         context.intermediates["initial_business_rules"] = business_rules
-        return input_data, context, output_data
\ No newline at end of file
+        return input_data, context, output_data
+
+    def _stream_rules(self, components, batch_size: int):
+        """
+        Gera lotes de regras a partir de lotes de componentes
+        """
+        for batch in batched(components, batch_size):
+            business_rules = []
+            for component in batch:
+                business_rules.extend(self.rule_analyzer.analyze_component(component))
+            if business_rules:
+                yield business_rules
\ No newline at end of file
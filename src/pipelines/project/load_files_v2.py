@@ -1,7 +1,7 @@
 from src.pipelines.base import PipelineStep
 from src.api.models import DiscoveryTaskInput, ProcessingContext, OutputDataModel
 from pydantic import BaseModel
-from src.utils import LLMStyleConsole
+from src.services.output_sink import get_output_sink
 import os
 from src.services.llm_factory import LLMFactory
 from src.prompts.role import CPlusPlusInfoPrompt
@@ -23,15 +23,19 @@ class LoadFilesV2(PipelineStep):
                 context: ProcessingContext, 
                 output_data=OutputDataModel):
         
-        console = LLMStyleConsole()
+        console = get_output_sink()
         console_text = f"Certo, então vamos falar sobre: {input_data.topic}"
-        console._type_text(console_text)
+        console.write(console_text)
 
         console_text = f"Podemos começar carregando o projeto em memória para que eu possa criar o contexto do projeto."
-        console._type_text(console_text)
-
-        console_text = f"Me informe o caminho para a pasta raíz do repositório"
-        console.display_and_get_response(console_text, callback=self.handle_response)
+        console.write(console_text)
+
+        if input_data.project_path:
+            # Execução não interativa: caminho informado na própria tarefa
+            self.project_path = input_data.project_path
+        else:
+            console_text = f"Me informe o caminho para a pasta raíz do repositório"
+            self.handle_response(console.ask(console_text))
 
         context.intermediates["project_path"] = self.project_path
 
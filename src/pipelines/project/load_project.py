@@ -1,7 +1,7 @@
 from src.pipelines.base import PipelineStep
 from src.api.models import DiscoveryTaskInput, ProcessingContext, OutputDataModel
 from pydantic import BaseModel
-from src.utils import LLMStyleConsole
+from src.services.output_sink import get_output_sink
 import os
 from src.services.llm_factory import LLMFactory
 from src.prompts.role import CPlusPlusInfoPrompt
@@ -37,18 +37,18 @@ class LoadProject(PipelineStep):
                 context: ProcessingContext, 
                 output_data=OutputDataModel):
         
-        console = LLMStyleConsole()
+        console = get_output_sink()
         console_text = f"Certo, então vamos falar sobre: {input_data.topic}"
-        console._type_text(console_text)
+        console.write(console_text)
 
         console_text = f"Podemos começar carregando o projeto em memória para que eu possa criar o contexto do projeto."
-        console._type_text(console_text)
+        console.write(console_text)
 
         console_text = f"Me informe o caminho para a pasta raíz do repositório"
-        console.display_and_get_response(console_text, callback=self.handle_response)
+        self.handle_response(console.ask(console_text))
 
         console_text = f"Vou processar os resources do projeto, isso pode demorar um pouco :("
-        console._type_text(console_text)
+        console.write(console_text)
 
         routeCompletion = self.route_pipeline(input_data)
         context.intermediates["project_path"] = self.project_path
@@ -59,7 +59,7 @@ class LoadProject(PipelineStep):
         completion = self.resume_project(input_data)
         context.intermediates["analysis"] = completion.analysis
 
-        console._type_text(completion.analysis)
+        console.write(completion.analysis)
 
         return input_data, context, output_data
     
@@ -1,10 +1,23 @@
 from src.pipelines.base import PipelineStep
 from src.api.models import BaseTaskInput, ProcessingContext, OutputDataModel
 from src.services.project_loader.registry import ProjectLoaderRegistry
+from src.config.settings import get_settings
 import json
 from pathlib import Path
+from collections.abc import Mapping
 
 class LoadProjectV2(PipelineStep):
+    reads = frozenset({"project_path", "language", "file_inventory"})
+    writes = frozenset({
+        "component_stream",
+        "project_info",
+        "components",
+        "build_system",
+        "load_cache_stats",
+        "changed_paths",
+        "removed_paths",
+    })
+
     def __init__(self):
         self.loader_registry = ProjectLoaderRegistry()
 
@@ -18,14 +31,24 @@ class LoadProjectV2(PipelineStep):
         
         # Obtém o loader apropriado
         loader = self.loader_registry.get_loader(language)
+        inventory = context.intermediates.get("file_inventory")
+
+        if get_settings().loader.streaming and hasattr(loader, "iter_components"):
+            # Os próximos passos consomem os componentes à medida que são analisados
+            context.intermediates["component_stream"] = self._stream_components(
+                loader, project_path, inventory, context
+            )
+            return input_data, context, output_data
         
         # Carrega o projeto
-        project_info = loader.load(project_path)
+        project_info = loader.load(project_path, inventory)
         
         # Atualiza o contexto com as informações do projeto
         context.intermediates["project_info"] = project_info
         context.intermediates["components"] = project_info['components']
         context.intermediates["build_system"] = project_info['build_system']
+        context.intermediates["load_cache_stats"] = project_info['cache_stats']
+        self._publish_changes(loader, context)
 
         # json_safe_info = self._prepare_for_json(project_info)
 
@@ -34,12 +57,33 @@ class LoadProjectV2(PipelineStep):
         
         return input_data, context, output_data
     
+    def _stream_components(self, loader, project_path, inventory, context):
+        """
+        Repassa os componentes do loader e, ao final do stream, publica no
+        contexto as informações do projeto
+        """
+        yield from loader.iter_components(project_path, inventory)
+
+        project_info = loader.project_info
+        context.intermediates["project_info"] = project_info
+        context.intermediates["build_system"] = project_info['build_system']
+        self._publish_changes(loader, context)
+
+    def _publish_changes(self, loader, context):
+        """
+        Arquivos re-analisados e removidos desde a última carga, usados
+        para re-indexar apenas o que mudou
+        """
+        if hasattr(loader, "changed_paths"):
+            context.intermediates["changed_paths"] = list(loader.changed_paths)
+            context.intermediates["removed_paths"] = list(loader.removed_paths)
+    
     def _prepare_for_json(self, data):
         """
         Converte estruturas de dados que não são serializáveis em JSON
         para tipos compatíveis
         """
-        if isinstance(data, dict):
+        if isinstance(data, Mapping):
             return {k: self._prepare_for_json(v) for k, v in data.items()}
         elif isinstance(data, (set, list, tuple)):
             return list(self._prepare_for_json(item) for item in data)
@@ -1,26 +1,68 @@
 # src/pipelines/steps/prepare_vector_store.py
 from src.pipelines.base import PipelineStep
 from src.api.models import BaseTaskInput, ProcessingContext, OutputDataModel
-from src.repositories.vector_store.store import VectorStore
+from src.services.container import get_container
+from src.services.file_inventory import scan_project
 from pathlib import Path
+from collections.abc import Mapping
 import json
 
 class PrepareVectorStore(PipelineStep):
+    reads = frozenset({
+        "project_path",
+        "file_inventory",
+        "enriched_rule_batches",
+        "enriched_business_rules",
+    })
+    writes = frozenset({"indexed_rules", "vector_store", "embedding_cache_stats", "index_reused"})
+
     def __init__(self):
-        self.vector_store = VectorStore()
+        self.vector_store = None
     
     def process(self, 
                 input_data: BaseTaskInput, 
                 context: ProcessingContext, 
                 output_data=OutputDataModel):
         
-        rules = context.intermediates.get("enriched_business_rules", [])
-        
-        # Prepara embeddings e armazena
-        self.vector_store.store_rules(rules)
+        # Uma collection por projeto/commit, reaproveitada entre execuções
+        # (a store do container, com seu cache de embeddings, também)
+        project_path = context.intermediates["project_path"]
+        self.vector_store = get_container().vector_store(project_path, check_commit=True)
+        self.vector_store.mark_active()
+
+        inventory = context.intermediates.get("file_inventory")
+        if inventory is None:
+            inventory = scan_project(project_path)
+        manifest = self.vector_store.manifest()
+        stale_paths = self._prepare_update(manifest, inventory, context)
+
+        rule_batches = context.intermediates.get("enriched_rule_batches")
+        if rule_batches is None:
+            rule_batches = [context.intermediates.get("enriched_business_rules", [])]
+
+        # Em streaming, cada lote é indexado enquanto o parsing continua; só
+        # as regras de arquivos novos ou alterados vão para o índice
+        stored = 0
+        for rules in rule_batches:
+            rules = [rule for rule in rules if rule.get('source_path') in stale_paths]
+            if rules:
+                self.vector_store.store_rules(rules)
+                stored += len(rules)
+        context.intermediates["indexed_rules"] = stored
+
+        # Só agora os arquivos contam como indexados
+        manifest.record(entry for entry in inventory if entry.path in stale_paths)
+        manifest.rules = self.vector_store.collection.count()
+        manifest.save()
         
         # Adiciona referência da vector store ao contexto
         context.intermediates["vector_store"] = self.vector_store
+        # As próximas consultas deste processo usam a collection recém-indexada
+        get_container().set_vector_store(self.vector_store, context.intermediates["project_path"])
+
+        output_data.result["project_path"] = context.intermediates["project_path"]
+        output_data.result["collection_name"] = self.vector_store.collection_name
+        output_data.result["indexed_rules"] = context.intermediates.get("indexed_rules", 0)
 
         # json_safe_info = self._prepare_for_json(rules)
         # with open("data.json", "w") as arquivo:
@@ -29,18 +71,52 @@ class PrepareVectorStore(PipelineStep):
         stats = self.vector_store.get_collection_stats()
         print("\nVector Store Stats:")
         print(f"Total records: {stats['total_records']}")
+        cache_stats = self.vector_store.embedding_cache_stats
+        if cache_stats is not None:
+            context.intermediates["embedding_cache_stats"] = cache_stats
+            print(f"Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.0%}), {cache_stats['saved_calls']} calls saved")
         if stats.get('sample'):
             print("\nSample record:")
             print(json.dumps(stats['sample'], indent=2))
             
         return input_data, context, output_data
     
+    def _prepare_update(self, manifest, inventory, context):
+        """
+        Compara o inventário com o manifesto da collection e remove do índice
+        as regras dos arquivos alterados ou removidos. Devolve os arquivos
+        cujas regras devem ser (re)indexadas.
+        """
+        if self.vector_store.collection.count() < manifest.rules:
+            # Collection apagada (ou perdeu regras): o manifesto não vale mais.
+            # Um projeto sem regras grava rules=0 e continua reaproveitado
+            manifest.clear()
+
+        stale_paths, removed_paths = manifest.diff(inventory)
+        if not stale_paths and not removed_paths:
+            print(f"Reusing existing index {self.vector_store.collection_name}")
+            context.intermediates["index_reused"] = True
+            return stale_paths
+
+        # Gravado antes de alterar o índice: se a execução falhar daqui em
+        # diante, esses arquivos continuam pendentes na próxima
+        manifest.discard(stale_paths | removed_paths)
+        manifest.save()
+
+        deleted = self.vector_store.delete_rules_for_paths(stale_paths | removed_paths)
+        manifest.rules = self.vector_store.collection.count()
+        manifest.save()
+        print(f"Index update: {len(stale_paths)} files changed, {len(removed_paths)} removed, "
+              f"{deleted} rules removed")
+        return stale_paths
+    
     def _prepare_for_json(self, data):
         """
         Converte estruturas de dados que não são serializáveis em JSON
         para tipos compatíveis
         """
-        if isinstance(data, dict):
+        if isinstance(data, Mapping):
             return {k: self._prepare_for_json(v) for k, v in data.items()}
         elif isinstance(data, (set, list, tuple)):
             return list(self._prepare_for_json(item) for item in data)
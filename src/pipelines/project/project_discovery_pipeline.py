@@ -9,11 +9,13 @@ from src.pipelines.project.load_files_v2 import LoadFilesV2
 from src.pipelines.project.identify_business_rules import IdentifyBusinessRules
 from src.pipelines.project.enrich_business_rules import EnrichBusinessRules
 from src.pipelines.project.prepare_vector_store import PrepareVectorStore
+from src.pipelines.project.scan_files import ScanProjectFiles
 
 class ProjectDiscoveryPipeline(BasePipeline):
     def __init__(self):
         super().__init__()
         self.add_step(LoadFilesV2())
+        self.add_step(ScanProjectFiles())
         self.add_step(CheckLanguage())
         self.add_step(LoadProjectV2())
         self.add_step(IdentifyBusinessRules())
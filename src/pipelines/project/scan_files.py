@@ -0,0 +1,27 @@
+from src.pipelines.base import PipelineStep
+from src.api.models import BaseTaskInput, ProcessingContext, OutputDataModel
+from src.services.file_inventory import FileInventory, scan_project
+
+class ScanProjectFiles(PipelineStep):
+    """
+    Varre o projeto uma única vez; detecção de linguagem e loaders
+    consomem o inventário em vez de percorrer o disco novamente.
+    """
+
+    reads = frozenset({"project_path"})
+    writes = frozenset({"file_inventory"})
+
+    def process(self, 
+                input_data: BaseTaskInput, 
+                context: ProcessingContext, 
+                output_data=OutputDataModel):
+        
+        project_path = context.intermediates["project_path"]
+        inventory = self.scan(project_path)
+
+        context.intermediates["file_inventory"] = inventory
+        
+        return input_data, context, output_data
+    
+    def scan(self, project_path: str) -> FileInventory:
+        return scan_project(project_path)
@@ -1,7 +1,7 @@
 from src.pipelines.base import PipelineStep
 from src.api.models import BaseTaskInput, ProcessingContext, OutputDataModel, ProjectAnalysis
 from pydantic import BaseModel
-from src.utils import LLMStyleConsole
+from src.services.output_sink import get_output_sink
 from src.services.llm_factory import LLMFactory
 from src.prompts.role import BusinessAnalystPrompt
 
@@ -30,19 +30,19 @@ class SearchInProjectContent(PipelineStep):
         
         self.knowledge_base = context.intermediates["analysis"]
 
-        console = LLMStyleConsole(callback=self.handle_response)
+        console = get_output_sink()
 
         console_text = """\nO que deseja saber sobre o projeto? Agora que tenho os resources indexados, podemos explorar os dados carregados."""
-        console.display_and_get_response(console_text)
+        self.handle_response(console.ask(console_text))
         
         completion = self.search_in_contents(input_data)
-        console._type_text(completion.content)
+        console.write(completion.content)
 
         while(True):
             console_text = """\nEm qua mais posso te ajudar?"""
-            console.display_and_get_response(console_text)
+            self.handle_response(console.ask(console_text))
             completion = self.search_in_contents(input_data)
-            console._type_text(completion.content)
+            console.write(completion.content)
         
         return input_data, context, output_data
     
@@ -2,6 +2,8 @@ from src.pipelines.base import BasePipeline
 from .steps import PrepareQuery, SearchVectorStore, GenerateResponse
 
 class QueryPipeline(BasePipeline):
+    reusable = True
+
     def __init__(self):
         super().__init__()
         self.add_step(PrepareQuery())
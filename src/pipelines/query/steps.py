@@ -1,14 +1,17 @@
 from src.pipelines.base import PipelineStep
 from src.models.query import QueryInput
 from src.api.models import ProcessingContext, OutputDataModel
-from src.services.query.processor import QueryProcessor
-from src.utils import LLMStyleConsole
+from src.services.container import get_container
+from src.services.output_sink import get_output_sink
+import time
 
-console = LLMStyleConsole()
 
 class PrepareQuery(PipelineStep):
+    reads = frozenset()
+    writes = frozenset({"query_info"})
+
     def __init__(self):
-        self.processor = QueryProcessor()
+        self.processor = get_container().query_processor()
     
     def process(self, 
                 input_data: QueryInput, 
@@ -24,28 +27,38 @@ class PrepareQuery(PipelineStep):
         return input_data, context, output_data
     
 class SearchVectorStore(PipelineStep):
+    reads = frozenset({"query_info"})
+    writes = frozenset({"relevant_rules"})
+
     def __init__(self):
-        self.processor = QueryProcessor()
+        self.processor = get_container().query_processor()
     
     def process(self, 
                 input_data: QueryInput, 
                 context: ProcessingContext, 
                 output_data=OutputDataModel):
                 
+        # Índice do projeto pedido ou, sem projeto, o último indexado
+        project_path = getattr(input_data, "project_path", None)
+        vector_store = get_container().vector_store(project_path)
+
         # Diagnóstico antes da busca
         print("\nVector Store Status before search:")
-        stats = self.processor.vector_store.get_collection_stats()
+        stats = vector_store.get_collection_stats()
         print(f"Total records available: {stats['total_records']}")
 
         processed_query = context.intermediates["query_info"]
-        relevant_rules = self.processor.search_relevant_rules(processed_query)
+        relevant_rules = self.processor.search_relevant_rules(processed_query, vector_store=vector_store)
         context.intermediates["relevant_rules"] = relevant_rules
         
         return input_data, context, output_data
     
 class GenerateResponse(PipelineStep):
+    reads = frozenset({"query_info", "relevant_rules"})
+    writes = frozenset({"time_to_first_token", "suggested_followup", "rules_analyzed"})
+
     def __init__(self):
-        self.processor = QueryProcessor()
+        self.processor = get_container().query_processor()
     
     def process(self, 
                 input_data: QueryInput, 
@@ -55,9 +68,25 @@ class GenerateResponse(PipelineStep):
         query_info = context.intermediates["query_info"]
         relevant_rules = context.intermediates["relevant_rules"]
         
-        response = self.processor.generate_response(query_info, relevant_rules)
+        console = get_output_sink()
+        if not console.streams_deltas:
+            # Ninguém acompanha a geração: uma única chamada, sem streaming
+            response = self.processor.generate_response(query_info, relevant_rules)
+            console.write(response["answer"])
+        else:
+            # Streaming: o texto aparece conforme os tokens chegam
+            start = time.perf_counter()
+            first_token_at = []
+
+            def on_delta(text: str):
+                if not first_token_at:
+                    first_token_at.append(time.perf_counter() - start)
+                console.write_delta(text)
 
-        console._type_text(response["answer"])
+            response = self.processor.generate_response(query_info, relevant_rules, on_delta=on_delta)
+            console.end_stream()
+            if first_token_at:
+                context.intermediates["time_to_first_token"] = first_token_at[0]
         
         # Atualiza o output_data com a resposta gerada
         output_data.result["answer"] = response["answer"]
@@ -2,6 +2,7 @@ from src.pipelines.project.project_discovery_pipeline import ProjectDiscoveryPip
 from src.pipelines.orchestration.manager_classifier_pipeline import InitializeSessionPipeline
 from src.api.models import WelcomeTaskInput, DiscoveryTaskInput, BaseTaskInput, QueryTaskInput
 from src.pipelines.query.pipeline import QueryPipeline
+import threading
 
 class PipelineRegistry:
 
@@ -11,11 +12,22 @@ class PipelineRegistry:
         QueryTaskInput: QueryPipeline
     }
 
+    # Pipelines sem estado por execução (reusable = True) são criados uma vez por processo
+    _instances = {}
+    _lock = threading.Lock()
+
     @classmethod  # Mudando para @classmethod
     def get_pipeline(cls, input_data: BaseTaskInput):
         pipeline_class = cls._pipeline_mapping.get(type(input_data))
 
         if pipeline_class is None:
             raise ValueError(f"Unknown task type: {type(input_data)}")
-            
-        return pipeline_class()
\ No newline at end of file
+
+        if not pipeline_class.reusable:
+            return pipeline_class()
+
+        with cls._lock:
+            pipeline = cls._instances.get(pipeline_class)
+            if pipeline is None:
+                pipeline = cls._instances[pipeline_class] = pipeline_class()
+            return pipeline
\ No newline at end of file
@@ -0,0 +1,143 @@
+# src/repositories/vector_store/embedding_backends.py
+from chromadb import Documents, EmbeddingFunction, Embeddings
+from chromadb.utils import embedding_functions
+from typing import List, Optional, Tuple
+from pathlib import Path
+import threading
+import numpy as np
+from src.config.settings import OPENAI_API_KEY, VectorStoreSettings
+from src.repositories.vector_store.embedding_batcher import EmbeddingBatcher
+
+
+class OnnxEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Embeddings de sentença calculados localmente (CPU) com onnxruntime.
+
+    O diretório do modelo deve conter model.onnx e tokenizer.json (formato
+    do all-MiniLM-L6-v2 exportado para ONNX). Os documentos são ordenados
+    por tamanho antes de formar os lotes, reduzindo o padding, e a saída
+    volta na ordem original: mean pooling + normalização L2.
+    """
+
+    def __init__(self,
+                 model_dir: str,
+                 batch_size: int = 32,
+                 max_length: int = 256,
+                 threads: int = 0):
+        self.model_dir = Path(model_dir).expanduser()
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        self.threads = threads
+        self._session = None
+        self._tokenizer = None
+        self._input_names: List[str] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_available(model_dir: str) -> bool:
+        path = Path(model_dir).expanduser()
+        return (path / "model.onnx").exists() and (path / "tokenizer.json").exists()
+
+    def _load(self):
+        # Import tardio: só quem usa o backend local paga o custo do onnxruntime
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+        tokenizer.enable_truncation(max_length=self.max_length)
+        tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        options = onnxruntime.SessionOptions()
+        if self.threads > 0:
+            options.intra_op_num_threads = self.threads
+        session = onnxruntime.InferenceSession(
+            str(self.model_dir / "model.onnx"),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+
+        self._input_names = [model_input.name for model_input in session.get_inputs()]
+        self._tokenizer = tokenizer
+        self._session = session
+
+    def __call__(self, input: Documents) -> Embeddings:
+        with self._lock:
+            if self._session is None:
+                self._load()
+
+        order = sorted(range(len(input)), key=lambda i: len(input[i]))
+        embeddings: List[Optional[np.ndarray]] = [None] * len(input)
+        for start in range(0, len(order), self.batch_size):
+            indexes = order[start:start + self.batch_size]
+            vectors = self._embed_batch([input[i] for i in indexes])
+            for index, vector in zip(indexes, vectors):
+                embeddings[index] = vector
+        return embeddings
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+        feeds = {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "token_type_ids": np.zeros_like(input_ids),
+        }
+        outputs = self._session.run(None, {name: feeds[name] for name in self._input_names})
+
+        # Mean pooling ponderado pela máscara de atenção
+        mask = attention_mask[..., np.newaxis].astype(np.float32)
+        pooled = (outputs[0] * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        norms[norms == 0] = 1e-12
+        return (pooled / norms).astype(np.float32)
+
+
+def _openai_backend(settings: VectorStoreSettings) -> Tuple[EmbeddingFunction, str]:
+    embedding_function = embedding_functions.OpenAIEmbeddingFunction(
+        api_key=OPENAI_API_KEY,
+        model_name=settings.embedding_model,
+        api_base=settings.embedding_api_base
+    )
+
+    # Lotes por orçamento de tokens, enviados em paralelo com retry
+    embedding_function = EmbeddingBatcher(
+        embedding_function,
+        max_batch_tokens=settings.embedding_batch_tokens,
+        max_batch_size=settings.embedding_batch_size,
+        max_concurrency=settings.embedding_concurrency,
+        max_retries=settings.embedding_max_retries
+    )
+    return embedding_function, settings.embedding_model
+
+
+def _onnx_backend(settings: VectorStoreSettings) -> Tuple[EmbeddingFunction, str]:
+    model_name = f"onnx:{settings.onnx_model_name}"
+    if OnnxEmbeddingFunction.is_available(settings.onnx_model_dir):
+        return OnnxEmbeddingFunction(
+            settings.onnx_model_dir,
+            batch_size=settings.onnx_batch_size,
+            max_length=settings.onnx_max_length,
+            threads=settings.onnx_threads
+        ), model_name
+
+    # Sem modelo local: o Chroma baixa o all-MiniLM-L6-v2 uma única vez
+    print(f"ONNX model not found in {settings.onnx_model_dir}, using Chroma's default model")
+    return embedding_functions.ONNXMiniLM_L6_V2(), "onnx:all-MiniLM-L6-v2"
+
+
+_BACKENDS = {
+    "openai": _openai_backend,
+    "onnx": _onnx_backend,
+}
+
+
+def create_embedding_function(settings: VectorStoreSettings) -> Tuple[EmbeddingFunction, str]:
+    """
+    Cria a embedding function do backend configurado. Retorna também o nome
+    do modelo, usado como parte da chave do cache de embeddings.
+    """
+    backend = _BACKENDS.get(settings.embedding_backend)
+    if backend is None:
+        raise ValueError(f"Unsupported embedding backend: {settings.embedding_backend}")
+    return backend(settings)
@@ -0,0 +1,54 @@
+# src/repositories/vector_store/embedding_batcher.py
+from chromadb import Documents, EmbeddingFunction, Embeddings
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from tenacity import retry, stop_after_attempt, wait_exponential
+from src.services.token_estimation import chunk_by_tokens
+
+
+class EmbeddingBatcher(EmbeddingFunction[Documents]):
+    """
+    Divide os documentos em lotes por orçamento de tokens e os envia em
+    paralelo (com limite de concorrência), com retry e backoff exponencial
+    por lote. A ordem dos embeddings acompanha a ordem da entrada.
+    """
+
+    def __init__(self,
+                 embedding_function: EmbeddingFunction[Documents],
+                 max_batch_tokens: int = 50_000,
+                 max_batch_size: int = 256,
+                 max_concurrency: int = 4,
+                 max_retries: int = 5):
+        self.embedding_function = embedding_function
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        self._embed_batch = retry(
+            stop=stop_after_attempt(max(1, max_retries)),
+            wait=wait_exponential(multiplier=0.5, max=20),
+            reraise=True
+        )(self._embed_batch)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        batches = list(chunk_by_tokens(
+            input,
+            max_tokens=self.max_batch_tokens,
+            max_items=self.max_batch_size
+        ))
+
+        if len(batches) == 1 or self.max_concurrency == 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            workers = min(self.max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._embed_batch, batches))
+
+        return [embedding for batch in results for embedding in batch]
+
+    def _embed_batch(self, batch: Documents) -> Embeddings:
+        with self._lock:
+            self.requests += 1
+        return self.embedding_function(batch)
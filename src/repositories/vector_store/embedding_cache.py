@@ -0,0 +1,118 @@
+# src/repositories/vector_store/embedding_cache.py
+from chromadb import Documents, EmbeddingFunction, Embeddings
+from typing import Dict, Sequence
+from pathlib import Path
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+
+# Limite seguro de parâmetros por consulta em qualquer versão do SQLite
+_SQL_BATCH = 500
+
+
+class EmbeddingCache:
+    """
+    Cache local (SQLite) de embeddings, chaveado por modelo + hash do texto
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " vector BLOB NOT NULL)"
+            )
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{text}".encode()).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique_keys), _SQL_BATCH):
+                chunk = unique_keys[start:start + _SQL_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, model_name: str, items: Dict[str, np.ndarray]):
+        rows = [
+            (key, model_name, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in items.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)",
+                rows
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Envolve uma embedding function do Chroma: textos já vistos saem do
+    cache e só os misses são enviados à função original.
+    """
+
+    def __init__(self,
+                 embedding_function: EmbeddingFunction[Documents],
+                 model_name: str,
+                 cache: EmbeddingCache):
+        self.embedding_function = embedding_function
+        self.model_name = model_name
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.calls = 0
+        self.saved_calls = 0
+
+    def __call__(self, input: Documents) -> Embeddings:
+        keys = [EmbeddingCache.key(self.model_name, text) for text in input]
+        cached = self.cache.get_many(keys)
+
+        # Textos repetidos na mesma chamada são enviados uma única vez
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, input):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        misses = sum(1 for key in keys if key in missing)
+        self.hits += len(keys) - misses
+        self.misses += misses
+
+        if missing:
+            self.calls += 1
+            vectors = self.embedding_function(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model_name, computed)
+            cached.update({key: np.asarray(v, dtype=np.float32) for key, v in computed.items()})
+        else:
+            self.saved_calls += 1
+
+        return [cached[key] for key in keys]
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "embedding_calls": self.calls,
+            "saved_calls": self.saved_calls,
+            "saved_texts": self.hits
+        }
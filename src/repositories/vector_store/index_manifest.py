@@ -0,0 +1,106 @@
+# src/repositories/vector_store/index_manifest.py
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+from pathlib import Path
+import json
+import os
+from src.services.project_loader.cache import _hash_file
+
+# Manifestos de collections não persistentes (o client em memória do Chroma
+# também é compartilhado pelo processo): collection -> (arquivos, regras)
+_memory_manifests: Dict[str, Tuple[Dict[str, "IndexedFile"], int]] = {}
+
+
+class IndexedFile(NamedTuple):
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+
+class IndexManifest:
+    """
+    Arquivos cujas regras estão no índice de uma collection, com a versão
+    indexada de cada um. É gravado só depois que o upsert deu certo, então
+    uma execução que falha (ou outra collection do mesmo projeto) não faz o
+    índice parecer atualizado. `rules` é o total de regras na collection
+    quando o manifesto foi gravado (zero é válido: projeto sem regras).
+    """
+
+    def __init__(self, collection_name: str, directory: Optional[str] = None):
+        self.collection_name = collection_name
+        self.path = Path(directory) / f"{collection_name}.json" if directory else None
+        self.files, self.rules = self._load()
+
+    def _load(self) -> Tuple[Dict[str, IndexedFile], int]:
+        if self.path is None:
+            files, rules = _memory_manifests.get(self.collection_name, ({}, 0))
+            return dict(files), rules
+        if not self.path.exists():
+            return {}, 0
+        try:
+            data = json.loads(self.path.read_text())
+            files = {path: IndexedFile(*entry) for path, entry in data["files"].items()}
+            return files, data.get("rules", 0)
+        except Exception as e:
+            print(f"Error reading index manifest {self.path}: {str(e)}")
+            return {}, 0
+
+    def save(self):
+        if self.path is None:
+            _memory_manifests[self.collection_name] = (dict(self.files), self.rules)
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({
+                "files": {p: list(f) for p, f in self.files.items()},
+                "rules": self.rules,
+            }))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error writing index manifest {self.path}: {str(e)}")
+
+    def diff(self, entries: Iterable) -> Tuple[Set[str], Set[str]]:
+        """
+        Compara com o inventário atual: (arquivos novos ou alterados,
+        arquivos indexados que não existem mais). Como no cache de
+        componentes, mtime + tamanho decidem e, se só o mtime mudou,
+        o hash do conteúdo.
+        """
+        stale: Set[str] = set()
+        live: Set[str] = set()
+        for entry in entries:
+            live.add(entry.path)
+            indexed = self.files.get(entry.path)
+            if indexed is None or indexed.size != entry.size:
+                stale.add(entry.path)
+            elif indexed.mtime_ns != entry.mtime_ns:
+                try:
+                    unchanged = _hash_file(entry.path) == indexed.content_hash
+                except OSError:
+                    unchanged = False
+                if unchanged:
+                    self.files[entry.path] = indexed._replace(mtime_ns=entry.mtime_ns)
+                else:
+                    stale.add(entry.path)
+        removed = set(self.files) - live
+        return stale, removed
+
+    def discard(self, paths: Iterable[str]):
+        for path in paths:
+            self.files.pop(path, None)
+
+    def record(self, entries: Iterable):
+        """
+        Marca os arquivos como indexados na versão do inventário
+        """
+        for entry in entries:
+            try:
+                content_hash = _hash_file(entry.path)
+            except OSError as e:
+                print(f"Error hashing {entry.path}: {str(e)}")
+                continue
+            self.files[entry.path] = IndexedFile(entry.mtime_ns, entry.size, content_hash)
+
+    def clear(self):
+        self.files = {}
+        self.rules = 0
@@ -1,36 +1,153 @@
 # src/services/vector_store/store.py
 import chromadb
-from chromadb.utils import embedding_functions
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
+from pathlib import Path
 import json
 import hashlib
-from src.config.settings import OPENAI_API_KEY
+import os
+import subprocess
+from src.config.settings import get_settings
+from src.repositories.vector_store.embedding_backends import create_embedding_function
+from src.repositories.vector_store.embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+from src.repositories.vector_store.index_manifest import IndexManifest
+
+ACTIVE_COLLECTION_FILE = "active_collection.json"
+MANIFESTS_DIR = "manifests"
+# Caminhos por filtro $in ao remover regras de arquivos
+_PATHS_PER_QUERY = 500
 
 class VectorStore:
-    def __init__(self):
+    def __init__(self, project_path: Optional[str] = None, commit: Optional[str] = None):
+        """
+        Com project_path, usa a collection daquele projeto/commit e a marca
+        como ativa. Sem ele (ex.: sessões de consulta), reabre a última
+        collection ativa, sem precisar redescobrir o projeto.
+        """
+        self.settings = get_settings().vector_store
+
         # Inicializa o client do Chroma
-        self.client = chromadb.Client()
+        if self.settings.persistent:
+            self.client = chromadb.PersistentClient(path=self.settings.persist_directory)
+        else:
+            self.client = chromadb.Client()
         
-        # Usa o embedding function da OpenAI
-        self.embedding_function = embedding_functions.OpenAIEmbeddingFunction(
-            api_key=OPENAI_API_KEY,
-            model_name="text-embedding-ada-002"
-        )
+        # Backend de embeddings configurado (OpenAI ou ONNX local)
+        self.embedding_function, self.embedding_model = create_embedding_function(self.settings)
+
+        # Só os textos ainda não vistos vão para a API de embeddings
+        if self.settings.embedding_cache_enabled:
+            self.embedding_function = CachedEmbeddingFunction(
+                self.embedding_function,
+                model_name=self.embedding_model,
+                cache=EmbeddingCache(self.settings.embedding_cache_path)
+            )
+
+        metadata = {"description": "Business rules extracted from code"}
+        self.project_path = project_path
+        if project_path is not None:
+            commit = commit or _detect_commit(project_path)
+            self.collection_name = self._collection_name(project_path, commit)
+            metadata.update({"project_path": os.path.abspath(project_path), "commit": commit})
+        else:
+            self.collection_name = self._active_collection_name() or self.settings.collection_prefix
         
         # Cria ou obtém a collection
         self.collection = self.client.get_or_create_collection(
-            name="business_rules",
+            name=self.collection_name,
             embedding_function=self.embedding_function,
-            metadata={"description": "Business rules extracted from code"}
+            metadata=metadata
         )
 
+        self.commit = commit
+        if project_path is not None:
+            self._set_active_collection(self.collection_name)
+
+    def mark_active(self):
+        """
+        Torna esta collection a ativa (reaberta pelas sessões sem projeto)
+        """
+        self._set_active_collection(self.collection_name)
+
+    def commit_changed(self) -> bool:
+        """
+        Indica se o projeto mudou de commit desde que a store foi aberta
+        (a collection aberta é a do commit anterior)
+        """
+        return self.project_path is not None and _detect_commit(self.project_path) != self.commit
+
+    def close(self):
+        """
+        Fecha o cache de embeddings (SQLite); o client do Chroma é do processo
+        """
+        if isinstance(self.embedding_function, CachedEmbeddingFunction):
+            self.embedding_function.cache.close()
+
+    def has_index(self) -> bool:
+        """
+        Indica se a collection já tem regras indexadas (warm start)
+        """
+        return self.collection.count() > 0
+
+    def manifest(self) -> IndexManifest:
+        """
+        Arquivos já indexados nesta collection (ver IndexManifest)
+        """
+        directory = None
+        if self.settings.persistent:
+            directory = os.path.join(self.settings.persist_directory, MANIFESTS_DIR)
+        return IndexManifest(self.collection_name, directory)
+
+    @property
+    def embedding_cache_stats(self) -> Optional[Dict[str, float]]:
+        """
+        Hits, misses e chamadas economizadas do cache de embeddings
+        """
+        if isinstance(self.embedding_function, CachedEmbeddingFunction):
+            return self.embedding_function.stats
+        return None
+
+    def _collection_name(self, project_path: str, commit: str) -> str:
+        project_key = hashlib.sha256(os.path.abspath(project_path).encode()).hexdigest()[:12]
+        name = f"{self.settings.collection_prefix}_{project_key}_{commit[:12]}"
+        # Dimensões diferentes por backend: cada um tem sua própria collection
+        if self.settings.embedding_backend != "openai":
+            name = f"{name}_{self.settings.embedding_backend}"
+        return name
+
+    def _active_collection_path(self) -> Optional[Path]:
+        if not self.settings.persistent:
+            return None
+        return Path(self.settings.persist_directory) / ACTIVE_COLLECTION_FILE
+
+    def _active_collection_name(self) -> Optional[str]:
+        path = self._active_collection_path()
+        if path is None or not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text())["collection"]
+        except Exception as e:
+            print(f"Error reading active collection: {str(e)}")
+            return None
+
+    def _set_active_collection(self, name: str):
+        path = self._active_collection_path()
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({"collection": name}))
+        except Exception as e:
+            print(f"Error writing active collection: {str(e)}")
+
     def store_rules(self, rules: List[Dict[str, Any]]):
         """
-        Armazena as regras de negócio na vector store
+        Armazena as regras de negócio na vector store. Usa upsert com IDs
+        estáveis (arquivo + regra), então re-executar é idempotente.
         """
         documents = []  # Texto para embedding
         metadatas = []  # Metadados associados
         ids = []        # IDs únicos
+        positions: Dict[str, int] = {}
         
         for rule in rules:
             # Prepara o texto para embedding combinando informações relevantes
@@ -39,6 +156,7 @@ class VectorStore:
             # Prepara metadados
             metadata = {
                 'rule_id': rule['id'],
+                'source_path': rule.get('source_path', ''),
                 'function_name': rule['function_name'],
                 'type': rule.get('type', ''),
                 'confidence': rule.get('confidence', ''),
@@ -49,19 +167,45 @@ class VectorStore:
                 'description': rule.get('description', '')
             }
             
-            # Gera um ID único baseado no conteúdo
-            unique_id = self._generate_unique_id(rule['id'], rule['content'])
+            # ID estável: a mesma regra do mesmo arquivo sempre cai no mesmo registro
+            unique_id = self._generate_unique_id(metadata['source_path'], rule['id'])
+
+            # IDs repetidos no mesmo upsert são rejeitados pelo Chroma; vale o último
+            if unique_id in positions:
+                index = positions[unique_id]
+                documents[index], metadatas[index] = rule_text, metadata
+                continue
             
+            positions[unique_id] = len(ids)
             documents.append(rule_text)
             metadatas.append(metadata)
             ids.append(unique_id)
         
-        # Armazena no Chroma
-        self.collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
+        # Armazena no Chroma, respeitando o limite de itens por chamada
+        max_batch = self.client.get_max_batch_size()
+        for start in range(0, len(ids), max_batch):
+            self.collection.upsert(
+                documents=documents[start:start + max_batch],
+                metadatas=metadatas[start:start + max_batch],
+                ids=ids[start:start + max_batch]
+            )
+
+    def delete_rules_for_paths(self, paths: Iterable[str]) -> int:
+        """
+        Remove as regras extraídas dos arquivos informados (alterados ou
+        removidos), para que versões antigas não fiquem no índice.
+        Retorna quantos registros foram removidos.
+        """
+        paths = sorted(set(paths))
+        deleted = 0
+        max_batch = self.client.get_max_batch_size()
+        for start in range(0, len(paths), _PATHS_PER_QUERY):
+            where = {"source_path": {"$in": paths[start:start + _PATHS_PER_QUERY]}}
+            ids = self.collection.get(where=where, include=[])["ids"]
+            for id_start in range(0, len(ids), max_batch):
+                self.collection.delete(ids=ids[id_start:id_start + max_batch])
+            deleted += len(ids)
+        return deleted
 
     def _prepare_rule_text(self, rule: Dict[str, Any]) -> str:
         """
@@ -78,11 +222,11 @@ class VectorStore:
         
         return "\n".join(components)
 
-    def _generate_unique_id(self, rule_id: str, content: str) -> str:
+    def _generate_unique_id(self, source_path: str, rule_id: str) -> str:
         """
-        Gera um ID único baseado no ID da regra e seu conteúdo
+        Gera um ID único baseado no arquivo de origem e no ID da regra
         """
-        combined = f"{rule_id}_{content}"
+        combined = f"{source_path}\0{rule_id}"
         return hashlib.sha256(combined.encode()).hexdigest()[:32]
 
     def search_similar_rules(self, query: str, top_k: int = 5):
@@ -130,7 +274,7 @@ class VectorStore:
                 sample = collection.get(limit=1)
             
             return {
-                "collection_name": "business_rules",
+                "collection_name": self.collection_name,
                 "total_records": count,
                 "sample": sample
             }
@@ -157,4 +301,20 @@ class VectorStore:
         except Exception as e:
             return {
                 "error": f"Error listing rules: {str(e)}"
-            }
\ No newline at end of file
+            }
+
+
+def _detect_commit(project_path: str) -> str:
+    """
+    Commit atual do projeto; 'worktree' quando não é um repositório git
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", project_path, "rev-parse", "HEAD"],
+            capture_output=True, text=True, timeout=10
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Error detecting project commit: {str(e)}")
+    return "worktree"
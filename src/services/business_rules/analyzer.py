@@ -18,7 +18,13 @@ class BusinessRuleAnalyzer:
             rules = analyzer.analyze(component)
             all_rules.extend(rules)
         
-        return self._merge_rules(all_rules)
+        merged_rules = self._merge_rules(all_rules)
+
+        # Arquivo de origem, usado pela vector store para re-indexação incremental
+        for rule in merged_rules:
+            rule['source_path'] = str(component['path'])
+        
+        return merged_rules
     
     def _merge_rules(self, rules):
         # Agrupa regras por função
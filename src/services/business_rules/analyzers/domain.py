@@ -1,6 +1,6 @@
 from .base import BaseAnalyzer
 from .domain_discovery import DomainObjectDiscovery
-from src.services.llm_factory import LLMFactory
+from src.services.container import get_container
 from src.prompts.role import DomainRefinementPrompt
 from src.api.models import Reply
 
@@ -8,7 +8,7 @@ from src.api.models import Reply
 class BusinessRuleDomainAnalyzer(BaseAnalyzer):
     def __init__(self):
         self.domain_discovery = DomainObjectDiscovery()
-        self.llm_client = LLMFactory("openai")
+        self.llm_client = get_container().llm("openai")
         self.domain_objects = None  # Será preenchido durante a análise
     
     def prepare(self, component):
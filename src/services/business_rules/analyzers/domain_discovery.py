@@ -1,3 +1,4 @@
+from collections.abc import Mapping
 from typing import Dict, Set, List
 import re
 
@@ -10,7 +11,7 @@ class DomainObjectDiscovery:
         
         for component in components:
         # Verifica se o componente é um dicionário
-            if not isinstance(component, dict):
+            if not isinstance(component, Mapping):
                 print(f"Warning: Invalid component format: {component}")
                 continue
                 
@@ -40,7 +41,7 @@ class DomainObjectDiscovery:
         # Analisa funções
         functions = component.get('functions', [])
         for function in functions:
-            if isinstance(function, dict):
+            if isinstance(function, Mapping):
                 content = function.get('content', '')
                 self._extract_types_from_content(content)
 
@@ -69,7 +70,7 @@ class DomainObjectDiscovery:
         """Analisa como as funções usam e manipulam objetos"""
         functions = component.get('functions', [])
         for function in functions:
-            if isinstance(function, dict):
+            if isinstance(function, Mapping):
                 content = function.get('content', '').lower()
                 
                 # Analisa parâmetros da função
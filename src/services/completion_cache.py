@@ -0,0 +1,116 @@
+# src/services/completion_cache.py
+from typing import Any, Dict, Optional, Type
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pydantic import BaseModel
+from src.config.settings import get_settings
+
+
+class CompletionCache:
+    """
+    Cache em disco (SQLite) das respostas do LLM (estruturadas ou, sem
+    response_model, a resposta bruta do provider).
+
+    Entradas expiram após ttl_seconds; acima de max_entries, as menos
+    usadas recentemente são removidas.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def key(provider: str,
+            response_model: Type[BaseModel],
+            params: Dict[str, Any]) -> str:
+        payload = {
+            "provider": provider,
+            "schema": response_model.model_json_schema(),
+            "params": params,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def get(self, key: str, response_model: Type[BaseModel]) -> Optional[BaseModel]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+
+        try:
+            value = response_model.model_validate_json(row[0])
+        except Exception as e:
+            # Formato antigo do response_model: trata como miss
+            print(f"Error reading cached completion: {str(e)}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: BaseModel):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value.model_dump_json(), now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        self._conn.execute(
+            "DELETE FROM completions WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        self._conn.execute(
+            "DELETE FROM completions WHERE key IN ("
+            " SELECT key FROM completions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM completions")
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+@lru_cache
+def get_completion_cache() -> Optional[CompletionCache]:
+    settings = get_settings().llm_cache
+    if not settings.enabled:
+        return None
+    return CompletionCache(settings.path, settings.ttl_seconds, settings.max_entries)
@@ -0,0 +1,85 @@
+# src/services/container.py
+from typing import TYPE_CHECKING, Dict, Optional
+from functools import lru_cache
+import os
+import threading
+from src.services.llm_factory import LLMFactory
+from src.repositories.vector_store.store import VectorStore
+
+if TYPE_CHECKING:
+    from src.services.query.processor import QueryProcessor
+
+
+class ServiceContainer:
+    """
+    Serviços caros de construir (clients de LLM, vector store de consulta),
+    criados uma vez por processo e compartilhados entre pipelines e steps.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._llm_clients: Dict[str, LLMFactory] = {}
+        self._vector_store: Optional[VectorStore] = None
+        self._project_stores: Dict[str, VectorStore] = {}
+        self._query_processor: Optional["QueryProcessor"] = None
+
+    def llm(self, provider: str = "openai") -> LLMFactory:
+        with self._lock:
+            client = self._llm_clients.get(provider)
+            if client is None:
+                client = self._llm_clients[provider] = LLMFactory(provider)
+            return client
+
+    def vector_store(self, project_path: Optional[str] = None, check_commit: bool = False) -> VectorStore:
+        """
+        Vector store usada nas consultas: a do projeto informado ou, sem
+        projeto, a collection ativa (último projeto indexado). Com
+        check_commit (indexação), um projeto que mudou de commit ganha uma
+        store nova, na collection do commit atual.
+        """
+        with self._lock:
+            if project_path is not None:
+                key = os.path.abspath(project_path)
+                store = self._project_stores.get(key)
+                if store is None or (check_commit and store.commit_changed()):
+                    # A store anterior não é fechada: consultas em andamento
+                    # ainda podem usá-la
+                    store = self._project_stores[key] = VectorStore(project_path=project_path)
+                return store
+
+            if self._vector_store is None:
+                self._vector_store = VectorStore()
+            return self._vector_store
+
+    def set_vector_store(self, vector_store: VectorStore, project_path: Optional[str] = None):
+        """
+        Publica a collection recém-indexada para as próximas consultas
+        """
+        with self._lock:
+            self._vector_store = vector_store
+            if project_path is not None:
+                self._project_stores[os.path.abspath(project_path)] = vector_store
+
+    def query_processor(self) -> "QueryProcessor":
+        # Import tardio: o QueryProcessor também consulta o container
+        from src.services.query.processor import QueryProcessor
+
+        with self._lock:
+            if self._query_processor is None:
+                self._query_processor = QueryProcessor()
+            return self._query_processor
+
+    def reset(self):
+        with self._lock:
+            stores = [self._vector_store, *self._project_stores.values()]
+            for store in {id(store): store for store in stores if store is not None}.values():
+                store.close()
+            self._llm_clients.clear()
+            self._vector_store = None
+            self._project_stores.clear()
+            self._query_processor = None
+
+
+@lru_cache
+def get_container() -> ServiceContainer:
+    return ServiceContainer()
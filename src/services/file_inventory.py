@@ -0,0 +1,202 @@
+# src/services/file_inventory.py
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from pathlib import Path
+import os
+import re
+from src.config.settings import get_settings
+
+
+class InventoryEntry(NamedTuple):
+    path: str           # Caminho completo, no mesmo formato usado pelos loaders
+    relative_path: str  # Relativo à raiz do projeto, com '/'
+    name: str
+    suffix: str         # Extensão em minúsculas
+    size: int
+    mtime_ns: int
+
+
+class IgnoreRules:
+    """
+    Subconjunto da semântica do .gitignore: comentários, negação (!),
+    padrões só de diretório (/ no final), âncora por '/' e curingas
+    *, ?, [..] e **. A última regra que casar decide.
+    """
+
+    def __init__(self):
+        self._rules: List[Tuple[str, "re.Pattern", bool, bool]] = []
+
+    def add_patterns(self, patterns: Iterable[str], base: str = ""):
+        for line in patterns:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            if line.startswith('\\'):
+                line = line[1:]
+
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+
+            anchored = '/' in line
+            regex = _translate_glob(line.lstrip('/'))
+            if not anchored:
+                regex = r'(?:.*/)?' + regex
+            self._rules.append((base, re.compile(regex + r'\Z'), negate, dir_only))
+
+    def add_file(self, ignore_file: str, base: str = ""):
+        try:
+            with open(ignore_file, 'r', encoding='utf-8', errors='replace') as f:
+                self.add_patterns(f, base)
+        except OSError as e:
+            print(f"Error reading {ignore_file}: {str(e)}")
+
+    def is_ignored(self, relative_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for base, pattern, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not relative_path.startswith(base + '/'):
+                    continue
+                candidate = relative_path[len(base) + 1:]
+            else:
+                candidate = relative_path
+            if pattern.match(candidate):
+                ignored = not negate
+        return ignored
+
+
+def _translate_glob(pattern: str) -> str:
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            regex.append(r'(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            regex.append(r'.*')
+            i += 2
+            continue
+        if char == '*':
+            regex.append(r'[^/]*')
+        elif char == '?':
+            regex.append(r'[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                content = pattern[i + 1:end]
+                if content.startswith('!'):
+                    content = '^' + content[1:]
+                regex.append(f'[{content}]')
+                i = end
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return ''.join(regex)
+
+
+class FileInventory:
+    """
+    Inventário dos arquivos de um projeto, obtido com uma única varredura
+    (os.scandir) e compartilhado entre detecção de linguagem e loaders.
+    """
+
+    def __init__(self, root: str, entries: List[InventoryEntry]):
+        self.root = root
+        self.entries = entries
+        self._by_name: Optional[Dict[str, List[InventoryEntry]]] = None
+
+    @classmethod
+    def scan(cls,
+             project_path: str,
+             exclude_globs: Iterable[str] = (),
+             use_gitignore: bool = True) -> "FileInventory":
+        """
+        Percorre o projeto em profundidade, em ordem alfabética (arquivos de
+        um diretório antes dos seus subdiretórios, como no os.walk)
+        """
+        rules = IgnoreRules()
+        rules.add_patterns(exclude_globs)
+
+        entries: List[InventoryEntry] = []
+        stack = [(project_path, "")]
+        while stack:
+            dir_path, relative_dir = stack.pop()
+
+            if use_gitignore:
+                ignore_file = os.path.join(dir_path, '.gitignore')
+                if os.path.isfile(ignore_file):
+                    rules.add_file(ignore_file, relative_dir)
+
+            try:
+                with os.scandir(dir_path) as iterator:
+                    dir_entries = sorted(iterator, key=lambda e: e.name)
+            except OSError as e:
+                print(f"Error scanning {dir_path}: {str(e)}")
+                continue
+
+            subdirs = []
+            for entry in dir_entries:
+                relative_path = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not rules.is_ignored(relative_path, is_dir=True):
+                            subdirs.append((entry.path, relative_path))
+                        continue
+                    if not entry.is_file() or rules.is_ignored(relative_path, is_dir=False):
+                        continue
+                    stat = entry.stat()
+                except OSError as e:
+                    print(f"Error reading {entry.path}: {str(e)}")
+                    continue
+
+                entries.append(InventoryEntry(
+                    path=str(Path(entry.path)),
+                    relative_path=relative_path,
+                    name=entry.name,
+                    suffix=os.path.splitext(entry.name)[1].lower(),
+                    size=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns
+                ))
+
+            stack.extend(reversed(subdirs))
+
+        return cls(project_path, entries)
+
+    def with_suffixes(self, suffixes: Iterable[str]) -> List[InventoryEntry]:
+        suffixes = {suffix.lower() for suffix in suffixes}
+        return [entry for entry in self.entries if entry.suffix in suffixes]
+
+    def named(self, names: Iterable[str]) -> List[InventoryEntry]:
+        if self._by_name is None:
+            self._by_name = {}
+            for entry in self.entries:
+                self._by_name.setdefault(entry.name, []).append(entry)
+        return [entry for name in names for entry in self._by_name.get(name, [])]
+
+    def __iter__(self) -> Iterator[InventoryEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def scan_project(project_path: str) -> FileInventory:
+    """
+    Varre o projeto aplicando as exclusões configuradas
+    """
+    settings = get_settings().loader
+    return FileInventory.scan(
+        project_path,
+        exclude_globs=settings.exclude_globs,
+        use_gitignore=settings.respect_gitignore
+    )
@@ -1,7 +1,7 @@
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pydantic import BaseModel
-import os
+from src.services.file_inventory import FileInventory, scan_project
 
 
 class ResponseCheckLanguageModel(BaseModel):
@@ -28,28 +28,29 @@ class LanguageDetectionStrategy:
             # Podemos adicionar outros padrões aqui posteriormente
         }
 
-    def detect(self, project_path: str) -> ResponseCheckLanguageModel:
+    def detect(self, project_path: str, inventory: Optional[FileInventory] = None) -> ResponseCheckLanguageModel:
         path = Path(project_path)
         if not path.exists():
             raise ValueError(f"Project path does not exist: {project_path}")
 
+        if inventory is None:
+            inventory = scan_project(project_path)
+
         # Coleta informações sobre arquivos
         file_counts: Dict[str, int] = {}
         main_files: List[str] = []
         
         # Percorre todos os arquivos do projeto
-        for root, _, files in os.walk(project_path):
-            for file in files:
-                file_path = Path(root) / file
-                ext = file_path.suffix.lower()
-                
-                # Conta extensões
-                if ext:
-                    file_counts[ext] = file_counts.get(ext, 0) + 1
-                
-                # Verifica arquivos de configuração
-                if file in self.language_patterns['cpp']['config_files']:
-                    main_files.append(file)
+        for entry in inventory:
+            ext = entry.suffix
+            
+            # Conta extensões
+            if ext:
+                file_counts[ext] = file_counts.get(ext, 0) + 1
+            
+            # Verifica arquivos de configuração
+            if entry.name in self.language_patterns['cpp']['config_files']:
+                main_files.append(entry.name)
 
         # Calcula score para C++
         cpp_score = 0.0
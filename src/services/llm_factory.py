@@ -1,40 +1,204 @@
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
 
+import asyncio
+import threading
+import weakref
+import httpx
 import instructor
-from anthropic import Anthropic
-from src.config.settings import get_settings
-from openai import OpenAI
+from anthropic import Anthropic, AsyncAnthropic
+from anthropic.types import Message
+from src.config.settings import LLMProviderSettings, get_settings
+from src.services.completion_cache import CompletionCache, get_completion_cache
+from src.services.rate_limiter import get_rate_limiter
+from src.services.token_estimation import estimate_tokens
+from openai import AsyncOpenAI, OpenAI
+from openai.types.chat import ChatCompletion
 from pydantic import BaseModel, Field
 
 
+# Clients por processo: (provider, api_key, base_url) -> client instructor.
+# Cada client mantém seu pool de conexões HTTP (keep-alive), então TLS e
+# handshake são pagos uma vez, e não a cada LLMFactory criado.
+_clients: Dict[Tuple[str, str, str], Any] = {}
+_clients_lock = threading.Lock()
+# Clients assíncronos: conexões httpx ficam presas ao event loop que as
+# criou, então há um registro por loop. Quem cria o loop fecha os clients
+# dele antes de terminá-lo (aclose_clients / run_async).
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str, str], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _pool_options(settings: LLMProviderSettings) -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+    }
+
+
+def _http_client(settings: LLMProviderSettings) -> httpx.Client:
+    return httpx.Client(**_pool_options(settings))
+
+
+def _async_http_client(settings: LLMProviderSettings) -> httpx.AsyncClient:
+    return httpx.AsyncClient(**_pool_options(settings))
+
+
+_client_initializers = {
+    "openai": lambda s: instructor.from_openai(
+        OpenAI(base_url=s.base_url, api_key=s.api_key, http_client=_http_client(s))
+    ),
+    "anthropic": lambda s: instructor.from_anthropic(
+        Anthropic(api_key=s.api_key, http_client=_http_client(s))
+    ),
+    "llama": lambda s: instructor.from_openai(
+        OpenAI(base_url=s.base_url, api_key=s.api_key, http_client=_http_client(s)),
+        mode=instructor.Mode.JSON,
+    ),
+}
+
+
+_async_client_initializers = {
+    "openai": lambda s: instructor.from_openai(
+        AsyncOpenAI(base_url=s.base_url, api_key=s.api_key, http_client=_async_http_client(s))
+    ),
+    "anthropic": lambda s: instructor.from_anthropic(
+        AsyncAnthropic(api_key=s.api_key, http_client=_async_http_client(s))
+    ),
+    "llama": lambda s: instructor.from_openai(
+        AsyncOpenAI(base_url=s.base_url, api_key=s.api_key, http_client=_async_http_client(s)),
+        mode=instructor.Mode.JSON,
+    ),
+}
+
+
+# Tipo da resposta bruta (response_model=None) de cada provider, usado
+# para guardá-la e lê-la do cache de completions
+_raw_response_models = {
+    "openai": ChatCompletion,
+    "anthropic": Message,
+    "llama": ChatCompletion,
+}
+
+
+def _provider_settings(provider: str, initializers: Dict[str, Any]) -> Tuple[LLMProviderSettings, Tuple[str, str, str]]:
+    settings = getattr(get_settings(), provider, None)
+    if settings is None or provider not in initializers:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+    return settings, (provider, settings.api_key or "", getattr(settings, "base_url", None) or "")
+
+
+def get_client(provider: str) -> Any:
+    """
+    Client compartilhado (thread-safe) do provider, criado na primeira chamada
+    """
+    settings, key = _provider_settings(provider, _client_initializers)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = _client_initializers[provider](settings)
+        return client
+
+
+def get_async_client(provider: str) -> Any:
+    """
+    Client assíncrono do provider, compartilhado dentro do event loop atual
+    """
+    settings, key = _provider_settings(provider, _async_client_initializers)
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = _async_client_initializers[provider](settings)
+        return client
+
+
+async def aclose_clients():
+    """
+    Fecha os clients assíncronos do event loop atual; deve ser chamado
+    antes de o loop terminar
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _async_clients.pop(loop, {})
+    for client in clients.values():
+        await client.client.close()
+
+
+def run_async(coro) -> Any:
+    """
+    asyncio.run que fecha, ao final, os clients assíncronos criados no loop
+    """
+    async def run_and_close():
+        try:
+            return await coro
+        finally:
+            await aclose_clients()
+
+    return asyncio.run(run_and_close())
+
+
+def close_clients():
+    """
+    Fecha os pools de conexão (ex.: no encerramento da aplicação),
+    incluindo clients assíncronos de loops que não foram fechados
+    """
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        async_clients = list(_async_clients.items())
+        _async_clients.clear()
+
+    for client in clients:
+        client.client.close()
+    for loop, loop_clients in async_clients:
+        for client in loop_clients.values():
+            _close_async_client(loop, client)
+
+
+def _close_async_client(loop: asyncio.AbstractEventLoop, client: Any):
+    try:
+        current = asyncio.get_running_loop()
+    except RuntimeError:
+        current = None
+    try:
+        if loop is current:
+            # Chamado de dentro do próprio loop: o fechamento é agendado
+            loop.create_task(client.client.close())
+        elif loop.is_running():
+            # Loop de outra thread (ex.: servidor da API)
+            asyncio.run_coroutine_threadsafe(client.client.close(), loop).result(timeout=5)
+        elif not loop.is_closed():
+            loop.run_until_complete(client.client.close())
+        # Loop já fechado: as conexões não podem mais ser encerradas por ele
+        # e são liberadas junto com o client
+    except Exception as e:
+        print(f"Error closing async client: {str(e)}")
+
 
 class LLMFactory:
     def __init__(self, provider: str):
         self.provider = provider
         self.settings = getattr(get_settings(), provider)
-        self.client = self._initialize_client()
+        self._initialize_client()
 
     def _initialize_client(self) -> Any:
-        client_initializers = {
-            "openai": lambda s: instructor.from_openai(OpenAI(api_key=s.api_key)),
-            "anthropic": lambda s: instructor.from_anthropic(
-                Anthropic(api_key=s.api_key)
-            ),
-            "llama": lambda s: instructor.from_openai(
-                OpenAI(base_url=s.base_url, api_key=s.api_key),
-                mode=instructor.Mode.JSON,
-            ),
-        }
+        return get_client(self.provider)
 
-        initializer = client_initializers.get(self.provider)
-        if initializer:
-            return initializer(self.settings)
-        raise ValueError(f"Unsupported LLM provider: {self.provider}")
+    @property
+    def client(self) -> Any:
+        # Resolvido a cada uso: segue o registro mesmo após close_clients()
+        return get_client(self.provider)
 
-    def create_completion(
+    def _completion_params(
         self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
-    ) -> Any:
-        completion_params = {
+    ) -> Dict[str, Any]:
+        return {
             "model": kwargs.get("model", self.settings.default_model),
             "temperature": kwargs.get("temperature", self.settings.temperature),
             "max_retries": kwargs.get("max_retries", self.settings.max_retries),
@@ -42,7 +206,141 @@ class LLMFactory:
             "response_model": response_model,
             "messages": messages,
         }
-        return self.client.chat.completions.create(**completion_params)
+
+    def create_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Any:
+        completion_params = self._completion_params(response_model, messages, **kwargs)
+        cache, key, cached_model = self._cache_lookup(completion_params, kwargs.get("cache", True))
+        if key is not None:
+            cached = cache.get(key, cached_model)
+            if cached is not None:
+                return cached
+
+        limiter, estimated = self._rate_limit(completion_params)
+        reserved = limiter.acquire(estimated) if limiter is not None else 0
+
+        # Se a chamada falhar, a reserva inteira volta para o bucket
+        used = 0
+        try:
+            completion = self.client.chat.completions.create(**completion_params)
+            used = _total_tokens(completion)
+        finally:
+            if limiter is not None:
+                limiter.record_usage(reserved, used)
+        if key is not None:
+            cache.put(key, completion)
+        return completion
+
+    async def acreate_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Any:
+        """
+        Versão assíncrona de create_completion (mesmos parâmetros, retries e
+        validação do response_model), sem bloquear o event loop
+        """
+        completion_params = self._completion_params(response_model, messages, **kwargs)
+        cache, key, cached_model = self._cache_lookup(completion_params, kwargs.get("cache", True))
+        if key is not None:
+            cached = cache.get(key, cached_model)
+            if cached is not None:
+                return cached
+
+        limiter, estimated = self._rate_limit(completion_params)
+        reserved = await limiter.aacquire(estimated) if limiter is not None else 0
+
+        used = 0
+        try:
+            client = get_async_client(self.provider)
+            completion = await client.chat.completions.create(**completion_params)
+            used = _total_tokens(completion)
+        finally:
+            if limiter is not None:
+                limiter.record_usage(reserved, used)
+        if key is not None:
+            cache.put(key, completion)
+        return completion
+
+    def stream_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Iterator[BaseModel]:
+        """
+        Gera versões parciais do response_model à medida que os tokens
+        chegam; a última é a resposta completa. Respostas em cache são
+        entregues de uma vez.
+        """
+        completion_params = self._completion_params(response_model, messages, **kwargs)
+        cache, key, cached_model = self._cache_lookup(completion_params, kwargs.get("cache", True))
+        if key is not None:
+            cached = cache.get(key, cached_model)
+            if cached is not None:
+                yield cached
+                return
+
+        limiter, estimated = self._rate_limit(completion_params)
+        reserved = limiter.acquire(estimated) if limiter is not None else 0
+
+        partial = None
+        try:
+            for partial in self.client.chat.completions.create_partial(**completion_params):
+                yield partial
+        finally:
+            if limiter is not None:
+                # O stream não informa o uso real: prompt estimado + saída gerada
+                prompt_tokens = estimated - (completion_params["max_tokens"] or 0)
+                output_tokens = estimate_tokens(partial.model_dump_json()) if partial is not None else 0
+                limiter.record_usage(reserved, prompt_tokens + output_tokens)
+
+        if key is not None and partial is not None:
+            cache.put(key, response_model.model_validate(partial.model_dump()))
+
+    def _cache_lookup(
+        self, completion_params: Dict[str, Any], use_cache: bool
+    ) -> Tuple[Optional[CompletionCache], Optional[str], Optional[Type[BaseModel]]]:
+        """
+        Cache, chave e modelo de leitura da chamada, se ela for cacheável:
+        determinística (temperature=0) e sem opt-out (cache=False). Sem
+        response_model, a resposta bruta do provider é cacheada.
+        """
+        response_model = completion_params["response_model"] or _raw_response_models.get(self.provider)
+        if not use_cache or response_model is None or completion_params["temperature"] != 0:
+            return None, None, None
+        cache = get_completion_cache()
+        if cache is None:
+            return None, None, None
+
+        params = {k: v for k, v in completion_params.items() if k not in ("response_model", "max_retries")}
+        return cache, CompletionCache.key(self.provider, response_model, params), response_model
+
+    def _rate_limit(self, completion_params: Dict[str, Any]) -> Tuple[Any, int]:
+        """
+        Limiter do provider/modelo e tokens estimados da chamada (prompt +
+        máximo de saída, como as APIs contabilizam para o TPM)
+        """
+        limiter = get_rate_limiter(self.provider, completion_params["model"])
+        if limiter is None:
+            return None, 0
+        prompt_tokens = sum(
+            estimate_tokens(str(message.get("content", "")))
+            for message in completion_params["messages"]
+        )
+        return limiter, prompt_tokens + (completion_params["max_tokens"] or 0)
+
+
+def _total_tokens(completion: Any) -> Optional[int]:
+    """
+    Uso real informado pela API, quando o instructor preserva a resposta
+    (ou quando a resposta já é a bruta, sem response_model)
+    """
+    usage = getattr(getattr(completion, "_raw_response", completion), "usage", None)
+    if usage is None:
+        return None
+    # OpenAI: total_tokens; Anthropic: input_tokens + output_tokens
+    total = getattr(usage, "total_tokens", None)
+    if total is None:
+        total = (getattr(usage, "input_tokens", 0) or 0) + (getattr(usage, "output_tokens", 0) or 0)
+    return total
+
 
 class CompletionModel(BaseModel):
         response: str = Field(description="Your response to the user.")
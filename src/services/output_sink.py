@@ -0,0 +1,232 @@
+# src/services/output_sink.py
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO
+import atexit
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from src.config.settings import get_settings
+
+
+class OutputSink(ABC):
+    """
+    Destino das mensagens exibidas pelos steps dos pipelines
+    """
+
+    # False quando ninguém acompanha a resposta enquanto ela é gerada
+    # (lote, API sem streaming): os steps pedem a resposta de uma vez
+    streams_deltas: bool = True
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        """Mensagem completa"""
+
+    @abstractmethod
+    def write_delta(self, text: str) -> None:
+        """Trecho de uma resposta em streaming"""
+
+    @abstractmethod
+    def end_stream(self) -> None:
+        """Fim da resposta em streaming"""
+
+    @abstractmethod
+    def ask(self, prompt: str) -> str:
+        """Exibe o prompt e lê a resposta do usuário"""
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class HeadlessSink(OutputSink):
+    """
+    Modo rápido: escreve sem nenhum delay, com flush só quando necessário
+    (antes de ler a entrada, no fim de um stream ou ao encerrar)
+    """
+
+    streams_deltas = False
+
+    def __init__(self, stream: Optional[TextIO] = None, input_func: Callable[[str], str] = input):
+        self.stream = stream or sys.stdout
+        self.input_func = input_func
+
+    def write(self, text: str) -> None:
+        self.stream.write(text + "\n")
+
+    def write_delta(self, text: str) -> None:
+        self.stream.write(text)
+
+    def end_stream(self) -> None:
+        self.stream.write("\n")
+        self.flush()
+
+    def ask(self, prompt: str) -> str:
+        self.write(prompt)
+        self.flush()
+        return self.input_func("> ")
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class AnimatedSink(OutputSink):
+    """
+    Efeito de digitação em uma thread de fundo: write() só enfileira o
+    texto e retorna, então o pipeline continua trabalhando enquanto o texto
+    é exibido. Trechos em streaming são exibidos sem delay artificial.
+    """
+
+    def __init__(self,
+                 min_delay: float = 0.01,
+                 max_delay: float = 0.03,
+                 stream: Optional[TextIO] = None,
+                 input_func: Callable[[str], str] = input):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.stream = stream or sys.stdout
+        self.input_func = input_func
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="output-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, text: str) -> None:
+        self._queue.put(("animate", text + "\n"))
+
+    def write_delta(self, text: str) -> None:
+        self._queue.put(("raw", text))
+
+    def end_stream(self) -> None:
+        self._queue.put(("raw", "\n"))
+
+    def ask(self, prompt: str) -> str:
+        # A pergunta só aparece depois do que já estava na fila
+        self.write(prompt)
+        self.flush()
+        return self.input_func("> ")
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                mode, text = item
+                if mode == "raw":
+                    self.stream.write(text)
+                    self.stream.flush()
+                else:
+                    self._animate(text)
+            finally:
+                self._queue.task_done()
+
+    def _animate(self, text: str):
+        for char in text:
+            self.stream.write(char)
+            self.stream.flush()
+            # Delay maior para pontuação para efeito mais natural
+            if char in '.!?':
+                time.sleep(self.max_delay * 2)
+            else:
+                time.sleep(random.uniform(self.min_delay, self.max_delay))
+
+
+class JsonEventsSink(OutputSink):
+    """
+    Eventos JSON (um por linha) para clientes programáticos. Com callback,
+    os eventos são entregues ao chamador em vez de escritos no stream.
+    """
+
+    def __init__(self,
+                 stream: Optional[TextIO] = None,
+                 callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 input_func: Callable[[str], str] = input,
+                 streams_deltas: bool = True):
+        self.stream = stream or sys.stdout
+        self.callback = callback
+        self.input_func = input_func
+        self.streams_deltas = streams_deltas
+
+    def _emit(self, event: Dict[str, Any]):
+        if self.callback is not None:
+            self.callback(event)
+        else:
+            self.stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def write(self, text: str) -> None:
+        self._emit({"type": "message", "text": text})
+
+    def write_delta(self, text: str) -> None:
+        self._emit({"type": "delta", "text": text})
+
+    def end_stream(self) -> None:
+        self._emit({"type": "end"})
+        self.flush()
+
+    def ask(self, prompt: str) -> str:
+        self._emit({"type": "prompt", "text": prompt})
+        self.flush()
+        return self.input_func("")
+
+    def flush(self) -> None:
+        if self.callback is None:
+            self.stream.flush()
+
+
+_SINKS = {
+    "headless": HeadlessSink,
+    "animated": AnimatedSink,
+    "json": JsonEventsSink,
+}
+
+_current_sink: ContextVar[Optional[OutputSink]] = ContextVar("output_sink", default=None)
+_default_sink: Optional[OutputSink] = None
+_default_lock = threading.Lock()
+
+
+def create_output_sink(mode: str) -> OutputSink:
+    sink_class = _SINKS.get(mode)
+    if sink_class is None:
+        raise ValueError(f"Unsupported output mode: {mode}")
+    return sink_class()
+
+
+def get_output_sink() -> OutputSink:
+    """
+    Sink do contexto atual (ex.: uma requisição da API) ou o padrão do
+    processo, definido por settings.output_mode
+    """
+    sink = _current_sink.get()
+    if sink is not None:
+        return sink
+
+    global _default_sink
+    with _default_lock:
+        if _default_sink is None:
+            _default_sink = create_output_sink(get_settings().output_mode)
+            atexit.register(_default_sink.close)
+        return _default_sink
+
+
+@contextmanager
+def use_output_sink(sink: OutputSink) -> Iterator[OutputSink]:
+    token = _current_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        sink.flush()
+        _current_sink.reset(token)
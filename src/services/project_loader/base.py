@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Mapping, Optional
+from src.services.file_inventory import FileInventory
 
 class BaseProjectLoader(ABC):
     @abstractmethod
-    def load(self, project_path: str) -> Dict[str, Any]:
+    def load(self, project_path: str, inventory: Optional[FileInventory] = None) -> Mapping[str, Any]:
         """
-        Carrega o projeto e retorna suas informações estruturadas
+        Carrega o projeto e retorna suas informações estruturadas. O
+        inventário, quando informado, evita uma nova varredura do disco.
         """
         pass
\ No newline at end of file
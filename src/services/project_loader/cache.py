@@ -0,0 +1,138 @@
+# src/services/project_loader/cache.py
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from pathlib import Path
+import hashlib
+import os
+import pickle
+
+
+class CacheEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    content_hash: str
+    component: object
+
+
+class ComponentCache:
+    """
+    Cache em disco dos componentes analisados de um projeto.
+
+    Cada arquivo é validado primeiro por mtime + tamanho; se o mtime mudou mas
+    o tamanho não, o hash do conteúdo decide se o resultado ainda é válido.
+    """
+
+    # Incrementar sempre que o formato dos componentes ou a análise mudar
+    VERSION = 4
+
+    def __init__(self, cache_dir: str, project_path: str):
+        project_key = hashlib.sha256(
+            os.path.abspath(project_path).encode()
+        ).hexdigest()[:16]
+        self.path = Path(cache_dir) / f"{project_key}.pickle"
+        self.entries: Dict[str, CacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+            if data.get('version') == self.VERSION:
+                self.entries = data['entries']
+        except Exception as e:
+            print(f"Error reading project cache {self.path}: {str(e)}")
+            self.entries = {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(
+                    {'version': self.VERSION, 'entries': self.entries},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            print(f"Error writing project cache {self.path}: {str(e)}")
+
+    def get(self,
+            file_path: Path,
+            mtime_ns: Optional[int] = None,
+            size: Optional[int] = None) -> Optional[object]:
+        """
+        Retorna o componente em cache se o arquivo não mudou. mtime/tamanho
+        já conhecidos (ex.: do inventário) evitam um novo stat.
+        """
+        key = str(file_path)
+        entry = self.entries.get(key)
+        if entry is not None:
+            if mtime_ns is None or size is None:
+                try:
+                    stat = os.stat(file_path)
+                    mtime_ns, size = stat.st_mtime_ns, stat.st_size
+                except OSError:
+                    size = None
+
+            if size is not None and size == entry.size:
+                if mtime_ns == entry.mtime_ns:
+                    self.hits += 1
+                    return entry.component
+
+                # mtime mudou (checkout, touch): confere o conteúdo
+                if _hash_file(file_path) == entry.content_hash:
+                    self.entries[key] = entry._replace(mtime_ns=mtime_ns)
+                    self._dirty = True
+                    self.hits += 1
+                    return entry.component
+
+        self.misses += 1
+        return None
+
+    def put(self, file_path: Path, component: object):
+        try:
+            stat = os.stat(file_path)
+            content_hash = _hash_file(file_path)
+        except OSError as e:
+            print(f"Error caching file {file_path}: {str(e)}")
+            return
+        self.entries[str(file_path)] = CacheEntry(
+            stat.st_mtime_ns, stat.st_size, content_hash, component
+        )
+        self._dirty = True
+
+    def prune(self, live_paths: Iterable[str]) -> List[str]:
+        """
+        Remove entradas de arquivos que não existem mais no projeto
+        """
+        live = set(live_paths)
+        removed = [path for path in self.entries if path not in live]
+        for path in removed:
+            del self.entries[path]
+        if removed:
+            self._dirty = True
+        return removed
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.entries)
+        }
+
+
+def _hash_file(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
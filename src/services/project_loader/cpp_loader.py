@@ -1,26 +1,117 @@
 # src/services/project_loader/cpp_loader.py
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
+import copy
 import os
 import re
 from .base import BaseProjectLoader
+from .cache import ComponentCache
+from .line_index import LineIndex
+from .scanner import ScopeTree
+from .include_index import IncludeIndex, parse_cmake_include_dirs
+from .source_reader import SourceFile
+from .records import (
+    RecordMapping, FunctionRecord, ClassRecord, TemplateRecord, OperatorRecord,
+    LazyMapping, intern
+)
+from src.services.file_inventory import FileInventory, scan_project
+from src.config.settings import get_settings
 
-class CppComponent:
-    def __init__(self, path: Path):
-        self.path = path
-        self.type = 'header' if path.suffix in ['.h', '.hpp'] else 'source'
-        self.includes: Set[str] = set()
-        self.namespaces: Set[str] = set()
-        self.classes: List[Dict] = []
-        self.functions: List[Dict] = []
-        self.templates: List[Dict] = []
-        self.operators: List[Dict] = []
+class CppComponent(RecordMapping):
+    """
+    Componente (arquivo) analisado. Também é o próprio registro exposto em
+    project_info['components']: component['functions'] etc. leem os slots
+    diretamente, sem cópia.
+    """
+
+    __slots__ = (
+        'path', 'type', 'encoding', 'oversized', 'includes', 'namespaces',
+        'classes', 'functions', 'templates', 'operators', 'dependencies', 'used_by'
+    )
+    _keys = __slots__
+
+    def __init__(self, path: Union[str, Path]):
+        self.path: str = intern(str(path))
+        self.type = 'header' if os.path.splitext(self.path)[1] in ('.h', '.hpp') else 'source'
+        self.includes: Tuple[str, ...] = ()
+        self.namespaces: Tuple[str, ...] = ()
+        self.classes: List[ClassRecord] = []
+        self.functions: List[FunctionRecord] = []
+        self.templates: List[TemplateRecord] = []
+        self.operators: List[OperatorRecord] = []
         self.dependencies: Set[str] = set()
         self.used_by: Set[str] = set()
+        self.encoding: Optional[str] = None
+        # Acima do limite de tamanho: só símbolos, sem corpos de função
+        self.oversized = False
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        if isinstance(value, (set, tuple)):
+            return sorted(value)
+        return value
+
+    def without_bodies(self) -> "CppComponent":
+        """
+        Cópia leve, sem o conteúdo das funções, mantida pelo loader em modo
+        streaming apenas para o grafo de dependências
+        """
+        skeleton = copy.copy(self)
+        skeleton.functions = [
+            FunctionRecord(f.return_type, f.name, f.line, "") for f in self.functions
+        ]
+        skeleton.dependencies = set()
+        skeleton.used_by = set()
+        return skeleton
+
+    def intern_strings(self):
+        """
+        Reinterna as strings de um componente vindo de outro processo ou do
+        cache em disco (o pickle não preserva o compartilhamento)
+        """
+        self.path = intern(self.path)
+        self.includes = tuple(intern(include) for include in self.includes)
+        self.namespaces = tuple(intern(namespace) for namespace in self.namespaces)
+        for function in self.functions:
+            function.name = intern(function.name)
+            function.return_type = intern(function.return_type)
+        for class_info in self.classes:
+            class_info.name = intern(class_info.name)
+            class_info.base_class = intern(class_info.base_class)
+        for template in self.templates:
+            template.name = intern(template.name)
 
 class CppProjectLoader(BaseProjectLoader):
-    def __init__(self):
+    SOURCE_EXTENSIONS = ['.cpp', '.hpp', '.h', '.cc']
+
+    def __init__(self, workers: Optional[int] = None, cache_dir: Optional[str] = None):
+        settings = get_settings().loader
+        self.workers = settings.workers if workers is None else workers
+        if self.workers <= 0:
+            self.workers = os.cpu_count() or 1
+        self.parallel_chunksize = settings.parallel_chunksize
+        self.include_dirs: List[str] = list(settings.include_dirs)
+        self.max_file_bytes = settings.max_file_bytes
+        self.fallback_encodings: List[str] = list(settings.fallback_encodings)
+        if cache_dir is None and settings.cache_enabled:
+            cache_dir = settings.cache_dir
+        self.cache_dir = cache_dir
+        self.cache: Optional[ComponentCache] = None
         self.components: Dict[str, CppComponent] = {}
+        # Arquivos re-analisados / removidos desde a última carga
+        self.changed_paths: List[str] = []
+        self.removed_paths: List[str] = []
+        self.project_path: Optional[str] = None
+        self.cmake_files: List[Path] = []
+        self.ambiguous_includes: List[Dict[str, Any]] = []
+        self._include_index: Optional[IncludeIndex] = None
+        # Preenchido ao final de iter_components (modo streaming)
+        self.project_info: Optional[Mapping[str, Any]] = None
+        self._include_pattern = re.compile(r'#include\s*[<"]([^>"]+)[>"]')
+        self._namespace_pattern = re.compile(r'namespace\s+(\w+)')
         self._template_pattern = re.compile(r'template\s*<[^>]+>\s*(class|struct|typename)\s+(\w+)')
         self._operator_pattern = re.compile(r'operator\s*([+\-*/=%^&|<>!]+|\[\]|\(\))\s*\([^)]*\)')
         self._class_pattern = re.compile(r'class\s+(\w+)(?:\s*:\s*(?:public|private|protected)\s+(\w+))?')
@@ -58,209 +149,398 @@ class CppProjectLoader(BaseProjectLoader):
             r'(?=\s*{)'                               # Seguido por { (removemos ;)
         )
 
+        # Versões em bytes dos padrões, para varrer arquivos mapeados em memória
+        self._byte_patterns = {
+            pattern: re.compile(pattern.pattern.encode(), pattern.flags & ~re.UNICODE)
+            for pattern in (
+                self._include_pattern, self._namespace_pattern, self._template_pattern,
+                self._operator_pattern, self._class_pattern, self._function_pattern
+            )
+        }
+
         self._cpp_keywords = {
             'if', 'else', 'for', 'while', 'do', 'switch', 'case', 'break', 
             'continue', 'return', 'try', 'catch', 'throw', 'goto'
         }
         
 
-    def load(self, project_path: str) -> Dict[str, Any]:
+    def load(self, project_path: str, inventory: Optional[FileInventory] = None) -> Mapping[str, Any]:
+        self.project_path = project_path
+        self.components = {}
+        self.cache = ComponentCache(self.cache_dir, project_path) if self.cache_dir else None
+
+        if inventory is None:
+            inventory = scan_project(project_path)
+
         # Primeira passagem: Coleta informações básicas
-        self._collect_components(project_path)
+        self._collect_components(inventory)
         
         # Segunda passagem: Análise de dependências
         self._analyze_dependencies()
+
+        if self.cache is not None:
+            self.cache.save()
         
         return self._build_project_info()
 
-    def _collect_components(self, project_path: str):
-        for root, _, files in os.walk(project_path):
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix.lower() in ['.cpp', '.hpp', '.h', '.cc']:
-                    component = CppComponent(file_path)
-                    self._analyze_file(component)
-                    self.components[str(file_path)] = component
+    def iter_components(self,
+                        project_path: str,
+                        inventory: Optional[FileInventory] = None) -> Iterator[CppComponent]:
+        """
+        Versão em streaming do load: entrega cada componente assim que é
+        analisado, mantendo apenas uma cópia sem corpos para o grafo de
+        dependências. Ao esgotar o iterador, project_info fica disponível.
 
-    def _extract_function_body(self, content: str, start_pos: int) -> str:
+        O cache de componentes não é usado aqui, pois manteria todos os
+        corpos de função em memória.
         """
-        Extrai o corpo completo da função incluindo a declaração
+        self.project_path = project_path
+        self.components = {}
+        self.cache = None
+        self.project_info = None
+
+        if inventory is None:
+            inventory = scan_project(project_path)
+
+        file_paths = [Path(entry.path) for entry in inventory.with_suffixes(self.SOURCE_EXTENSIONS)]
+        self.cmake_files = [Path(entry.path) for entry in inventory.named(['CMakeLists.txt'])]
+        self.changed_paths = [str(file_path) for file_path in file_paths]
+        self.removed_paths = []
+
+        for component in self._iter_parsed(file_paths):
+            self.components[component.path] = component.without_bodies()
+            yield component
+
+        self._analyze_dependencies()
+        self.project_info = self._build_project_info()
+
+    def _iter_parsed(self, file_paths: List[Path]) -> Iterator[CppComponent]:
         """
-        try:
-            # Encontra a primeira chave de abertura
-            pos = start_pos
-            while pos < len(content) and content[pos] != '{':
-                pos += 1
-            
-            if pos >= len(content):
-                return ""
+        Analisa os arquivos em ordem, com no máximo uma janela de arquivos em
+        andamento no pool para que o consumo mais lento limite a memória
+        """
+        if self.workers <= 1 or len(file_paths) <= 1:
+            for file_path in file_paths:
+                yield self._parse_file(file_path)
+            return
 
-            # Conta chaves para encontrar o fechamento correto
-            count = 1
-            pos += 1  # Pula a primeira chave
-            
-            # Captura o conteúdo completo da função
-            declaration = content[start_pos:pos].strip()
-            body_start = pos
-            
-            while count > 0 and pos < len(content):
-                if content[pos] == '{':
-                    count += 1
-                elif content[pos] == '}':
-                    count -= 1
-                pos += 1
-
-            if count == 0:
-                body = content[body_start:pos-1]  # -1 para não incluir a última chave
-                return f"{declaration}{{\n{body}}}"
-                
-            return ""
-            
+        with self._process_pool() as executor:
+            remaining = iter(file_paths)
+            pending = deque(
+                executor.submit(_parse_file_in_worker, str(file_path))
+                for file_path in islice(remaining, self.workers * self.parallel_chunksize)
+            )
+            while pending:
+                component = pending.popleft().result()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(executor.submit(_parse_file_in_worker, str(next_path)))
+                component.intern_strings()
+                yield component
+
+    def _collect_components(self, inventory: FileInventory):
+        """
+        Coleta os componentes, re-analisando apenas arquivos que mudaram
+        desde a última carga quando o cache está habilitado
+        """
+        entries = inventory.with_suffixes(self.SOURCE_EXTENSIONS)
+        file_paths = [Path(entry.path) for entry in entries]
+        self.cmake_files = [Path(entry.path) for entry in inventory.named(['CMakeLists.txt'])]
+
+        cached: Dict[str, CppComponent] = {}
+        self.removed_paths = []
+        if self.cache is not None:
+            for entry in entries:
+                component = self.cache.get(Path(entry.path), entry.mtime_ns, entry.size)
+                if component is not None:
+                    cached[entry.path] = component
+            self.removed_paths = self.cache.prune(entry.path for entry in entries)
+
+        pending = [file_path for file_path in file_paths if str(file_path) not in cached]
+        self.changed_paths = [str(file_path) for file_path in pending]
+
+        if self.workers > 1 and len(pending) > 1:
+            parsed = self._parse_files_parallel(pending)
+        else:
+            parsed = [self._parse_file(file_path) for file_path in pending]
+
+        parsed_by_path = {component.path: component for component in parsed}
+        if self.cache is not None:
+            for path, component in parsed_by_path.items():
+                self.cache.put(Path(path), component)
+
+        # Inserção na mesma ordem da listagem, independente do modo de carga
+        for file_path in file_paths:
+            path = str(file_path)
+            if path in cached:
+                component = cached[path]
+                component.intern_strings()
+            else:
+                component = parsed_by_path[path]
+            self.components[component.path] = component
+
+    def _parse_file(self, file_path: Path) -> CppComponent:
+        component = CppComponent(file_path)
+        self._analyze_file(component)
+        return component
+
+    def _parse_files_parallel(self, file_paths: List[Path]) -> Iterable[CppComponent]:
+        """
+        Analisa os arquivos em um pool de processos. O map do executor
+        preserva a ordem de entrada, então o resultado é idêntico ao serial.
+        """
+        try:
+            with self._process_pool() as executor:
+                components = list(executor.map(
+                    _parse_file_in_worker,
+                    [str(file_path) for file_path in file_paths],
+                    chunksize=self.parallel_chunksize
+                ))
+            for component in components:
+                component.intern_strings()
+            return components
         except Exception as e:
-            print(f"Error extracting function body: {str(e)}")
+            print(f"Error in parallel loading, falling back to serial: {str(e)}")
+            return [self._parse_file(file_path) for file_path in file_paths]
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        # Opções por instância que afetam a análise de cada arquivo
+        options = {
+            'max_file_bytes': self.max_file_bytes,
+            'fallback_encodings': list(self.fallback_encodings),
+        }
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(options,)
+        )
+
+    def _extract_function_body(self,
+                               source: SourceFile,
+                               start_pos: int,
+                               header_end: int,
+                               scopes: ScopeTree) -> str:
+        """
+        Extrai o corpo completo da função incluindo a declaração, usando a
+        árvore de escopos já construída para o arquivo
+        """
+        content = source.data
+
+        # O padrão de função termina imediatamente antes de espaços + '{';
+        # buscar a partir do fim da assinatura ignora chaves nos parâmetros
+        # (ex.: valores default `= {}`)
+        brace_pos = content.find(source.literal('{'), header_end)
+        scope = scopes.scope_at(brace_pos) if brace_pos >= 0 else None
+
+        # Chave dentro de comentário/string ou nunca fechada
+        if scope is None or not scope.closed:
             return ""
+
+        # Descarta o delimitador (';' ou '}') consumido pelo início do padrão
+        declaration_start = start_pos
+        if content[declaration_start:declaration_start + 1] in (source.literal(';'), source.literal('}')):
+            declaration_start += 1
+
+        return source.slice(declaration_start, scope.end + 1).strip()
+
+    def _pattern(self, pattern: re.Pattern, source: SourceFile) -> re.Pattern:
+        return pattern if source.is_text else self._byte_patterns[pattern]
     
     def _analyze_file(self, component: CppComponent):
         try:
-            with open(component.path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with SourceFile(component.path, self.fallback_encodings, self.max_file_bytes) as source:
+                component.encoding = source.encoding
+                component.oversized = source.oversized
+                self._analyze_source(component, source)
 
-                # Análise de includes
-                includes = re.findall(r'#include\s*[<"]([^>"]+)[>"]', content)
-                component.includes.update(includes)
-                
-                # Análise de namespaces
-                namespaces = re.findall(r'namespace\s+(\w+)', content)
-                component.namespaces.update(namespaces)
-                
-                # Análise de templates
-                for match in self._template_pattern.finditer(content):
-                    component.templates.append({
-                        'type': match.group(1),
-                        'name': match.group(2),
-                        'line': content[:match.start()].count('\n') + 1
-                    })
-                
-                # Análise de operadores sobrecarregados
-                for match in self._operator_pattern.finditer(content):
-                    component.operators.append({
-                        'operator': match.group(1),
-                        'line': content[:match.start()].count('\n') + 1
-                    })
+        except Exception as e:
+            print(f"Error analyzing file {component.path}: {str(e)}")
+
+    def _analyze_source(self, component: CppComponent, source: SourceFile):
+        content = source.data
+        text = source.text
+        lines = LineIndex(content)
+
+        # Análise de includes
+        includes = {
+            intern(text(match.group(1)))
+            for match in self._pattern(self._include_pattern, source).finditer(content)
+        }
+        component.includes = tuple(sorted(includes))
+        
+        # Análise de namespaces
+        namespaces = {
+            intern(text(match.group(1)))
+            for match in self._pattern(self._namespace_pattern, source).finditer(content)
+        }
+        component.namespaces = tuple(sorted(namespaces))
+        
+        # Análise de templates
+        for match in self._pattern(self._template_pattern, source).finditer(content):
+            component.templates.append(TemplateRecord(
+                type=intern(text(match.group(1))),
+                name=intern(text(match.group(2))),
+                line=lines.line_of(match.start())
+            ))
+        
+        # Análise de operadores sobrecarregados
+        for match in self._pattern(self._operator_pattern, source).finditer(content):
+            component.operators.append(OperatorRecord(
+                operator=intern(text(match.group(1))),
+                line=lines.line_of(match.start())
+            ))
+        
+        # Análise de classes e heranças
+        for match in self._pattern(self._class_pattern, source).finditer(content):
+            class_info = ClassRecord(
+                name=intern(text(match.group(1))),
+                base_class=intern(text(match.group(2))) if match.group(2) else None,
+                line=lines.line_of(match.start())
+            )
+            component.classes.append(class_info)
+        
+        functions_dict  = {}
+        # Arquivos acima do limite não têm os corpos extraídos
+        scopes = None if source.oversized else ScopeTree(content)
+
+        # Análise de funções com filtro de palavras reservadas
+        for match in self._pattern(self._function_pattern, source).finditer(content):
+            return_type = text(match.group(1)).strip()
+            function_name = text(match.group(2)).strip()
+            
+            if (not function_name.startswith(('if', 'else', 'for', 'while', 'switch', 'return')) and
+                not return_type.startswith(('if', 'else', 'for', 'while', 'switch', 'return'))):
                 
-                # Análise de classes e heranças
-                for match in self._class_pattern.finditer(content):
-                    class_info = {
-                        'name': match.group(1),
-                        'base_class': match.group(2) if match.group(2) else None,
-                        'line': content[:match.start()].count('\n') + 1
-                    }
-                    component.classes.append(class_info)
+                # Extrair o corpo da função
+                function_content = (
+                    self._extract_function_body(source, match.start(), match.end(), scopes)
+                    if scopes is not None else ""
+                )
                 
-                # Análise de funções
-                for match in self._function_pattern.finditer(content):
-                    component.functions.append({
-                        'return_type': match.group(1),
-                        'name': match.group(2),
-                        'line': content[:match.start()].count('\n') + 1
-                    })
-
-                functions_dict  = {}
-
-                # Análise de funções com filtro de palavras reservadas
-                for match in self._function_pattern.finditer(content):
-                    return_type = match.group(1).strip()
-                    function_name = match.group(2).strip()
-                    
-                    if (not function_name.startswith(('if', 'else', 'for', 'while', 'switch', 'return')) and
-                        not return_type.startswith(('if', 'else', 'for', 'while', 'switch', 'return'))):
-                        
-                        # Extrair o corpo da função
-                        function_content = self._extract_function_body(content, match.start())
-                        
-                        # Usar função_name como chave para evitar duplicatas
-                        if function_name not in functions_dict or function_content:
-                            functions_dict[function_name] = {
-                                'return_type': return_type,
-                                'name': function_name,
-                                'line': content[:match.start()].count('\n') + 1,
-                                'content': function_content
-                            }
-
-                # Converter o dict para lista no final
-                component.functions = list(functions_dict.values())
+                # Usar função_name como chave para evitar duplicatas
+                if function_name not in functions_dict or function_content:
+                    functions_dict[function_name] = FunctionRecord(
+                        return_type=intern(return_type),
+                        name=intern(function_name),
+                        line=lines.line_of(match.start()),
+                        content=function_content
+                    )
 
-        except Exception as e:
-            print(f"Error analyzing file {component.path}: {str(e)}")
+        # Converter o dict para lista no final
+        component.functions = list(functions_dict.values())
 
     def _analyze_dependencies(self):
         """
         Analisa dependências entre componentes baseado em includes e uso de classes
         """
+        # Componentes vindos do cache trazem o grafo da carga anterior
+        for component in self.components.values():
+            component.dependencies.clear()
+            component.used_by.clear()
+
+        self._include_index = IncludeIndex(self.components, self._collect_include_dirs())
+        self.ambiguous_includes = []
+
         for comp_path, component in self.components.items():
             # Mapeia includes para componentes reais do projeto
-            for include in component.includes:
+            for include in sorted(component.includes):
                 include_path = self._resolve_include_path(include, component.path)
                 if include_path in self.components:
                     component.dependencies.add(include_path)
                     self.components[include_path].used_by.add(comp_path)
 
+        if self.ambiguous_includes:
+            print(f"Warning: {len(self.ambiguous_includes)} ambiguous includes were not linked "
+                  f"(see project_info['ambiguous_includes'])")
+
+    def _collect_include_dirs(self) -> List[str]:
+        """
+        Diretórios de include configurados (relativos à raiz do projeto)
+        seguidos dos declarados nos CMakeLists.txt
+        """
+        include_dirs = [
+            os.path.join(self.project_path, d) if self.project_path else d
+            for d in self.include_dirs
+        ]
+        for cmake_file in self.cmake_files:
+            include_dirs.extend(parse_cmake_include_dirs(cmake_file, self.project_path))
+        return list(dict.fromkeys(include_dirs))
+
     def _resolve_include_path(self, include: str, current_file: Path) -> str:
         """
         Tenta resolver o caminho real de um arquivo incluído
         """
-        # Remove extensão se presente no include
-        include_base = Path(include).stem
-        
-        # Procura por arquivos que correspondam ao include
-        for comp_path in self.components:
-            if Path(comp_path).stem == include_base:
-                return comp_path
+        include_path, candidates = self._include_index.resolve(include, current_file)
+        if include_path is not None:
+            return include_path
+
+        if len(candidates) > 1:
+            self.ambiguous_includes.append({
+                'file': str(current_file),
+                'include': include,
+                'candidates': candidates
+            })
         return include
 
-    def _build_project_info(self) -> Dict[str, Any]:
-        return {
-            'components': [
-                {
-                    'path': str(comp.path),
-                    'type': comp.type,
-                    'includes': list(comp.includes),
-                    'namespaces': list(comp.namespaces),
-                    'classes': comp.classes,
-                    'functions': comp.functions,
-                    'templates': comp.templates,
-                    'operators': comp.operators,
-                    'dependencies': list(comp.dependencies),
-                    'used_by': list(comp.used_by)
-                }
-                for comp in self.components.values()
-            ],
-            'dependencies_graph': self._build_dependencies_graph(),
-            'build_system': self._detect_build_system(),
-            'metrics': self._calculate_metrics()
-        }
+    def _build_project_info(self) -> Mapping[str, Any]:
+        """
+        Visão preguiçosa sobre os componentes carregados: nada é copiado, e
+        grafo/métricas só são calculados quando acessados
+        """
+        components = self.components
+        cache_stats = self.cache.stats if self.cache is not None else None
+        ambiguous_includes = self.ambiguous_includes
+
+        return LazyMapping({
+            'components': lambda: list(components.values()),
+            'dependencies_graph': lambda: self._build_dependencies_graph(components),
+            'build_system': self._detect_build_system,
+            'metrics': lambda: self._calculate_metrics(components),
+            'cache_stats': lambda: cache_stats,
+            'ambiguous_includes': lambda: ambiguous_includes
+        })
 
-    def _build_dependencies_graph(self) -> Dict[str, List[str]]:
+    def _build_dependencies_graph(self, components: Dict[str, CppComponent]) -> Dict[str, List[str]]:
         """
         Cria um grafo de dependências entre componentes
         """
         return {
-            str(comp_path): list(component.dependencies)
-            for comp_path, component in self.components.items()
+            comp_path: sorted(component.dependencies)
+            for comp_path, component in components.items()
         }
 
     def _detect_build_system(self) -> str:
         # Implementação atual mantida...
         pass
 
-    def _calculate_metrics(self) -> Dict[str, Any]:
+    def _calculate_metrics(self, components: Dict[str, CppComponent]) -> Dict[str, Any]:
         """
         Calcula métricas do projeto
         """
         return {
-            'total_components': len(self.components),
-            'total_classes': sum(len(c.classes) for c in self.components.values()),
-            'total_functions': sum(len(c.functions) for c in self.components.values()),
-            'total_templates': sum(len(c.templates) for c in self.components.values()),
-            'total_operators': sum(len(c.operators) for c in self.components.values()),
-        }
\ No newline at end of file
+            'total_components': len(components),
+            'total_classes': sum(len(c.classes) for c in components.values()),
+            'total_functions': sum(len(c.functions) for c in components.values()),
+            'total_templates': sum(len(c.templates) for c in components.values()),
+            'total_operators': sum(len(c.operators) for c in components.values()),
+        }
+
+
+# Loader reaproveitado por cada processo do pool (evita recompilar os regex)
+_worker_loader: Optional[CppProjectLoader] = None
+
+def _init_worker(options: Dict[str, Any]):
+    """
+    Initializer do pool: o loader do processo usa as mesmas opções de
+    análise da instância que criou o pool, e não só as globais
+    """
+    global _worker_loader
+    _worker_loader = CppProjectLoader(workers=1, cache_dir=None)
+    for name, value in options.items():
+        setattr(_worker_loader, name, value)
+
+def _parse_file_in_worker(file_path: str) -> CppComponent:
+    global _worker_loader
+    if _worker_loader is None:
+        _worker_loader = CppProjectLoader(workers=1)
+    return _worker_loader._parse_file(Path(file_path))
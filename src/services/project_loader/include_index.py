@@ -0,0 +1,101 @@
+# src/services/project_loader/include_index.py
+from typing import Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+import os
+import re
+
+_CMAKE_INCLUDE_PATTERN = re.compile(
+    r'\b(target_)?include_directories\s*\(([^)]*)\)', re.IGNORECASE
+)
+_CMAKE_KEYWORDS = {'SYSTEM', 'BEFORE', 'AFTER', 'PUBLIC', 'PRIVATE', 'INTERFACE'}
+# Variáveis que apontam para o diretório do próprio CMakeLists.txt...
+_CMAKE_CURRENT_DIR_VARIABLES = ('${CMAKE_CURRENT_SOURCE_DIR}', '${CMAKE_CURRENT_LIST_DIR}')
+# ...e para a raiz do projeto, mesmo em CMakeLists.txt aninhados
+_CMAKE_ROOT_DIR_VARIABLES = ('${PROJECT_SOURCE_DIR}', '${CMAKE_SOURCE_DIR}')
+
+
+class IncludeIndex:
+    """
+    Índice dos componentes do projeto para resolução de #include em O(1).
+
+    A resolução segue a ordem do compilador: diretório do arquivo atual,
+    depois os diretórios de include configurados. Só então recorre ao nome
+    do arquivo (e por último ao stem) em qualquer lugar do projeto; nesses
+    casos, mais de um candidato é tratado como ambiguidade.
+    """
+
+    def __init__(self, component_paths: Iterable[str], include_dirs: Iterable[str] = ()):
+        self.include_dirs = [os.path.normpath(d) for d in include_dirs]
+        self._by_normpath: Dict[str, str] = {}
+        self._by_name: Dict[str, List[str]] = {}
+        self._by_stem: Dict[str, List[str]] = {}
+
+        for comp_path in component_paths:
+            path = Path(comp_path)
+            self._by_normpath[os.path.normpath(comp_path)] = comp_path
+            self._by_name.setdefault(path.name, []).append(comp_path)
+            self._by_stem.setdefault(path.stem, []).append(comp_path)
+
+    def resolve(self, include: str, current_file: Path) -> Tuple[Optional[str], List[str]]:
+        """
+        Retorna (caminho resolvido, candidatos). O caminho é None quando o
+        include é externo ao projeto ou quando há mais de um candidato.
+        """
+        # 1. Relativo ao arquivo que faz o include
+        search_dirs = [str(Path(current_file).parent)] + self.include_dirs
+        for directory in search_dirs:
+            match = self._by_normpath.get(os.path.normpath(os.path.join(directory, include)))
+            if match is not None:
+                return match, [match]
+
+        # 2. Mesmo nome de arquivo cujo caminho termine com o include
+        include_suffix = os.path.normpath(include)
+        candidates = [
+            comp_path for comp_path in self._by_name.get(Path(include).name, [])
+            if os.path.normpath(comp_path).endswith(os.sep + include_suffix)
+        ]
+
+        # 3. Legado: apenas o stem, priorizando headers
+        if not candidates:
+            candidates = self._by_stem.get(Path(include).stem, [])
+            headers = [c for c in candidates if Path(c).suffix.lower() in ('.h', '.hpp')]
+            candidates = headers or candidates
+
+        if len(candidates) == 1:
+            return candidates[0], candidates
+        return None, list(candidates)
+
+
+def parse_cmake_include_dirs(cmake_file: Path, project_root: Optional[str] = None) -> List[str]:
+    """
+    Extrai os diretórios de include_directories/target_include_directories
+    de um CMakeLists.txt, relativos ao diretório do arquivo.
+    ${PROJECT_SOURCE_DIR}/${CMAKE_SOURCE_DIR} apontam para project_root
+    (sem ela, para o diretório do arquivo).
+    """
+    try:
+        content = Path(cmake_file).read_text(encoding='utf-8', errors='replace')
+    except OSError as e:
+        print(f"Error reading {cmake_file}: {str(e)}")
+        return []
+
+    base_dir = str(Path(cmake_file).parent)
+    root_dir = str(project_root) if project_root else base_dir
+    directories = []
+    for match in _CMAKE_INCLUDE_PATTERN.finditer(content):
+        args = match.group(2).split()
+        if match.group(1):
+            args = args[1:]  # Primeiro argumento é o target
+
+        for arg in args:
+            arg = arg.strip('"')
+            if arg.upper() in _CMAKE_KEYWORDS:
+                continue
+            for variable in _CMAKE_CURRENT_DIR_VARIABLES:
+                arg = arg.replace(variable, base_dir)
+            for variable in _CMAKE_ROOT_DIR_VARIABLES:
+                arg = arg.replace(variable, root_dir)
+            if not arg or '${' in arg or '$<' in arg:
+                continue
+            directories.append(os.path.normpath(os.path.join(base_dir, arg)))
+    return directories
@@ -0,0 +1,32 @@
+# src/services/project_loader/line_index.py
+from bisect import bisect_left
+from typing import List, Union
+import mmap
+import re
+
+_NEWLINE_PATTERNS = {
+    str: re.compile('\n'),
+    bytes: re.compile(b'\n'),
+}
+
+
+class LineIndex:
+    """
+    Índice dos offsets de quebra de linha de um arquivo. Construído uma vez
+    por arquivo, converte posições em números de linha em O(log n).
+    """
+
+    def __init__(self, content: Union[str, bytes, mmap.mmap]):
+        # Aceita str ou qualquer buffer de bytes (bytes, mmap)
+        pattern = _NEWLINE_PATTERNS[str if isinstance(content, str) else bytes]
+        self._offsets: List[int] = [match.start() for match in pattern.finditer(content)]
+
+    def line_of(self, position: int) -> int:
+        """
+        Número da linha (base 1) da posição, equivalente a
+        content[:position].count('\\n') + 1
+        """
+        return bisect_left(self._offsets, position) + 1
+
+    def __len__(self) -> int:
+        return len(self._offsets) + 1
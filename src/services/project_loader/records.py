@@ -0,0 +1,97 @@
+# src/services/project_loader/records.py
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import sys
+
+
+class RecordMapping(Mapping):
+    """
+    Acesso somente leitura no estilo dict (record['name'], record.get(...))
+    sobre registros com __slots__, para que os analisadores continuem
+    funcionando sem que cada registro carregue um dict próprio.
+    """
+
+    __slots__ = ()
+
+    _keys: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+def record(cls):
+    """
+    Dataclass com slots exposta como Mapping de seus campos
+    """
+    cls = dataclass(slots=True, eq=False)(cls)
+    cls._keys = tuple(f.name for f in fields(cls))
+    return cls
+
+
+@record
+class FunctionRecord(RecordMapping):
+    return_type: str
+    name: str
+    line: int
+    content: str
+
+
+@record
+class ClassRecord(RecordMapping):
+    name: str
+    base_class: Optional[str]
+    line: int
+
+
+@record
+class TemplateRecord(RecordMapping):
+    type: str
+    name: str
+    line: int
+
+
+@record
+class OperatorRecord(RecordMapping):
+    operator: str
+    line: int
+
+
+def intern(value: Optional[str]) -> Optional[str]:
+    """
+    Tabela de strings compartilhada: nomes e caminhos repetidos em milhares
+    de registros passam a ocupar memória uma única vez
+    """
+    return sys.intern(value) if value is not None else None
+
+
+class LazyMapping(Mapping):
+    """
+    Mapping cujos valores são calculados no primeiro acesso
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]]):
+        self._factories = factories
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            self._values[key] = self._factories[key]()
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
@@ -0,0 +1,79 @@
+# src/services/project_loader/scanner.py
+from typing import Dict, List, Optional, Union
+import mmap
+import re
+
+# Uma única expressão tokeniza o arquivo: comentários, literais e diretivas de
+# pré-processador são consumidos inteiros, então só sobram as chaves "reais".
+_TOKEN_PATTERN = (
+    r'//[^\n]*'                                   # Comentário de linha
+    r'|/\*.*?(?:\*/|\Z)'                          # Comentário de bloco
+    r'|^[ \t]*\#(?:\\\r?\n|[^\n])*'               # Diretiva (com continuação \)
+    r'|(?<!\w)(?:u8|u|U|L)?R"([^()\\\s]{0,16})\(.*?\)\1"'  # Raw string
+    r'|(?<![\w.])\d[\w\']*'                       # Número (separador 1'000)
+    r'|"(?:\\.|[^"\\\n])*"'                       # String
+    r"|'(?:\\.|[^'\\\n])*'"                       # Char
+    r'|(?P<brace>[{}])'                           # Chaves
+)
+
+_TOKEN_PATTERNS = {
+    str: re.compile(_TOKEN_PATTERN, re.MULTILINE | re.DOTALL),
+    bytes: re.compile(_TOKEN_PATTERN.encode(), re.MULTILINE | re.DOTALL),
+}
+
+
+class Scope:
+    """
+    Um par de chaves. end é -1 quando a chave nunca é fechada.
+    """
+
+    def __init__(self, start: int, parent: Optional["Scope"] = None):
+        self.start = start
+        self.end = -1
+        self.parent = parent
+        self.children: List["Scope"] = []
+
+    @property
+    def closed(self) -> bool:
+        return self.end >= 0
+
+
+class ScopeTree:
+    """
+    Árvore de escopos de um arquivo, construída em uma única passagem
+    ignorando chaves dentro de strings, chars, comentários e diretivas.
+    """
+
+    def __init__(self, content: Union[str, bytes, mmap.mmap]):
+        self.roots: List[Scope] = []
+        self._by_start: Dict[int, Scope] = {}
+        self._scan(content)
+
+    def _scan(self, content: Union[str, bytes, mmap.mmap]):
+        # Aceita str ou qualquer buffer de bytes (bytes, mmap)
+        is_text = isinstance(content, str)
+        pattern = _TOKEN_PATTERNS[str if is_text else bytes]
+        opening = '{' if is_text else b'{'
+
+        stack: List[Scope] = []
+        for match in pattern.finditer(content):
+            brace = match.group('brace')
+            if brace is None:
+                continue
+
+            position = match.start()
+            if brace == opening:
+                parent = stack[-1] if stack else None
+                scope = Scope(position, parent)
+                (parent.children if parent else self.roots).append(scope)
+                self._by_start[position] = scope
+                stack.append(scope)
+            elif stack:
+                # '}' sem abertura correspondente é ignorada
+                stack.pop().end = position
+
+    def scope_at(self, open_position: int) -> Optional[Scope]:
+        """
+        Escopo aberto exatamente na posição informada, se ela for uma chave real
+        """
+        return self._by_start.get(open_position)
@@ -0,0 +1,123 @@
+# src/services/project_loader/source_reader.py
+from typing import Optional, Sequence, Union
+from pathlib import Path
+import codecs
+import mmap
+import re
+
+_NON_ASCII = re.compile(rb'[\x80-\xff]')
+_DECODE_BLOCK = 1 << 20
+
+# BOMs de codificações que não são compatíveis com ASCII byte a byte
+_WIDE_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+class SourceFile:
+    """
+    Fonte aberto para análise sem carregá-lo inteiro como str.
+
+    Arquivos em codificações compatíveis com ASCII (UTF-8, CP1252, Latin-1...)
+    são mapeados em memória e analisados como bytes; só os trechos extraídos
+    (nomes, corpos de funções) são decodificados. UTF-16/32 com BOM são
+    decodificados por completo, pois não podem ser varridos como bytes.
+    """
+
+    def __init__(self,
+                 path: Union[str, Path],
+                 fallback_encodings: Sequence[str] = ('cp1252', 'latin-1'),
+                 max_bytes: Optional[int] = None):
+        self.path = Path(path)
+        self.fallback_encodings = list(fallback_encodings)
+        self.max_bytes = max_bytes
+        self.data: Union[bytes, mmap.mmap, str] = b''
+        self.encoding = 'utf-8'
+        self.size = 0
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    def __enter__(self) -> "SourceFile":
+        self._file = open(self.path, 'rb')
+        self.size = self.path.stat().st_size
+        if self.size > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.data = self._mmap
+        self._detect_encoding()
+        return self
+
+    def __exit__(self, *exc):
+        self.data = b''
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return False
+
+    @property
+    def is_text(self) -> bool:
+        return isinstance(self.data, str)
+
+    @property
+    def oversized(self) -> bool:
+        """
+        Acima do limite configurado: símbolos são extraídos, corpos não
+        """
+        return self.max_bytes is not None and self.size > self.max_bytes
+
+    def literal(self, value: str) -> Union[str, bytes]:
+        """
+        Converte um literal para o mesmo tipo do conteúdo analisado
+        """
+        return value if self.is_text else value.encode('ascii')
+
+    def text(self, value: Union[str, bytes, None]) -> Optional[str]:
+        if value is None or isinstance(value, str):
+            return value
+        return value.decode(self.encoding, errors='replace')
+
+    def slice(self, start: int, end: int) -> str:
+        return self.text(self.data[start:end])
+
+    def _detect_encoding(self):
+        head = self.data[:4]
+        for bom, encoding in _WIDE_BOMS:
+            if head.startswith(bom):
+                self.encoding = encoding
+                self.data = self.data[:].decode(encoding, errors='replace')
+                return
+
+        if head.startswith(codecs.BOM_UTF8):
+            self.encoding = 'utf-8-sig'
+            return
+
+        if not _NON_ASCII.search(self.data):
+            self.encoding = 'utf-8'
+            return
+
+        for encoding in ['utf-8'] + self.fallback_encodings:
+            if _decodes_as(self.data, encoding):
+                self.encoding = encoding
+                return
+
+        # Latin-1 aceita qualquer byte; usado se nenhuma outra servir
+        self.encoding = 'latin-1'
+
+
+def _decodes_as(data: Union[bytes, mmap.mmap], encoding: str) -> bool:
+    """
+    Valida a codificação em blocos, sem materializar o texto inteiro
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        for offset in range(0, len(data), _DECODE_BLOCK):
+            decoder.decode(data[offset:offset + _DECODE_BLOCK])
+        decoder.decode(b'', final=True)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
@@ -1,5 +1,6 @@
 # src/services/query/processor.py
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
+from src.services.container import get_container
 from src.services.llm_factory import LLMFactory
 from src.repositories.vector_store.store import VectorStore
 from src.prompts.role import QueryExpansionPrompt
@@ -8,9 +9,20 @@ from src.models.response_generation import GeneratedResponse
 from src.prompts.role import ResponseGenerationPrompt
 
 class QueryProcessor:
-    def __init__(self):
-        self.llm_client = LLMFactory("openai")
-        self.vector_store = VectorStore()
+    def __init__(self,
+                 llm_client: Optional[LLMFactory] = None,
+                 vector_store: Optional[VectorStore] = None):
+        # Sem injeção explícita, usa as instâncias compartilhadas do processo
+        self._llm_client = llm_client
+        self._vector_store = vector_store
+
+    @property
+    def llm_client(self) -> LLMFactory:
+        return self._llm_client or get_container().llm("openai")
+
+    @property
+    def vector_store(self) -> VectorStore:
+        return self._vector_store or get_container().vector_store()
     
     def process_query(self, query: str) -> Dict[str, Any]:
         """
@@ -60,11 +72,16 @@ class QueryProcessor:
         
         return " ".join(components)
 
-    def search_relevant_rules(self, query_info: Dict[str, Any], limit: int = 1000) -> List[Dict[str, Any]]:
+    def search_relevant_rules(self,
+                              query_info: Dict[str, Any],
+                              limit: int = 1000,
+                              vector_store: Optional[VectorStore] = None) -> List[Dict[str, Any]]:
         """
-        Busca regras relevantes usando a query expandida
+        Busca regras relevantes usando a query expandida (na vector store
+        informada ou na padrão)
         """
-        results = self.vector_store.search_similar_rules(
+        vector_store = vector_store or self.vector_store
+        results = vector_store.search_similar_rules(
             query_info["search_query"], 
             top_k=limit
         )
@@ -79,20 +96,24 @@ class QueryProcessor:
         
         return results
     
-    def generate_response(self, query_info: Dict[str, Any], relevant_rules: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_response(self,
+                          query_info: Dict[str, Any],
+                          relevant_rules: List[Dict[str, Any]],
+                          on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
-        Gera uma resposta contextualizada baseada nas regras encontradas
+        Gera uma resposta contextualizada baseada nas regras encontradas.
+        Com on_delta, a resposta é gerada em streaming e cada trecho novo
+        do texto é repassado assim que chega.
         """
         # Criar o prompt para geração de resposta
         prompt = ResponseGenerationPrompt(query_info, relevant_rules)
 
         content = prompt.format()
-        
-        # Gerar a resposta usando o LLM
-        response = self.llm_client.create_completion(
-            response_model=GeneratedResponse,
-            temperature=0.7,  # Um pouco mais alto para respostas mais naturais
-            messages=[
+
+        completion_params = {
+            "response_model": GeneratedResponse,
+            "temperature": 0.7,  # Um pouco mais alto para respostas mais naturais
+            "messages": [
                 {
                     "role": "system",
                     "content": """Você é um especialista em análise de código e regras de negócio.
@@ -104,12 +125,26 @@ class QueryProcessor:
                     "content": content
                 }
             ]
-        )
+        }
+        
+        # Gerar a resposta usando o LLM
+        if on_delta is None:
+            response = self.llm_client.create_completion(**completion_params)
+        else:
+            response = None
+            emitted = 0
+            for response in self.llm_client.stream_completion(**completion_params):
+                answer = response.answer or ""
+                if len(answer) > emitted:
+                    on_delta(answer[emitted:])
+                    emitted = len(answer)
+            if response is None:
+                raise RuntimeError("LLM stream ended without a response")
         
         return {
-            "answer": response.answer,
-            "referenced_rules": response.referenced_rules,
-            "suggested_followup": response.suggested_followup,
+            "answer": response.answer or "",
+            "referenced_rules": response.referenced_rules or [],
+            "suggested_followup": response.suggested_followup or [],
             "query_info": query_info,
             "rules_analyzed": len(relevant_rules)
         }
\ No newline at end of file
@@ -0,0 +1,166 @@
+# src/services/rate_limiter.py
+from typing import Dict, Optional, Tuple
+import asyncio
+import threading
+import time
+from src.config.settings import get_settings
+
+
+class TokenBucket:
+    """
+    Token bucket com reserva: quem pede tokens os desconta na hora (o saldo
+    pode ficar negativo) e recebe quanto tempo esperar. Assim os pedidos são
+    atendidos em ordem de chegada, tanto em threads quanto em corrotinas.
+
+    Pedidos maiores que a capacidade são cobrados por inteiro: o saldo fica
+    negativo e a espera é proporcional, então o limite por minuto vale
+    mesmo para prompts maiores que a rajada.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = max(capacity, 1.0)
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._available = min(self.capacity, self._available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Reserva amount tokens e retorna os segundos de espera até que eles
+        estejam de fato disponíveis
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._available -= amount
+            return max(0.0, -self._available / self.rate)
+
+    def refund(self, amount: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._available = min(self.capacity, self._available + amount)
+
+
+class RateLimiter:
+    """
+    Limites de requisições e tokens por minuto (RPM/TPM) de um provider/modelo
+    """
+
+    def __init__(self,
+                 requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None,
+                 burst_seconds: float = 10.0):
+        self.requests = self._bucket(requests_per_minute, burst_seconds)
+        self.tokens = self._bucket(tokens_per_minute, burst_seconds)
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.total_requests = 0
+        self.throttled_requests = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(per_minute: Optional[int], burst_seconds: float) -> Optional[TokenBucket]:
+        if not per_minute:
+            return None
+        rate = per_minute / 60.0
+        return TokenBucket(rate, rate * burst_seconds)
+
+    def _reserve(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+
+        with self._lock:
+            self.total_requests += 1
+            if wait > 0:
+                self.throttled_requests += 1
+                self.total_wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+                self.queue_depth += 1
+                self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        return wait
+
+    def _release(self, wait: float):
+        if wait > 0:
+            with self._lock:
+                self.queue_depth -= 1
+
+    def acquire(self, tokens: int = 0) -> int:
+        """
+        Bloqueia até a requisição caber nos limites. Retorna os tokens
+        reservados, a informar depois em record_usage.
+        """
+        wait = self._reserve(tokens)
+        try:
+            if wait > 0:
+                time.sleep(wait)
+        finally:
+            self._release(wait)
+        return tokens if self.tokens is not None else 0
+
+    async def aacquire(self, tokens: int = 0) -> int:
+        """
+        Versão assíncrona de acquire: espera sem bloquear o event loop
+        """
+        wait = self._reserve(tokens)
+        try:
+            if wait > 0:
+                await asyncio.sleep(wait)
+        finally:
+            self._release(wait)
+        return tokens if self.tokens is not None else 0
+
+    def record_usage(self, reserved_tokens: int, actual_tokens: Optional[int]):
+        """
+        Devolve ao bucket a diferença entre o que foi reservado (retorno de
+        acquire) e o uso real informado pela API
+        """
+        if self.tokens is not None and actual_tokens is not None and actual_tokens < reserved_tokens:
+            self.tokens.refund(reserved_tokens - actual_tokens)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "total_requests": self.total_requests,
+                "throttled_requests": self.throttled_requests,
+                "total_wait_seconds": self.total_wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+            }
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, model: str) -> Optional[RateLimiter]:
+    """
+    Limiter compartilhado do provider/modelo; None se não há limites configurados
+    """
+    settings = getattr(get_settings(), provider)
+    if not settings.requests_per_minute and not settings.tokens_per_minute:
+        return None
+
+    with _limiters_lock:
+        limiter = _limiters.get((provider, model))
+        if limiter is None:
+            limiter = _limiters[(provider, model)] = RateLimiter(
+                settings.requests_per_minute,
+                settings.tokens_per_minute,
+                settings.rate_limit_burst_seconds
+            )
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, float]]:
+    with _limiters_lock:
+        return {f"{provider}/{model}": limiter.stats for (provider, model), limiter in _limiters.items()}
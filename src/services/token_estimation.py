@@ -0,0 +1,37 @@
+# src/services/token_estimation.py
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Código-fonte tokeniza pior que prosa; ~3 caracteres por token deixa folga
+CHARS_PER_TOKEN = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimativa conservadora de tokens, sem depender do tokenizer do modelo
+    """
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def chunk_by_tokens(items: Iterable[T],
+                    max_tokens: int,
+                    text: Callable[[T], str] = str,
+                    max_items: Optional[int] = None) -> Iterator[List[T]]:
+    """
+    Agrupa itens em lotes que respeitam o orçamento de tokens (e, se
+    informado, o número máximo de itens). Um item maior que o orçamento
+    sozinho forma um lote próprio.
+    """
+    chunk: List[T] = []
+    chunk_tokens = 0
+    for item in items:
+        tokens = estimate_tokens(text(item))
+        if chunk and (chunk_tokens + tokens > max_tokens
+                      or (max_items is not None and len(chunk) >= max_items)):
+            yield chunk
+            chunk, chunk_tokens = [], 0
+        chunk.append(item)
+        chunk_tokens += tokens
+    if chunk:
+        yield chunk
@@ -0,0 +1,527 @@
+# src/tasks/jobs.py
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from src.api.models import (
+    BaseTaskInput,
+    DiscoveryTaskInput,
+    JobStatus,
+    QueryTaskInput,
+    WelcomeTaskInput,
+)
+from src.config.settings import JobSettings, get_settings
+from src.services.output_sink import JsonEventsSink, use_output_sink
+from src.tasks.tasks import process_task
+
+try:
+    import pika
+except ImportError:  # backend RabbitMQ é opcional
+    pika = None
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# command_name -> modelo usado para reconstruir a entrada do job
+_TASK_INPUTS = {
+    "welcome": WelcomeTaskInput,
+    "discovery": DiscoveryTaskInput,
+    "query": QueryTaskInput,
+}
+
+
+class JobStore:
+    """
+    Estado dos jobs (SQLite): entrada, status, progresso e resultado.
+    Pode ser compartilhado por vários processos no mesmo host.
+    """
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " command_name TEXT NOT NULL,"
+                " input TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " progress REAL NOT NULL DEFAULT 0,"
+                " message TEXT,"
+                " output TEXT,"
+                " error TEXT,"
+                " created_at REAL NOT NULL,"
+                " started_at REAL,"
+                " finished_at REAL,"
+                " worker TEXT,"
+                " lease_expires_at REAL)"
+            )
+            # Bancos criados antes das colunas de posse (lease)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in (("worker", "TEXT"), ("lease_expires_at", "REAL")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, created_at)"
+            )
+
+    def create(self, task_input: BaseTaskInput) -> str:
+        job_id = str(uuid.uuid4())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, command_name, input, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, task_input.command_name, task_input.model_dump_json(), QUEUED, time.time())
+            )
+        return job_id
+
+    def load_input(self, job_id: str) -> BaseTaskInput:
+        with self._lock:
+            command_name, data = self._conn.execute(
+                "SELECT command_name, input FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        input_model = _TASK_INPUTS.get(command_name)
+        if input_model is None:
+            raise ValueError(f"Unsupported job command: {command_name}")
+        return input_model.model_validate_json(data)
+
+    def next_queued(self) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def start(self, job_id: str, worker: str, lease_seconds: float) -> bool:
+        """
+        Marca o job como em execução por `worker` até o fim da posse (lease).
+        Um job em execução cuja posse venceu (worker morreu) pode ser
+        retomado, ex.: quando o broker reentrega a mensagem. False se outro
+        worker o executa ou se o job já terminou.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, worker = ?, lease_expires_at = ?"
+                " WHERE id = ? AND (status = ? OR (status = ? AND"
+                " (lease_expires_at IS NULL OR lease_expires_at < ?)))",
+                (RUNNING, now, worker, now + lease_seconds, job_id, QUEUED, RUNNING, now)
+            )
+        return cursor.rowcount == 1
+
+    def renew_leases(self, job_ids: Set[str], worker: str, lease_seconds: float):
+        """
+        Heartbeat: estende a posse dos jobs que `worker` ainda executa
+        """
+        if not job_ids:
+            return
+        expires_at = time.time() + lease_seconds
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                [(expires_at, job_id, worker, RUNNING) for job_id in job_ids]
+            )
+
+    def requeue_stale(self) -> List[str]:
+        """
+        Devolve à fila os jobs em execução cuja posse venceu (o worker
+        morreu sem terminá-los) e retorna seus ids
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            job_ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)",
+                (RUNNING, now)
+            )]
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_expires_at = NULL"
+                " WHERE id = ? AND status = ?",
+                [(QUEUED, job_id, RUNNING) for job_id in job_ids]
+            )
+        return job_ids
+
+    def update_progress(self, job_id: str, progress: float, message: Optional[str] = None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET progress = ?, message = ? WHERE id = ?",
+                (progress, message, job_id)
+            )
+
+    def complete(self, job_id: str, output: Dict[str, Any]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, progress = 1, output = ?, finished_at = ?,"
+                " lease_expires_at = NULL WHERE id = ?",
+                (COMPLETED, json.dumps(output, ensure_ascii=False, default=str), time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?,"
+                " lease_expires_at = NULL WHERE id = ?",
+                (FAILED, error, time.time(), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, command_name, status, progress, message, output, error,"
+                " created_at, started_at, finished_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        (job_id, command_name, status, progress, message, output, error,
+         created_at, started_at, finished_at) = row
+        output = json.loads(output) if output else {}
+        return JobStatus(
+            job_id=job_id,
+            command_name=command_name,
+            status=status,
+            progress=progress,
+            message=message,
+            result=output.get("result"),
+            metadata=output.get("metadata"),
+            error=error,
+            created_at=datetime.fromtimestamp(created_at),
+            started_at=datetime.fromtimestamp(started_at) if started_at else None,
+            finished_at=datetime.fromtimestamp(finished_at) if finished_at else None,
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobBroker(ABC):
+    """
+    Entrega os ids dos jobs aos workers. O estado fica sempre no JobStore;
+    o broker só decide quem executa o quê.
+    """
+
+    @abstractmethod
+    def publish(self, job_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def claim(self, timeout: float) -> Optional[str]:
+        """
+        Próximo job a executar, ou None se nada chegou dentro do timeout
+        """
+        pass
+
+    def ack(self, job_id: str) -> None:
+        """
+        Confirma que o job terminou (com sucesso ou não)
+        """
+        pass
+
+    def keepalive(self) -> None:
+        """
+        Chamado periodicamente pelo heartbeat, inclusive enquanto todos os
+        workers estão ocupados com jobs longos
+        """
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteBroker(JobBroker):
+    """
+    A própria tabela de jobs é a fila: os workers pegam o job enfileirado
+    mais antigo, e JobStore.start garante que só um deles o executa.
+    """
+
+    def __init__(self, store: JobStore, settings: JobSettings):
+        self.store = store
+        self._wakeup = threading.Condition()
+
+    def publish(self, job_id: str) -> None:
+        # O job já está no banco; só acorda um worker parado
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def claim(self, timeout: float) -> Optional[str]:
+        job_id = self.store.next_queued()
+        if job_id is None:
+            with self._wakeup:
+                self._wakeup.wait(timeout)
+            job_id = self.store.next_queued()
+        return job_id
+
+    def close(self) -> None:
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+
+class RabbitMQBroker(JobBroker):
+    """
+    Fila durável no RabbitMQ, para distribuir jobs entre processos/hosts.
+    A mensagem só é confirmada ao fim do job; se o worker morrer, o
+    RabbitMQ a reentrega e outro worker retoma o job quando a posse vencer.
+    """
+
+    def __init__(self,
+                 store: JobStore,
+                 settings: JobSettings,
+                 connection_factory: Optional[Callable[[], Any]] = None):
+        if connection_factory is None:
+            if pika is None:
+                raise RuntimeError("The RabbitMQ job broker requires the 'pika' package")
+            connection_factory = lambda: pika.BlockingConnection(pika.URLParameters(settings.rabbitmq_url))
+
+        self.queue = settings.rabbitmq_queue
+        # BlockingConnection não é thread-safe: todo acesso passa pelo lock
+        self._lock = threading.Lock()
+        self._connection = connection_factory()
+        self._channel = self._connection.channel()
+        self._channel.queue_declare(queue=self.queue, durable=True)
+        self._properties = pika.BasicProperties(delivery_mode=2) if pika is not None else None
+        self._deliveries: Dict[str, int] = {}
+
+    def publish(self, job_id: str) -> None:
+        with self._lock:
+            self._channel.basic_publish(
+                exchange="",
+                routing_key=self.queue,
+                body=job_id.encode(),
+                properties=self._properties
+            )
+
+    def claim(self, timeout: float) -> Optional[str]:
+        with self._lock:
+            method, _, body = self._channel.basic_get(queue=self.queue, auto_ack=False)
+        if method is None:
+            time.sleep(timeout)
+            return None
+
+        job_id = body.decode()
+        with self._lock:
+            self._deliveries[job_id] = method.delivery_tag
+        return job_id
+
+    def ack(self, job_id: str) -> None:
+        with self._lock:
+            delivery_tag = self._deliveries.pop(job_id, None)
+            if delivery_tag is not None:
+                self._channel.basic_ack(delivery_tag=delivery_tag)
+
+    def keepalive(self) -> None:
+        # BlockingConnection só responde aos heartbeats do servidor quando é
+        # usada; sem isso, um job longo derruba a conexão antes do ack
+        with self._lock:
+            self._connection.process_data_events(time_limit=0)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+# Intervalo máximo do heartbeat, para manter a conexão do broker viva mesmo
+# com posses longas
+_MAX_HEARTBEAT_INTERVAL = 10.0
+
+_BROKERS = {
+    "sqlite": SqliteBroker,
+    "rabbitmq": RabbitMQBroker,
+}
+
+
+def _no_interactive_input(prompt: str) -> str:
+    raise RuntimeError("Interactive input is not available in background jobs")
+
+
+class JobQueue:
+    """
+    Submissão e consulta de jobs, com um pool de workers (threads) que
+    executa no máximo `workers` tarefas ao mesmo tempo. Enquanto um job
+    roda, uma thread de heartbeat renova sua posse no JobStore; jobs cuja
+    posse venceu (processo morto) voltam para a fila.
+    """
+
+    def __init__(self,
+                 store: JobStore,
+                 broker: JobBroker,
+                 workers: int = 2,
+                 poll_interval: float = 1.0,
+                 runner: Optional[Callable[..., dict]] = None,
+                 lease_seconds: float = 60.0):
+        self.store = store
+        self.broker = broker
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.runner = runner
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._threads: List[threading.Thread] = []
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._heartbeat_stop = threading.Event()
+        self._running: Set[str] = set()
+        self._running_lock = threading.Lock()
+
+    def submit(self, task_input: BaseTaskInput) -> str:
+        job_id = self.store.create(task_input)
+        self.broker.publish(job_id)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        return self.store.get(job_id)
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        self._heartbeat_stop.clear()
+        self._requeue_stale()
+        self._heartbeat = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+        self._heartbeat.start()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self):
+        """
+        Para os workers (jobs em andamento terminam antes) e fecha broker e store
+        """
+        self._stop.set()
+        self.broker.close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        # Só depois dos workers: jobs terminando ainda precisam da posse
+        self._heartbeat_stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        self.store.close()
+
+    def _requeue_stale(self):
+        try:
+            for job_id in self.store.requeue_stale():
+                print(f"Requeuing job {job_id}: its worker stopped renewing the lease")
+                self.broker.publish(job_id)
+        except Exception as e:
+            print(f"Error requeuing stale jobs: {str(e)}")
+
+    def _beat(self):
+        interval = min(self.lease_seconds / 3, _MAX_HEARTBEAT_INTERVAL)
+        while not self._heartbeat_stop.wait(interval):
+            try:
+                self.broker.keepalive()
+            except Exception as e:
+                print(f"Error keeping the job broker alive: {str(e)}")
+            with self._running_lock:
+                job_ids = set(self._running)
+            try:
+                self.store.renew_leases(job_ids, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                print(f"Error renewing job leases: {str(e)}")
+            if not self._stop.is_set():
+                self._requeue_stale()
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                job_id = self.broker.claim(self.poll_interval)
+            except Exception as e:
+                print(f"Error claiming job: {str(e)}")
+                self._stop.wait(self.poll_interval)
+                continue
+            if job_id is None or self._stop.is_set():
+                continue
+            try:
+                if self.store.start(job_id, self.worker_id, self.lease_seconds):
+                    with self._running_lock:
+                        self._running.add(job_id)
+                    try:
+                        self._run(job_id)
+                    finally:
+                        with self._running_lock:
+                            self._running.discard(job_id)
+            finally:
+                try:
+                    self.broker.ack(job_id)
+                except Exception as e:
+                    # Sem ack o broker reentrega a mensagem; o worker segue ativo
+                    print(f"Error acknowledging job {job_id}: {str(e)}")
+
+    def _run(self, job_id: str):
+        def on_progress(done: int, total: int, step: str):
+            self.store.update_progress(job_id, done / total, f"{step} ({done}/{total})")
+
+        # Sem terminal: a saída dos steps é descartada e prompts falham
+        sink = JsonEventsSink(callback=lambda event: None, input_func=_no_interactive_input)
+        try:
+            task_input = self.store.load_input(job_id)
+            runner = self.runner or process_task
+            with use_output_sink(sink):
+                task_result = runner(task_input, task_id=job_id, on_progress=on_progress)
+            self.store.complete(job_id, task_result.get("output_data") or {})
+        except Exception as e:
+            print(f"Error running job {job_id}: {str(e)}")
+            self.store.fail(job_id, str(e))
+
+
+def create_job_queue(settings: Optional[JobSettings] = None) -> JobQueue:
+    settings = settings or get_settings().jobs
+    broker_class = _BROKERS.get(settings.broker)
+    if broker_class is None:
+        raise ValueError(f"Unsupported job broker: {settings.broker}")
+    store = JobStore(settings.db_path)
+    return JobQueue(
+        store,
+        broker_class(store, settings),
+        workers=settings.workers,
+        poll_interval=settings.poll_interval,
+        lease_seconds=settings.lease_seconds
+    )
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Fila do processo, criada (e com os workers iniciados) no primeiro uso
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = create_job_queue()
+            _job_queue.start()
+        return _job_queue
+
+
+def shutdown_job_queue():
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is not None:
+            _job_queue.shutdown()
+            _job_queue = None
+
+
+if __name__ == "__main__":
+    # Processo só de workers (ex.: consumindo a fila do RabbitMQ)
+    queue = get_job_queue()
+    print(f"Job workers running ({queue.workers}, broker: {get_settings().jobs.broker})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        shutdown_job_queue()
@@ -5,11 +5,18 @@ from src.api.models import (
     OutputDataModel
 )
 from src.pipelines.registry import PipelineRegistry
+from typing import Callable, Optional
 import uuid
 
-def process_task(task_input: BaseTaskInput) -> dict:
+def process_task(task_input: BaseTaskInput,
+                 task_id: Optional[str] = None,
+                 on_progress: Optional[Callable[[int, int, str], None]] = None) -> dict:
+    """
+    Executa o pipeline da tarefa. task_id permite que o chamador (ex.: a
+    fila de jobs) identifique o resultado; on_progress recebe o avanço por step.
+    """
     pipeline = PipelineRegistry.get_pipeline(task_input)
-    processing_context, output_data = pipeline.run(task_input)
+    processing_context, output_data = pipeline.run(task_input, on_progress=on_progress)
 
     # Verifica se processing_context e output_data já são instâncias das classes corretas
     if not isinstance(processing_context, ProcessingContext):
@@ -19,7 +26,7 @@ def process_task(task_input: BaseTaskInput) -> dict:
         output_data = OutputDataModel(**output_data)
 
     task_result = TaskResult(
-        task_id=str(uuid.uuid4()),
+        task_id=task_id or str(uuid.uuid4()),
         status="completed",
         input_data=task_input,
         processing_context=processing_context,  # Não usa mais **
@@ -1,7 +1,8 @@
 import sys
 import time
 import random
-from typing import Callable, Optional
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional
 
 class LLMStyleConsole:
     def __init__(self, 
@@ -74,4 +75,16 @@ class LLMStyleConsole:
         if self.callback:
             self.callback(response)
             
-        return response
\ No newline at end of file
+        return response
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    """
+    Agrupa um iterável em listas de até `size` itens, consumindo-o sob demanda.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeChatServer:
+    """
+    Servidor local compatível com POST /chat/completions da OpenAI no modo
+    de tools usado pelo instructor. responder(payload) devolve os argumentos
+    da tool (o objeto do response_model); delay simula a latência da API.
+    Com "stream": true, os argumentos são enviados em pedaços (SSE), com
+    chunk_delay entre eles.
+    """
+
+    def __init__(self, responder, delay: float = 0.0, chunk_size: int = 8, chunk_delay: float = 0.0):
+        self.responder = responder
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "FakeChatServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests.append(payload)
+                if server.delay:
+                    time.sleep(server.delay)
+
+                arguments = json.dumps(server.responder(payload))
+                if "tools" not in payload:
+                    # Chamada sem response_model: resposta em texto
+                    choice = {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": arguments}
+                    }
+                else:
+                    tool_name = payload["tools"][0]["function"]["name"]
+                    if payload.get("stream"):
+                        self._stream(payload, tool_name, arguments)
+                        return
+                    choice = {
+                        "index": 0,
+                        "finish_reason": "tool_calls",
+                        "message": {
+                            "role": "assistant",
+                            "content": None,
+                            "tool_calls": [{
+                                "id": "call_fake",
+                                "type": "function",
+                                "function": {"name": tool_name, "arguments": arguments}
+                            }]
+                        }
+                    }
+
+                body = json.dumps({
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": payload["model"],
+                    "choices": [choice],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, payload, tool_name, arguments):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                pieces = [arguments[i:i + server.chunk_size]
+                          for i in range(0, len(arguments), server.chunk_size)]
+                for index, piece in enumerate(pieces):
+                    tool_call = {"index": 0, "function": {"arguments": piece}}
+                    if index == 0:
+                        tool_call.update({"id": "call_fake", "type": "function"})
+                        tool_call["function"]["name"] = tool_name
+                    self._send_event(payload, {"tool_calls": [tool_call]}, None)
+                    if server.chunk_delay:
+                        time.sleep(server.chunk_delay)
+                self._send_event(payload, {}, "tool_calls")
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _send_event(self, payload, delta, finish_reason):
+                chunk = {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": payload["model"],
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
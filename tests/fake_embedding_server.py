@@ -0,0 +1,74 @@
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+class FakeEmbeddingServer:
+    """
+    Servidor local compatível com POST /embeddings da OpenAI. O vetor de cada
+    texto é determinístico (derivado do seu tamanho), e cada requisição
+    recebida é registrada para as asserções dos testes.
+    """
+
+    def __init__(self, dimensions: int = 8):
+        self.dimensions = dimensions
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def vector(self, text: str) -> np.ndarray:
+        return np.full(self.dimensions, float(len(text)), dtype=np.float32)
+
+    def __enter__(self) -> "FakeEmbeddingServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                texts = payload["input"]
+                with server._lock:
+                    server.requests.append(texts)
+
+                data = []
+                for index, text in enumerate(texts):
+                    vector = server.vector(text)
+                    if payload.get("encoding_format") == "base64":
+                        embedding = base64.b64encode(vector.tobytes()).decode()
+                    else:
+                        embedding = vector.tolist()
+                    data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+                body = json.dumps({
+                    "object": "list",
+                    "data": data,
+                    "model": payload["model"],
+                    "usage": {"prompt_tokens": 0, "total_tokens": 0}
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,80 @@
+import sys
+import os
+import json
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import pytest
+from fastapi.testclient import TestClient
+from src.api import router as api_router
+from src.api.app import create_app
+from src.api.models import DiscoveryTaskInput, QueryTaskInput
+from src.services.output_sink import get_output_sink
+
+
+def fake_process_task(task_input):
+    console = get_output_sink()
+    if isinstance(task_input, QueryTaskInput):
+        for piece in ("Resposta ", "parcial"):
+            console.write_delta(piece)
+        console.end_stream()
+        result = {"answer": "Resposta parcial", "project_path": task_input.project_path}
+    else:
+        assert isinstance(task_input, DiscoveryTaskInput)
+        console.write(f"Indexando {task_input.project_path}")
+        time.sleep(0.2)
+        result = {"project_path": task_input.project_path}
+    return {
+        "task_id": "task-1",
+        "status": "completed",
+        "output_data": {"result": result, "metadata": {"thread": threading.current_thread().name}},
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api_router, "process_task", fake_process_task)
+    with TestClient(create_app()) as client:
+        yield client
+
+
+def test_query_returns_result_and_events(client):
+    response = client.post("/query", json={"query": "como valida cpf?", "project_path": "/repo"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["result"] == {"answer": "Resposta parcial", "project_path": "/repo"}
+    assert [event["type"] for event in body["events"]] == ["delta", "delta", "end"]
+    # A tarefa roda fora do event loop
+    assert body["metadata"]["thread"] != threading.current_thread().name
+
+
+def test_discovery_is_non_interactive_and_concurrent(client):
+    responses = []
+
+    def post(path):
+        responses.append(client.post("/discovery", json={"project_path": path}))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=post, args=(f"/repo{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert sorted(r.json()["result"]["project_path"] for r in responses) == [f"/repo{i}" for i in range(4)]
+    assert elapsed < 4 * 0.2
+
+
+def test_query_stream_sends_ndjson_events(client):
+    with client.stream("POST", "/query/stream", json={"query": "cpf"}) as response:
+        events = [json.loads(line) for line in response.iter_lines() if line]
+    assert [event["type"] for event in events] == ["delta", "delta", "end", "result"]
+    assert events[-1]["result"]["answer"] == "Resposta parcial"
@@ -0,0 +1,33 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+from src.api.models import DiscoveryTaskInput, ProcessCategory, QueryTaskInput
+from src.pipelines.registry import PipelineRegistry
+from src.services.container import ServiceContainer, get_container
+
+
+def test_container_builds_services_once():
+    container = ServiceContainer()
+    assert container.llm("openai") is container.llm("openai")
+    assert container.query_processor() is container.query_processor()
+
+
+def test_query_pipeline_is_reused_and_shares_processor():
+    first = PipelineRegistry.get_pipeline(QueryTaskInput(query="a"))
+    second = PipelineRegistry.get_pipeline(QueryTaskInput(query="b"))
+    assert first is second
+    assert len({id(step.processor) for step in first.steps}) == 1
+    assert first.steps[0].processor.llm_client is get_container().llm("openai")
+
+
+def test_stateful_pipelines_are_rebuilt():
+    first = PipelineRegistry.get_pipeline(DiscoveryTaskInput(topic=ProcessCategory.PROJECT_DISCOVERY))
+    second = PipelineRegistry.get_pipeline(DiscoveryTaskInput(topic=ProcessCategory.PROJECT_DISCOVERY))
+    assert first is not second
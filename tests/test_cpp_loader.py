@@ -0,0 +1,249 @@
+import sys
+import os
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+os.environ.setdefault("LOADER_CACHE_ENABLED", "false")
+
+from src.services.project_loader.cpp_loader import CppProjectLoader
+from src.services.project_loader.line_index import LineIndex
+
+SOURCE = """#include "account.h"
+#include <vector>
+
+namespace bank {
+
+class Account : public Entity {
+};
+
+bool validateBalance(double value) {
+    if (value < 0) {
+        return false;
+    }
+    return true;
+}
+
+double calculateTotal(const Account& account) {
+    return account.balance * 2;
+}
+
+}
+"""
+
+HEADER = """#pragma once
+namespace bank {
+class Entity {
+};
+}
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    for i in range(6):
+        module = tmp_path / f"module{i}"
+        module.mkdir()
+        (module / "account.cpp").write_text(SOURCE)
+        (module / "account.h").write_text(HEADER)
+    (tmp_path / "README.md").write_text("ignored")
+    return tmp_path
+
+
+def test_parallel_load_matches_serial(project):
+    serial = CppProjectLoader(workers=1).load(str(project))
+    parallel = CppProjectLoader(workers=2).load(str(project))
+
+    assert [c['path'] for c in serial['components']] == [c['path'] for c in parallel['components']]
+    assert serial['components'] == parallel['components']
+    assert serial['metrics'] == parallel['metrics']
+    assert serial['metrics']['total_components'] == 12
+
+
+def test_load_extracts_functions(project):
+    info = CppProjectLoader(workers=1).load(str(project))
+    source = next(c for c in info['components'] if c['path'].endswith('account.cpp'))
+
+    names = [f['name'] for f in source['functions']]
+    assert names == ['validateBalance', 'calculateTotal']
+    assert 'return false' in source['functions'][0]['content']
+
+
+def test_incremental_load_reparses_only_changed_files(project, tmp_path_factory):
+    cache_dir = str(tmp_path_factory.mktemp("cache"))
+
+    first_loader = CppProjectLoader(workers=1, cache_dir=cache_dir)
+    first = first_loader.load(str(project))
+    assert first['cache_stats']['misses'] == 12
+
+    changed = project / "module0" / "account.cpp"
+    changed.write_text(SOURCE.replace("calculateTotal", "calculateSum"))
+    (project / "module5" / "account.h").unlink()
+
+    loader = CppProjectLoader(workers=1, cache_dir=cache_dir)
+    second = loader.load(str(project))
+
+    assert second['cache_stats']['hits'] == 10
+    assert second['cache_stats']['misses'] == 1
+    assert loader.changed_paths == [str(changed)]
+    assert loader.removed_paths == [str(project / "module5" / "account.h")]
+
+    source = next(c for c in second['components'] if c['path'] == str(changed))
+    assert [f['name'] for f in source['functions']] == ['validateBalance', 'calculateSum']
+    assert second['dependencies_graph'] == CppProjectLoader(workers=1).load(str(project))['dependencies_graph']
+
+
+def test_line_index_matches_prefix_count():
+    positions = range(len(SOURCE) + 1)
+    index = LineIndex(SOURCE)
+    assert [index.line_of(p) for p in positions] == [SOURCE[:p].count('\n') + 1 for p in positions]
+    assert LineIndex(SOURCE.encode()).line_of(len(SOURCE)) == SOURCE.count('\n') + 1
+
+
+TRICKY_SOURCE = r"""
+int counter = 0;
+
+void processOrders(std::vector<Order>& orders) {
+    // fecha } aqui no comentário
+    const char* open = "{";
+    char close = '}';
+    std::for_each(orders.begin(), orders.end(), [&](Order& order) {
+        auto apply = [](Order& o) { o.total = 0; };
+        apply(order);
+    });
+    /* { */
+}
+
+bool validateOrder(const Order& order) {
+    return order.total > 1'000;
+}
+"""
+
+
+def test_function_bodies_ignore_literals_and_comments(tmp_path):
+    (tmp_path / "orders.cpp").write_text(TRICKY_SOURCE)
+    info = CppProjectLoader(workers=1).load(str(tmp_path))
+    functions = {f['name']: f for f in info['components'][0]['functions']}
+
+    process = functions['processOrders']['content']
+    assert process.startswith('void processOrders(')
+    assert process.endswith('/* { */\n}')
+    assert functions['validateOrder']['content'] == (
+        "bool validateOrder(const Order& order) {\n    return order.total > 1'000;\n}"
+    )
+
+
+def test_include_resolution_uses_relative_and_cmake_dirs(project):
+    (project / "CMakeLists.txt").write_text(
+        "include_directories(${CMAKE_CURRENT_SOURCE_DIR}/module3)\n"
+    )
+    (project / "app").mkdir()
+    (project / "app" / "main.cpp").write_text('#include "account.h"\n#include "missing.h"\n')
+    (project / "app" / "report.cpp").write_text('#include "module1/account.h"\n')
+
+    info = CppProjectLoader(workers=1).load(str(project))
+    graph = info['dependencies_graph']
+
+    assert graph[str(project / "module0" / "account.cpp")] == [str(project / "module0" / "account.h")]
+    assert graph[str(project / "app" / "main.cpp")] == [str(project / "module3" / "account.h")]
+    assert graph[str(project / "app" / "report.cpp")] == [str(project / "module1" / "account.h")]
+    assert info['ambiguous_includes'] == []
+
+
+def test_nested_cmake_lists_resolve_project_dir_from_the_root(project):
+    (project / "app").mkdir()
+    (project / "app" / "CMakeLists.txt").write_text(
+        "include_directories(${PROJECT_SOURCE_DIR}/module3)\n"
+        "include_directories(${CMAKE_CURRENT_SOURCE_DIR}/local)\n"
+    )
+    (project / "app" / "local").mkdir()
+    (project / "app" / "local" / "config.h").write_text("#pragma once\n")
+    (project / "app" / "main.cpp").write_text('#include "account.h"\n#include "config.h"\n')
+
+    info = CppProjectLoader(workers=1).load(str(project))
+
+    assert sorted(info['dependencies_graph'][str(project / "app" / "main.cpp")]) == [
+        str(project / "app" / "local" / "config.h"),
+        str(project / "module3" / "account.h"),
+    ]
+    assert info['ambiguous_includes'] == []
+
+
+def test_ambiguous_includes_are_reported(project):
+    (project / "app").mkdir()
+    (project / "app" / "main.cpp").write_text('#include "account.h"\n')
+
+    info = CppProjectLoader(workers=1).load(str(project))
+
+    assert info['dependencies_graph'][str(project / "app" / "main.cpp")] == []
+    [ambiguous] = info['ambiguous_includes']
+    assert ambiguous['include'] == "account.h"
+    assert len(ambiguous['candidates']) == 6
+
+
+def test_legacy_encodings_are_loaded_not_dropped(tmp_path):
+    latin_source = '// Validação de saldo\nint limite = 0;\nbool validarSaldo(int valor) {\n    return valor > 0; // "não"\n}\n'
+    (tmp_path / "latin.cpp").write_bytes(latin_source.encode('cp1252'))
+    (tmp_path / "wide.cpp").write_bytes(latin_source.encode('utf-16'))
+    (tmp_path / "empty.h").write_bytes(b"")
+
+    info = CppProjectLoader(workers=1).load(str(tmp_path))
+    components = {c['path'].rsplit(os.sep, 1)[-1]: c for c in info['components']}
+
+    assert components['latin.cpp']['encoding'] == 'cp1252'
+    assert components['wide.cpp']['encoding'] == 'utf-16'
+    for name in ('latin.cpp', 'wide.cpp'):
+        [function] = components[name]['functions']
+        assert function['name'] == 'validarSaldo'
+        assert function['line'] == 2
+        assert '"não"' in function['content']
+    assert components['empty.h']['functions'] == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_oversized_files_keep_symbols_without_bodies(tmp_path, workers):
+    # Dois arquivos para que o modo paralelo use de fato o pool
+    (tmp_path / "generated.cpp").write_text(SOURCE)
+    (tmp_path / "small.h").write_text("int answer();\n")
+    loader = CppProjectLoader(workers=workers)
+    loader.max_file_bytes = 64
+
+    components = {c['path'].rsplit(os.sep, 1)[-1]: c for c in loader.load(str(tmp_path))['components']}
+    component = components['generated.cpp']
+
+    assert component['oversized'] is True
+    assert [f['name'] for f in component['functions']] == ['validateBalance', 'calculateTotal']
+    assert all(f['content'] == "" for f in component['functions'])
+    assert component['classes'][0]['name'] == 'Account'
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_components_streams_same_components(project, workers):
+    expected = CppProjectLoader(workers=1).load(str(project))
+
+    loader = CppProjectLoader(workers=workers)
+    stream = loader.iter_components(str(project))
+    first = next(stream)
+    assert loader.project_info is None
+    assert first['functions'][0]['content'] == expected['components'][0]['functions'][0]['content']
+
+    streamed = [first] + list(stream)
+    assert [c['path'] for c in streamed] == [c['path'] for c in expected['components']]
+    assert loader.project_info['dependencies_graph'] == expected['dependencies_graph']
+
+    # O loader guarda só a estrutura, sem os corpos das funções
+    retained = loader.project_info['components']
+    assert all(f['content'] == "" for c in retained for f in c['functions'])
+
+
+def test_braces_in_parameters_are_not_taken_as_the_body(tmp_path):
+    (tmp_path / "options.cpp").write_text("void configure(Options opts = {}) { apply(opts); }\n")
+
+    [component] = CppProjectLoader(workers=1).load(str(tmp_path))['components']
+
+    [function] = component['functions']
+    assert function['content'] == "void configure(Options opts = {}) { apply(opts); }"
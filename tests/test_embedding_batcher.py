@@ -0,0 +1,61 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+from chromadb.utils import embedding_functions
+from src.repositories.vector_store.embedding_batcher import EmbeddingBatcher
+from src.services.token_estimation import chunk_by_tokens, estimate_tokens
+from tests.fake_embedding_server import FakeEmbeddingServer
+
+
+class FlakyEmbeddingFunction(EmbeddingFunction[Documents]):
+    def __init__(self, failures):
+        self.failures = failures
+
+    def __call__(self, input: Documents) -> Embeddings:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("rate limited")
+        return [np.ones(2, dtype=np.float32) for _ in input]
+
+
+def test_chunk_by_tokens_respects_budget_and_size():
+    texts = ["x" * 30, "x" * 30, "x" * 30, "x" * 300, "x"]
+    chunks = list(chunk_by_tokens(texts, max_tokens=25))
+    assert [len(chunk) for chunk in chunks] == [2, 1, 1, 1]
+    assert all(sum(estimate_tokens(t) for t in chunk) <= 25 for chunk in chunks if len(chunk) > 1)
+
+    chunks = list(chunk_by_tokens(["a"] * 5, max_tokens=1000, max_items=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_batches_are_sent_concurrently_and_keep_order():
+    texts = [f"rule {'x' * i}" for i in range(40)]
+    with FakeEmbeddingServer() as server:
+        openai_function = embedding_functions.OpenAIEmbeddingFunction(
+            api_key="test", api_base=server.api_base
+        )
+        batcher = EmbeddingBatcher(openai_function, max_batch_tokens=1000, max_batch_size=8,
+                                   max_concurrency=4)
+        embeddings = batcher(texts)
+
+    assert len(server.requests) == 5
+    assert all(len(request) <= 8 for request in server.requests)
+    assert sorted(t for request in server.requests for t in request) == sorted(texts)
+    assert [float(e[0]) for e in embeddings] == [float(len(t)) for t in texts]
+
+
+def test_failed_batches_are_retried():
+    batcher = EmbeddingBatcher(FlakyEmbeddingFunction(failures=2), max_retries=3)
+    batcher._embed_batch.retry.wait = lambda retry_state: 0
+
+    assert len(batcher(["a", "b"])) == 2
+    assert batcher.requests == 3
@@ -0,0 +1,53 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+from src.repositories.vector_store.embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+
+
+class CountingEmbeddingFunction(EmbeddingFunction[Documents]):
+    def __init__(self):
+        self.requested = []
+
+    def __call__(self, input: Documents) -> Embeddings:
+        self.requested.append(list(input))
+        return [np.array([len(text), 1.0, 2.0], dtype=np.float32) for text in input]
+
+
+def test_only_misses_reach_the_embedding_function(tmp_path):
+    inner = CountingEmbeddingFunction()
+    cache_path = str(tmp_path / "embeddings.sqlite3")
+    cached = CachedEmbeddingFunction(inner, "model", EmbeddingCache(cache_path))
+
+    first = cached(["a", "bb", "a"])
+    assert inner.requested == [["a", "bb"]]
+    assert [vector[0] for vector in first] == [1.0, 2.0, 1.0]
+
+    # Nova instância sobre o mesmo arquivo: tudo vem do cache
+    inner = CountingEmbeddingFunction()
+    cached = CachedEmbeddingFunction(inner, "model", EmbeddingCache(cache_path))
+    second = cached(["bb", "a", "ccc"])
+    assert inner.requested == [["ccc"]]
+    assert [vector[0] for vector in second] == [2.0, 1.0, 3.0]
+    assert cached.stats["hits"] == 2
+    assert cached.stats["misses"] == 1
+
+    cached(["a", "bb"])
+    assert cached.stats["saved_calls"] == 1
+    assert len(inner.requested) == 1
+
+
+def test_cache_is_keyed_by_model(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    inner = CountingEmbeddingFunction()
+    CachedEmbeddingFunction(inner, "model-a", cache)(["text"])
+    CachedEmbeddingFunction(inner, "model-b", cache)(["text"])
+    assert inner.requested == [["text"], ["text"]]
@@ -0,0 +1,97 @@
+import sys
+import os
+import re
+import asyncio
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import pytest
+from src.config.settings import get_settings
+from src.pipelines.project.enrich_business_rules import EnrichBusinessRules
+from src.services import llm_factory
+from src.services.llm_factory import close_clients
+from tests.fake_chat_server import FakeChatServer
+
+
+def analyze(payload):
+    prompt = payload["messages"][-1]["content"]
+    rule_ids = re.findall(r"ID da Regra: (\S+)", prompt)
+    if any(rule_id.startswith("quebrada") for rule_id in rule_ids):
+        return {"analyses": "resposta inválida"}
+    return {"analyses": [{
+        "rule_id": rule_id,
+        "is_business_rule": True,
+        "description": f"descrição de {rule_id}",
+        "dependencies": [],
+        "rule_type": "validation",
+        "domain_objects": [],
+        "business_impact": "alto",
+        "confidence_score": 0.9
+    } for rule_id in rule_ids]}
+
+
+@pytest.fixture
+def chat_server(monkeypatch):
+    with FakeChatServer(analyze) as server:
+        monkeypatch.setattr(get_settings().openai, "base_url", server.base_url)
+        monkeypatch.setattr("src.services.llm_factory.get_completion_cache", lambda: None)
+        monkeypatch.setattr(get_settings().enrichment, "max_rules_per_chunk", 2)
+        yield server
+    close_clients()
+
+
+def make_rule(rule_id, confidence="medium"):
+    return {
+        'id': rule_id,
+        'function_name': rule_id,
+        'content': f"bool {rule_id}() {{ return true; }}",
+        'type': 'business_rule',
+        'confidence': confidence
+    }
+
+
+def test_rules_are_enriched_in_chunks_and_failures_stay_local(chat_server):
+    rules = [make_rule("validarA"), make_rule("validarB"), make_rule("quebradaC"),
+             make_rule("validarD"), make_rule("validarE"), make_rule("checkF", "high")]
+
+    enriched = EnrichBusinessRules()._enrich_batch(rules)
+
+    # checkF já tem confiança alta; as outras 5 vão em 3 chunks de até 2 regras
+    assert len(chat_server.requests) >= 3
+    descriptions = {rule['id']: rule.get('description') for rule in enriched}
+    assert descriptions == {
+        "validarA": "descrição de validarA",
+        "validarB": "descrição de validarB",
+        "quebradaC": None,
+        "validarD": None,
+        "validarE": "descrição de validarE",
+        "checkF": None,
+    }
+    assert [rule['id'] for rule in enriched] == [rule['id'] for rule in rules]
+
+
+def test_streamed_batches_share_one_loop_and_close_its_clients(chat_server):
+    loops = set()
+    step = EnrichBusinessRules()
+    enrich_chunks = step._enrich_chunks
+
+    async def tracking_enrich_chunks(chunks, concurrency):
+        loops.add(asyncio.get_running_loop())
+        return await enrich_chunks(chunks, concurrency)
+
+    step._enrich_chunks = tracking_enrich_chunks
+    batches = [[make_rule("validarA")], [make_rule("validarB")], [make_rule("validarC")]]
+
+    enriched = list(step._enrich_stream(iter(batches)))
+
+    assert [[rule['description'] for rule in batch] for batch in enriched] == [
+        ["descrição de validarA"], ["descrição de validarB"], ["descrição de validarC"]
+    ]
+    [loop] = loops
+    assert loop.is_closed()
+    assert loop not in llm_factory._async_clients
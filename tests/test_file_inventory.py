@@ -0,0 +1,67 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+from src.services.file_inventory import FileInventory
+from src.services.language_detection import LanguageDetectionStrategy
+
+
+def make_tree(root, files):
+    for relative_path, content in files.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_scan_honours_gitignore_and_excludes(tmp_path):
+    make_tree(tmp_path, {
+        ".gitignore": "*.o\n/generated/\n!keep.o\n",
+        "src/main.cpp": "",
+        "src/main.o": "",
+        "src/keep.o": "",
+        "src/.gitignore": "local_*.h\n",
+        "src/local_config.h": "",
+        "src/b.h": "",
+        "src/sub/a.cpp": "",
+        "generated/out.cpp": "",
+        "lib/generated/kept.cpp": "",
+        "build/CMakeFiles/x.cpp": "",
+        "third_party/zlib/zlib.h": "",
+        "CMakeLists.txt": "",
+    })
+
+    inventory = FileInventory.scan(str(tmp_path), exclude_globs=["build/", "third_party/"])
+
+    assert [entry.relative_path for entry in inventory] == [
+        ".gitignore",
+        "CMakeLists.txt",
+        "lib/generated/kept.cpp",
+        "src/.gitignore",
+        "src/b.h",
+        "src/keep.o",
+        "src/main.cpp",
+        "src/sub/a.cpp",
+    ]
+    assert [e.relative_path for e in inventory.with_suffixes(['.CPP'])] == [
+        "lib/generated/kept.cpp", "src/main.cpp", "src/sub/a.cpp"
+    ]
+    assert [e.path for e in inventory.named(['CMakeLists.txt'])] == [str(tmp_path / "CMakeLists.txt")]
+
+
+def test_language_detection_uses_inventory(tmp_path):
+    make_tree(tmp_path, {"main.cpp": "", "util.cpp": "", "CMakeLists.txt": ""})
+    inventory = FileInventory.scan(str(tmp_path))
+
+    # Arquivo criado depois da varredura não é visto: a detecção não percorre o disco
+    (tmp_path / "notes.txt").write_text("")
+    result = LanguageDetectionStrategy().detect(str(tmp_path), inventory)
+
+    assert result.language == 'cpp'
+    assert result.detected_files == {'.cpp': 2, '.txt': 1}
+    assert result.main_files == ['CMakeLists.txt']
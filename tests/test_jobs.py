@@ -0,0 +1,256 @@
+import sys
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import pytest
+from fastapi.testclient import TestClient
+from src.api.app import create_app
+from src.api.models import DiscoveryTaskInput
+from src.config.settings import JobSettings, get_settings
+from src.tasks import jobs
+from src.tasks.jobs import JobQueue, JobStore, RabbitMQBroker, SqliteBroker
+
+
+def fake_process_task(task_input, task_id=None, on_progress=None):
+    if task_input.project_path == "/broken":
+        raise ValueError("project not found")
+    for done in range(1, 4):
+        time.sleep(0.05)
+        on_progress(done, 3, f"Step{done}")
+    return {
+        "task_id": task_id,
+        "status": "completed",
+        "output_data": {"result": {"project_path": task_input.project_path}, "metadata": {}},
+    }
+
+
+def wait_for(queue, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job.status in (jobs.COMPLETED, jobs.FAILED):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_jobs_run_in_background_with_progress(store):
+    settings = JobSettings()
+    queue = JobQueue(store, SqliteBroker(store, settings), workers=2, poll_interval=0.1,
+                     runner=fake_process_task)
+    queue.start()
+    try:
+        job_id = queue.submit(DiscoveryTaskInput(project_path="/repo"))
+        assert queue.get(job_id).status in (jobs.QUEUED, jobs.RUNNING)
+
+        job = wait_for(queue, job_id)
+        assert job.status == jobs.COMPLETED
+        assert job.progress == 1
+        assert job.message == "Step3 (3/3)"
+        assert job.result == {"project_path": "/repo"}
+
+        failed = wait_for(queue, queue.submit(DiscoveryTaskInput(project_path="/broken")))
+        assert failed.status == jobs.FAILED
+        assert failed.error == "project not found"
+    finally:
+        queue.shutdown()
+
+
+def test_worker_pool_bounds_concurrency(store):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def runner(task_input, task_id=None, on_progress=None):
+        with lock:
+            running.append(task_id)
+            peak.append(len(running))
+        time.sleep(0.1)
+        with lock:
+            running.remove(task_id)
+        return {"output_data": {"result": {}}}
+
+    queue = JobQueue(store, SqliteBroker(store, JobSettings()), workers=2, poll_interval=0.05,
+                     runner=runner)
+    queue.start()
+    try:
+        job_ids = [queue.submit(DiscoveryTaskInput(project_path=f"/repo{i}")) for i in range(5)]
+        assert all(wait_for(queue, job_id).status == jobs.COMPLETED for job_id in job_ids)
+    finally:
+        queue.shutdown()
+    assert max(peak) == 2
+
+
+class FakeChannel:
+    """
+    Stand-in local do canal do pika (só o que o broker usa)
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.unacked = {}
+        self.acked = []
+        self.next_tag = 1
+
+    def queue_declare(self, queue, durable):
+        self.durable = durable
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        self.messages.append(body)
+
+    def basic_get(self, queue, auto_ack):
+        if not self.messages:
+            return None, None, None
+        tag, self.next_tag = self.next_tag, self.next_tag + 1
+        body = self.messages.pop(0)
+        self.unacked[tag] = body
+        return SimpleNamespace(delivery_tag=tag), None, body
+
+    def basic_ack(self, delivery_tag):
+        self.acked.append(self.unacked.pop(delivery_tag))
+
+
+class FakeConnection:
+    def __init__(self, channel):
+        self._channel = channel
+        self.keepalives = 0
+
+    def channel(self):
+        return self._channel
+
+    def process_data_events(self, time_limit):
+        self.keepalives += 1
+
+    def close(self):
+        pass
+
+
+def test_rabbitmq_broker_acks_after_the_job_finishes(store):
+    channel = FakeChannel()
+    connection = FakeConnection(channel)
+    broker = RabbitMQBroker(store, JobSettings(), connection_factory=lambda: connection)
+    queue = JobQueue(store, broker, workers=1, poll_interval=0.05, runner=fake_process_task)
+    queue.start()
+    try:
+        job_id = queue.submit(DiscoveryTaskInput(project_path="/repo"))
+        assert wait_for(queue, job_id).status == jobs.COMPLETED
+    finally:
+        queue.shutdown()
+    assert channel.durable
+    assert channel.acked == [job_id.encode()]
+    assert channel.unacked == {}
+
+
+def test_api_submits_and_polls_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings().jobs, "db_path", str(tmp_path / "api_jobs.sqlite3"))
+    monkeypatch.setattr(get_settings().jobs, "poll_interval", 0.05)
+    monkeypatch.setattr(jobs, "process_task", fake_process_task)
+
+    with TestClient(create_app()) as client:
+        response = client.post("/jobs/discovery", json={"project_path": "/repo"})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        deadline = time.monotonic() + 5
+        while client.get(f"/jobs/{job_id}").json()["status"] != jobs.COMPLETED:
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+        assert client.get(f"/jobs/{job_id}").json()["result"] == {"project_path": "/repo"}
+        assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_stale_running_jobs_are_requeued_at_startup(store):
+    job_id = store.create(DiscoveryTaskInput(project_path="/repo"))
+    # Worker que morreu no meio do job: a posse venceu sem renovação
+    assert store.start(job_id, "dead-worker", lease_seconds=0.05)
+    time.sleep(0.1)
+
+    queue = JobQueue(store, SqliteBroker(store, JobSettings()), workers=1, poll_interval=0.05,
+                     runner=fake_process_task)
+    queue.start()
+    try:
+        assert wait_for(queue, job_id).status == jobs.COMPLETED
+    finally:
+        queue.shutdown()
+
+
+def test_redelivery_reclaims_only_expired_leases(store):
+    job_id = store.create(DiscoveryTaskInput(project_path="/repo"))
+    assert store.start(job_id, "worker-a", lease_seconds=60)
+    assert not store.start(job_id, "worker-b", lease_seconds=60)
+
+    expired_id = store.create(DiscoveryTaskInput(project_path="/repo"))
+    assert store.start(expired_id, "worker-a", lease_seconds=-1)
+    assert store.start(expired_id, "worker-b", lease_seconds=60)
+
+    store.complete(job_id, {"result": {}})
+    assert not store.start(job_id, "worker-b", lease_seconds=60)
+
+
+def test_heartbeat_keeps_long_jobs_leased(store):
+    runs = []
+
+    def runner(task_input, task_id=None, on_progress=None):
+        runs.append(task_id)
+        time.sleep(0.5)
+        return {"output_data": {"result": {}}}
+
+    queue = JobQueue(store, SqliteBroker(store, JobSettings()), workers=2, poll_interval=0.05,
+                     runner=runner, lease_seconds=0.15)
+    queue.start()
+    try:
+        job_id = queue.submit(DiscoveryTaskInput(project_path="/repo"))
+        assert wait_for(queue, job_id).status == jobs.COMPLETED
+    finally:
+        queue.shutdown()
+    assert runs == [job_id]
+
+
+def test_rabbitmq_connection_is_kept_alive_during_long_jobs(store):
+    connection = FakeConnection(FakeChannel())
+    broker = RabbitMQBroker(store, JobSettings(), connection_factory=lambda: connection)
+
+    def runner(task_input, task_id=None, on_progress=None):
+        time.sleep(0.3)
+        return {"output_data": {"result": {}}}
+
+    queue = JobQueue(store, broker, workers=1, poll_interval=0.05, runner=runner, lease_seconds=0.15)
+    queue.start()
+    try:
+        job_id = queue.submit(DiscoveryTaskInput(project_path="/repo"))
+        assert wait_for(queue, job_id).status == jobs.COMPLETED
+    finally:
+        queue.shutdown()
+    assert connection.keepalives >= 3
+
+
+def test_worker_survives_a_failed_ack(store):
+    class FlakyBroker(SqliteBroker):
+        def ack(self, job_id):
+            raise ConnectionError("connection lost")
+
+    queue = JobQueue(store, FlakyBroker(store, JobSettings()), workers=1, poll_interval=0.05,
+                     runner=fake_process_task)
+    queue.start()
+    try:
+        first = queue.submit(DiscoveryTaskInput(project_path="/repo"))
+        assert wait_for(queue, first).status == jobs.COMPLETED
+        second = queue.submit(DiscoveryTaskInput(project_path="/repo"))
+        assert wait_for(queue, second).status == jobs.COMPLETED
+        assert all(thread.is_alive() for thread in queue._threads)
+    finally:
+        queue.shutdown()
@@ -0,0 +1,155 @@
+import sys
+import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import pytest
+from pydantic import BaseModel
+from src.config.settings import get_settings
+from src.services.completion_cache import CompletionCache
+from src.services import llm_factory
+from src.services.llm_factory import LLMFactory, close_clients, get_async_client, get_client, run_async
+from tests.fake_chat_server import FakeChatServer
+
+
+def test_factories_share_one_pooled_client_per_provider():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: LLMFactory("openai").client, range(32)))
+    assert all(client is clients[0] for client in clients)
+
+    http_client = clients[0].client._client
+    assert http_client.timeout.connect == get_settings().openai.connect_timeout
+    assert get_client("anthropic") is not clients[0]
+
+
+def test_unknown_provider_is_rejected():
+    with pytest.raises(ValueError):
+        get_client("unknown")
+
+
+class Answer(BaseModel):
+    response: str
+
+
+@pytest.fixture
+def chat_server(monkeypatch):
+    with FakeChatServer(lambda payload: {"response": payload["messages"][-1]["content"]}, delay=0.2) as server:
+        monkeypatch.setattr(get_settings().openai, "base_url", server.base_url)
+        monkeypatch.setattr("src.services.llm_factory.get_completion_cache", lambda: None)
+        yield server
+    close_clients()
+
+
+def test_acreate_completion_matches_sync_and_overlaps_requests(chat_server):
+    llm = LLMFactory("openai")
+    messages = [{"role": "user", "content": "olá"}]
+    assert llm.create_completion(response_model=Answer, messages=messages).response == "olá"
+
+    async def ask_all():
+        return await asyncio.gather(*(
+            llm.acreate_completion(response_model=Answer, messages=[{"role": "user", "content": str(i)}])
+            for i in range(5)
+        ))
+
+    start = time.perf_counter()
+    answers = asyncio.run(ask_all())
+    elapsed = time.perf_counter() - start
+
+    assert [answer.response for answer in answers] == ["0", "1", "2", "3", "4"]
+    assert elapsed < 5 * chat_server.delay
+
+
+def test_async_clients_are_shared_per_event_loop():
+    async def two_lookups():
+        return get_async_client("openai"), get_async_client("openai")
+
+    first, second = asyncio.run(two_lookups())
+    assert first is second
+    other, _ = asyncio.run(two_lookups())
+    assert other is not first
+
+
+def test_async_clients_are_closed_with_their_loop(chat_server):
+    llm = LLMFactory("openai")
+    messages = [{"role": "user", "content": "olá"}]
+    clients = []
+
+    async def ask():
+        completion = await llm.acreate_completion(response_model=Answer, messages=messages)
+        clients.append(get_async_client("openai"))
+        return completion
+
+    for _ in range(5):
+        assert run_async(ask()).response == "olá"
+    assert len(llm_factory._async_clients) == 0
+    assert all(client.client.is_closed() for client in clients)
+
+
+def test_close_clients_includes_async_clients():
+    loop = asyncio.new_event_loop()
+    try:
+        async def lookup():
+            return get_async_client("openai")
+
+        client = loop.run_until_complete(lookup())
+        close_clients()
+        assert client.client.is_closed()
+        assert len(llm_factory._async_clients) == 0
+    finally:
+        loop.close()
+
+
+def test_deterministic_completions_are_cached(chat_server, tmp_path, monkeypatch):
+    cache = CompletionCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=3600, max_entries=100)
+    monkeypatch.setattr("src.services.llm_factory.get_completion_cache", lambda: cache)
+    llm = LLMFactory("openai")
+    messages = [{"role": "user", "content": "cacheável"}]
+
+    first = llm.create_completion(response_model=Answer, messages=messages, temperature=0)
+    second = llm.create_completion(response_model=Answer, messages=messages, temperature=0)
+    third = asyncio.run(llm.acreate_completion(response_model=Answer, messages=messages, temperature=0))
+    assert first.model_dump() == second.model_dump() == third.model_dump()
+    assert len(chat_server.requests) == 1
+
+    llm.create_completion(response_model=Answer, messages=messages, temperature=0, cache=False)
+    llm.create_completion(response_model=Answer, messages=messages, temperature=0.7)
+    llm.create_completion(response_model=Answer, messages=messages, temperature=0, model="gpt-4o-mini")
+    assert len(chat_server.requests) == 4
+    assert cache.stats["hits"] == 2
+
+
+def test_raw_completions_are_cached(chat_server, tmp_path, monkeypatch):
+    cache = CompletionCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=3600, max_entries=100)
+    monkeypatch.setattr("src.services.llm_factory.get_completion_cache", lambda: cache)
+    llm = LLMFactory("openai")
+    messages = [{"role": "user", "content": "sem modelo"}]
+
+    first = llm.create_completion(response_model=None, messages=messages, temperature=0)
+    second = llm.create_completion(response_model=None, messages=messages, temperature=0)
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert len(chat_server.requests) == 1
+
+    # Estruturada e bruta com os mesmos parâmetros não compartilham entrada
+    llm.create_completion(response_model=Answer, messages=messages, temperature=0)
+    assert len(chat_server.requests) == 2
+
+
+def test_completion_cache_eviction(tmp_path, monkeypatch):
+    cache = CompletionCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=60, max_entries=2)
+    for i in range(3):
+        cache.put(f"key{i}", Answer(response=str(i)))
+    assert cache.get("key0", Answer) is None
+    assert cache.get("key2", Answer) == Answer(response="2")
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.get("key2", Answer) is None
+    assert cache.stats["entries"] == 1
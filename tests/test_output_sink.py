@@ -0,0 +1,64 @@
+import sys
+import os
+import io
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import pytest
+from src.services.output_sink import (
+    AnimatedSink, HeadlessSink, JsonEventsSink, get_output_sink, use_output_sink
+)
+
+TEXT = "Identifiquei que trata-se de um projeto em cpp. " * 20
+
+
+def test_headless_sink_never_sleeps(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: pytest.fail("headless sink slept"))
+    stream = io.StringIO()
+    sink = HeadlessSink(stream=stream, input_func=lambda prompt: "/projeto")
+
+    sink.write(TEXT)
+    sink.write_delta("par")
+    sink.write_delta("cial")
+    sink.end_stream()
+    assert sink.ask("Caminho?") == "/projeto"
+    assert stream.getvalue() == f"{TEXT}\nparcial\nCaminho?\n"
+
+
+def test_animated_sink_does_not_block_the_caller():
+    stream = io.StringIO()
+    sink = AnimatedSink(min_delay=0.001, max_delay=0.002, stream=stream)
+
+    start = time.perf_counter()
+    sink.write(TEXT)
+    assert time.perf_counter() - start < 0.05
+
+    sink.flush()
+    sink.close()
+    assert stream.getvalue() == TEXT + "\n"
+
+
+def test_json_events_sink_and_context_override():
+    events = []
+    sink = JsonEventsSink(callback=events.append, input_func=lambda prompt: "sim")
+
+    with use_output_sink(sink):
+        console = get_output_sink()
+        console.write("olá")
+        console.write_delta("res")
+        console.end_stream()
+        assert console.ask("Continuar?") == "sim"
+    assert get_output_sink() is not sink
+
+    assert events == [
+        {"type": "message", "text": "olá"},
+        {"type": "delta", "text": "res"},
+        {"type": "end"},
+        {"type": "prompt", "text": "Continuar?"},
+    ]
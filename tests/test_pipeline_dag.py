@@ -0,0 +1,114 @@
+import sys
+import os
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import pytest
+from src.api.models import QueryTaskInput
+from src.pipelines.base import BasePipeline, PipelineStep
+from src.services.output_sink import JsonEventsSink, get_output_sink, use_output_sink
+
+
+class Step(PipelineStep):
+    def __init__(self, name, reads=None, writes=None, delay=0.0, fail=False, log=None):
+        self.name = name
+        if reads is not None or writes is not None:
+            self.reads = frozenset(reads or ())
+            self.writes = frozenset(writes or ())
+        self.delay = delay
+        self.fail = fail
+        self.log = log if log is not None else []
+
+    def process(self, input_data, context, output_data):
+        self.log.append(("start", self.name))
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError(f"{self.name} failed")
+        for key in self.writes or ():
+            context.intermediates[key] = self.name
+        get_output_sink().write(self.name)
+        self.log.append(("end", self.name))
+        return input_data, context, output_data
+
+
+class Pipeline(BasePipeline):
+    def __init__(self, *steps, timeouts=None):
+        super().__init__()
+        for step in steps:
+            self.add_step(step, timeout=(timeouts or {}).get(step.name))
+
+
+def task():
+    return QueryTaskInput(query="cpf")
+
+
+def test_independent_steps_run_concurrently():
+    log = []
+    pipeline = Pipeline(
+        Step("load", writes=["project"], log=log),
+        Step("rules", reads=["project"], writes=["rules"], delay=0.3, log=log),
+        Step("summary", reads=["project"], writes=["summary"], delay=0.3, log=log),
+        Step("index", reads=["rules", "summary"], writes=["index"], log=log),
+    )
+    assert pipeline.dependencies() == [set(), {0}, {0}, {1, 2}]
+
+    start = time.perf_counter()
+    context, _ = pipeline.run(task())
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.55
+    assert context.intermediates == {"project": "load", "rules": "rules", "summary": "summary", "index": "index"}
+    assert log.index(("start", "index")) > max(log.index(("end", "rules")), log.index(("end", "summary")))
+
+
+def test_undeclared_steps_are_barriers():
+    pipeline = Pipeline(
+        Step("a", writes=["a"]),
+        Step("interactive"),
+        Step("b", writes=["b"]),
+    )
+    assert pipeline.dependencies() == [set(), {0}, {1}]
+
+
+def test_failure_stops_dependents_and_propagates():
+    log = []
+    pipeline = Pipeline(
+        Step("load", writes=["project"], fail=True, log=log),
+        Step("rules", reads=["project"], writes=["rules"], log=log),
+    )
+    with pytest.raises(ValueError, match="load failed"):
+        pipeline.run(task())
+    assert ("start", "rules") not in log
+
+
+def test_step_timeout():
+    release = threading.Event()
+
+    class Hang(Step):
+        def process(self, input_data, context, output_data):
+            release.wait(5)
+            return input_data, context, output_data
+
+    pipeline = Pipeline(Hang("hang", writes=["x"]), Step("next", reads=["x"]), timeouts={"hang": 0.1})
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError, match="Hang"):
+        pipeline.run(task())
+    assert time.perf_counter() - start < 1
+    release.set()
+
+
+def test_steps_inherit_output_sink_and_report_progress():
+    events = []
+    progress = []
+    pipeline = Pipeline(Step("a", writes=["a"]), Step("b", writes=["b"]))
+    with use_output_sink(JsonEventsSink(callback=events.append)):
+        pipeline.run(task(), on_progress=lambda done, total, step: progress.append((done, total)))
+    assert sorted(event["text"] for event in events) == ["a", "b"]
+    assert progress == [(1, 2), (2, 2)]
@@ -0,0 +1,103 @@
+import sys
+import os
+import io
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import pytest
+from src.api.models import ProcessingContext, OutputDataModel, QueryTaskInput
+from src.config.settings import get_settings
+from src.pipelines.query.steps import GenerateResponse
+from src.services.llm_factory import LLMFactory, close_clients
+from src.services.output_sink import HeadlessSink, JsonEventsSink, use_output_sink
+from src.services.query.processor import QueryProcessor
+from tests.fake_chat_server import FakeChatServer
+
+ANSWER = "A regra validarCpf rejeita documentos com menos de 11 dígitos."
+
+
+def test_generate_response_streams_answer_deltas(monkeypatch):
+    monkeypatch.setattr("src.services.llm_factory.get_completion_cache", lambda: None)
+    monkeypatch.setattr("src.services.llm_factory.get_rate_limiter", lambda provider, model: None)
+    responder = lambda payload: {
+        "answer": ANSWER,
+        "referenced_rules": ["validarCpf_business_rule"],
+        "suggested_followup": []
+    }
+
+    with FakeChatServer(responder, chunk_size=8, chunk_delay=0.02) as server:
+        monkeypatch.setattr(get_settings().openai, "base_url", server.base_url)
+        processor = QueryProcessor(llm_client=LLMFactory("openai"), vector_store=object())
+        query_info = {"original_query": "cpf", "expanded_query": "cpf", "domain_focus": []}
+
+        deltas = []
+        arrivals = []
+        start = time.perf_counter()
+
+        def on_delta(text):
+            deltas.append(text)
+            arrivals.append(time.perf_counter() - start)
+
+        response = processor.generate_response(query_info, [], on_delta=on_delta)
+        total = time.perf_counter() - start
+    close_clients()
+
+    assert server.requests[0]["stream"] is True
+    assert "".join(deltas) == ANSWER == response["answer"]
+    assert len(deltas) > 1
+    assert response["referenced_rules"] == ["validarCpf_business_rule"]
+    # O primeiro trecho chega bem antes do fim da geração
+    assert arrivals[0] < total / 2
+
+
+def test_empty_stream_raises_a_clear_error():
+    class EmptyStream:
+        def stream_completion(self, **params):
+            return iter(())
+
+    processor = QueryProcessor(llm_client=EmptyStream(), vector_store=object())
+    query_info = {"original_query": "cpf", "expanded_query": "cpf", "domain_focus": []}
+    with pytest.raises(RuntimeError, match="stream ended without a response"):
+        processor.generate_response(query_info, [], on_delta=lambda text: None)
+
+
+class RecordingProcessor:
+    def __init__(self):
+        self.calls = []
+
+    def generate_response(self, query_info, relevant_rules, on_delta=None):
+        self.calls.append(on_delta)
+        if on_delta is not None:
+            on_delta(ANSWER)
+        return {"answer": ANSWER, "referenced_rules": [], "suggested_followup": [], "rules_analyzed": 0}
+
+
+def run_generate_response(sink):
+    step = GenerateResponse.__new__(GenerateResponse)
+    step.processor = RecordingProcessor()
+    context = ProcessingContext()
+    context.intermediates.update(query_info={"original_query": "cpf"}, relevant_rules=[])
+    with use_output_sink(sink):
+        step.process(QueryTaskInput(query="cpf"), context, OutputDataModel())
+    return step.processor.calls
+
+
+@pytest.mark.parametrize("sink", [
+    HeadlessSink(stream=io.StringIO()),
+    JsonEventsSink(callback=lambda event: None, streams_deltas=False),
+])
+def test_sinks_without_deltas_get_a_single_completion(sink):
+    assert run_generate_response(sink) == [None]
+
+
+def test_streaming_sink_gets_deltas():
+    events = []
+    calls = run_generate_response(JsonEventsSink(callback=events.append))
+    assert calls[0] is not None
+    assert [event["type"] for event in events] == ["delta", "end"]
@@ -0,0 +1,175 @@
+import sys
+import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import pytest
+from pydantic import BaseModel
+from src.config.settings import get_settings
+from types import SimpleNamespace
+from src.services.llm_factory import LLMFactory, close_clients, get_async_client
+from src.services.rate_limiter import RateLimiter
+from tests.fake_chat_server import FakeChatServer
+
+
+class Answer(BaseModel):
+    response: str
+
+
+def test_requests_per_minute_are_spaced():
+    # 600 RPM = 10/s, sem rajada além de uma requisição
+    limiter = RateLimiter(requests_per_minute=600, burst_seconds=0.1)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(5)))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= 0.35
+    stats = limiter.stats
+    assert stats["total_requests"] == 5
+    assert stats["throttled_requests"] == 4
+    assert stats["max_queue_depth"] >= 1
+    assert stats["queue_depth"] == 0
+
+
+def test_tokens_per_minute_budget_and_refund():
+    # 6000 TPM = 100 tokens/s, rajada de 100 tokens
+    limiter = RateLimiter(tokens_per_minute=6000, burst_seconds=1.0)
+
+    async def run():
+        start = time.perf_counter()
+        await asyncio.gather(limiter.aacquire(100), limiter.aacquire(50))
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) >= 0.45
+
+    # Uso real menor que o estimado devolve tokens ao bucket
+    limiter.record_usage(reserved_tokens=100, actual_tokens=0)
+    start = time.perf_counter()
+    limiter.acquire(50)
+    assert time.perf_counter() - start < 0.1
+
+
+def test_llm_calls_respect_the_limiter(monkeypatch):
+    limiter = RateLimiter(requests_per_minute=600, burst_seconds=0.1)
+    monkeypatch.setattr("src.services.llm_factory.get_rate_limiter", lambda provider, model: limiter)
+    monkeypatch.setattr("src.services.llm_factory.get_completion_cache", lambda: None)
+
+    with FakeChatServer(lambda payload: {"response": "ok"}) as server:
+        monkeypatch.setattr(get_settings().openai, "base_url", server.base_url)
+        llm = LLMFactory("openai")
+
+        async def ask_all():
+            # Client criado antes: as 4 reservas acontecem juntas
+            get_async_client("openai")
+            return await asyncio.gather(*(
+                llm.acreate_completion(response_model=Answer, messages=[{"role": "user", "content": str(i)}])
+                for i in range(4)
+            ))
+
+        start = time.perf_counter()
+        asyncio.run(ask_all())
+        elapsed = time.perf_counter() - start
+    close_clients()
+
+    assert len(server.requests) == 4
+    assert elapsed >= 0.25
+    assert limiter.stats["throttled_requests"] == 3
+
+
+def test_requests_larger_than_the_burst_are_charged_in_full():
+    # 60000 TPM = 1000 tokens/s, rajada de 50 tokens
+    limiter = RateLimiter(tokens_per_minute=60_000, burst_seconds=0.05)
+
+    start = time.perf_counter()
+    reserved = [limiter.acquire(120), limiter.acquire(120)]
+    elapsed = time.perf_counter() - start
+
+    # Cobrados por inteiro: (240 - 50) / 1000 s, e não só a rajada por pedido
+    assert reserved == [120, 120]
+    assert elapsed >= 0.18
+
+
+
+def test_refund_is_the_reserved_amount_minus_actual_usage():
+    # 60 TPM = 1 token/s, rajada de 50 tokens: o refill não interfere
+    limiter = RateLimiter(tokens_per_minute=60, burst_seconds=50)
+    limiter.tokens.reserve(120)
+
+    limiter.record_usage(reserved_tokens=120, actual_tokens=100)
+    assert limiter.tokens._available == pytest.approx(50 - 120 + 20, abs=1)
+
+
+class RecordingLimiter:
+    """
+    Limiter que não espera e registra cada acerto de reserva
+    """
+
+    def __init__(self):
+        self.usage = []
+
+    def acquire(self, tokens=0):
+        return tokens
+
+    async def aacquire(self, tokens=0):
+        return tokens
+
+    def record_usage(self, reserved_tokens, actual_tokens):
+        self.usage.append((reserved_tokens, actual_tokens))
+
+
+def failing_client():
+    def create(**params):
+        raise ConnectionError("provider down")
+
+    async def acreate(**params):
+        raise ConnectionError("provider down")
+
+    return (SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+            SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=acreate))))
+
+
+def test_failed_calls_return_their_reservation(monkeypatch):
+    limiter = RecordingLimiter()
+    sync_client, async_client = failing_client()
+    monkeypatch.setattr("src.services.llm_factory.get_rate_limiter", lambda provider, model: limiter)
+    monkeypatch.setattr("src.services.llm_factory.get_completion_cache", lambda: None)
+    monkeypatch.setattr(LLMFactory, "client", property(lambda self: sync_client))
+    monkeypatch.setattr("src.services.llm_factory.get_async_client", lambda provider: async_client)
+    llm = LLMFactory("openai")
+    messages = [{"role": "user", "content": "cpf"}]
+
+    with pytest.raises(ConnectionError):
+        llm.create_completion(response_model=Answer, messages=messages, max_tokens=100)
+    with pytest.raises(ConnectionError):
+        asyncio.run(llm.acreate_completion(response_model=Answer, messages=messages, max_tokens=100))
+
+    assert len(limiter.usage) == 2
+    assert all(reserved > 100 and actual == 0 for reserved, actual in limiter.usage)
+
+
+def test_streamed_completions_settle_their_reservation(monkeypatch):
+    limiter = RecordingLimiter()
+    monkeypatch.setattr("src.services.llm_factory.get_rate_limiter", lambda provider, model: limiter)
+    monkeypatch.setattr("src.services.llm_factory.get_completion_cache", lambda: None)
+
+    with FakeChatServer(lambda payload: {"response": "ok"}, chunk_size=4) as server:
+        monkeypatch.setattr(get_settings().openai, "base_url", server.base_url)
+        llm = LLMFactory("openai")
+        partials = list(llm.stream_completion(
+            response_model=Answer, messages=[{"role": "user", "content": "cpf"}], max_tokens=1000
+        ))
+    close_clients()
+
+    assert partials[-1].response == "ok"
+    [(reserved, actual)] = limiter.usage
+    assert reserved > 1000
+    assert 0 < actual < 100
@@ -0,0 +1,257 @@
+import sys
+import os
+from types import SimpleNamespace
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+import numpy as np
+import pytest
+from src.api.models import OutputDataModel, ProcessingContext
+from src.config.settings import get_settings
+from src.pipelines.project.prepare_vector_store import PrepareVectorStore
+from src.repositories.vector_store.embedding_backends import OnnxEmbeddingFunction, create_embedding_function
+from src.repositories.vector_store.store import VectorStore
+from src.services.container import get_container
+from src.services.file_inventory import FileInventory, scan_project
+from tests.fake_embedding_server import FakeEmbeddingServer
+
+
+@pytest.fixture
+def vector_store(tmp_path, monkeypatch):
+    settings = get_settings().vector_store
+    with FakeEmbeddingServer() as server:
+        monkeypatch.setattr(settings, "persistent", False)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        monkeypatch.setattr(settings, "embedding_api_base", server.api_base)
+        yield VectorStore(project_path=str(tmp_path), commit="test")
+
+
+def make_rule(source_path, function_name, description=""):
+    return {
+        'id': f"{function_name}_business_rule",
+        'source_path': source_path,
+        'function_name': function_name,
+        'content': f"bool {function_name}() {{ return true; }}",
+        'type': 'business_rule',
+        'confidence': 'high',
+        'description': description
+    }
+
+
+def rule_descriptions(vector_store):
+    records = vector_store.collection.get(include=["metadatas"])
+    return sorted((m['source_path'], m['function_name'], m['description']) for m in records['metadatas'])
+
+
+def test_store_rules_is_idempotent(vector_store):
+    rules = [make_rule("a.cpp", "validarCpf"), make_rule("b.cpp", "validarCpf")]
+    vector_store.store_rules(rules)
+    vector_store.store_rules(rules)
+    assert vector_store.collection.count() == 2
+
+    vector_store.store_rules([make_rule("a.cpp", "validarCpf", "atualizada")])
+    assert rule_descriptions(vector_store) == [
+        ("a.cpp", "validarCpf", "atualizada"),
+        ("b.cpp", "validarCpf", ""),
+    ]
+
+
+def test_delete_rules_for_paths(vector_store):
+    vector_store.store_rules([
+        make_rule("a.cpp", "validarCpf"),
+        make_rule("a.cpp", "calcularJuros"),
+        make_rule("b.cpp", "checkLimit"),
+    ])
+    assert vector_store.delete_rules_for_paths(["a.cpp", "missing.cpp"]) == 2
+    assert rule_descriptions(vector_store) == [("b.cpp", "checkLimit", "")]
+
+
+def test_unknown_embedding_backend_is_rejected():
+    settings = get_settings().vector_store.model_copy(update={"embedding_backend": "unknown"})
+    with pytest.raises(ValueError):
+        create_embedding_function(settings)
+
+
+class FakeTokenizer:
+    """
+    Um token por caractere (id = código do caractere), com padding até o
+    maior texto do lote, como o tokenizer configurado pelo backend
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def enable_truncation(self, max_length):
+        pass
+
+    def enable_padding(self, pad_id, pad_token):
+        pass
+
+    def encode_batch(self, texts):
+        self.batches.append(list(texts))
+        width = max(len(text) for text in texts)
+        return [
+            SimpleNamespace(
+                ids=[ord(c) for c in text] + [0] * (width - len(text)),
+                attention_mask=[1] * len(text) + [0] * (width - len(text))
+            )
+            for text in texts
+        ]
+
+
+class FakeSession:
+    """
+    Estado oculto de cada token = (id, 1); padding recebe um valor alto
+    para que qualquer vazamento no pooling apareça no resultado
+    """
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, output_names, feeds):
+        ids = feeds["input_ids"].astype(np.float32)
+        hidden = np.stack([ids, np.ones_like(ids)], axis=-1)
+        hidden[feeds["attention_mask"] == 0] = 999.0
+        return [hidden]
+
+
+def test_onnx_backend_batches_by_length_and_keeps_input_order(tmp_path, monkeypatch):
+    tokenizer = FakeTokenizer()
+    monkeypatch.setitem(sys.modules, "onnxruntime", SimpleNamespace(
+        SessionOptions=lambda: SimpleNamespace(),
+        InferenceSession=lambda path, sess_options, providers: FakeSession()
+    ))
+    monkeypatch.setitem(sys.modules, "tokenizers", SimpleNamespace(
+        Tokenizer=SimpleNamespace(from_file=lambda path: tokenizer)
+    ))
+    texts = ["abcdef", "a", "abcd", "ab", "abcde", "abc"]
+
+    embeddings = OnnxEmbeddingFunction(str(tmp_path), batch_size=2)(texts)
+
+    # Lotes formados na ordem de tamanho: pouco padding em cada um
+    assert tokenizer.batches == [["a", "ab"], ["abc", "abcd"], ["abcde", "abcdef"]]
+    for text, vector in zip(texts, embeddings):
+        expected = np.array([np.mean([ord(c) for c in text]), 1.0])
+        np.testing.assert_allclose(vector, expected / np.linalg.norm(expected), rtol=1e-5)
+        assert np.linalg.norm(vector) == pytest.approx(1.0)
+
+
+def run_prepare(project, rules, streaming=False, inventory=None):
+    context = ProcessingContext()
+    context.intermediates["project_path"] = str(project)
+    context.intermediates["file_inventory"] = inventory if inventory is not None else scan_project(str(project))
+    if streaming:
+        context.intermediates["enriched_rule_batches"] = iter([rules])
+    else:
+        context.intermediates["enriched_business_rules"] = rules
+    step = PrepareVectorStore()
+    step.process(None, context, OutputDataModel())
+    return step.vector_store, context
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    settings = get_settings().vector_store
+    with FakeEmbeddingServer() as server:
+        monkeypatch.setattr(settings, "persistent", False)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        monkeypatch.setattr(settings, "embedding_api_base", server.api_base)
+        (tmp_path / "a.cpp").write_text("bool validarCpf() { return true; }\n")
+        (tmp_path / "b.cpp").write_text("bool checkLimit() { return true; }\n")
+        yield tmp_path
+
+
+def project_rules(project, description=""):
+    return [
+        make_rule(str(project / "a.cpp"), "validarCpf", description),
+        make_rule(str(project / "b.cpp"), "checkLimit", description),
+    ]
+
+
+def test_unchanged_project_reuses_index(project):
+    store, _ = run_prepare(project, project_rules(project))
+    assert store.collection.count() == 2
+
+    reused, context = run_prepare(project, project_rules(project, "nova"))
+    assert reused is store
+    assert context.intermediates["index_reused"] is True
+    assert context.intermediates["indexed_rules"] == 0
+
+
+def test_project_without_rules_reuses_its_manifest(project):
+    store, context = run_prepare(project, [])
+    assert store.collection.count() == 0
+
+    _, context = run_prepare(project, [])
+    assert context.intermediates["index_reused"] is True
+
+
+def test_empty_inventory_is_not_rescanned(project, monkeypatch):
+    def fail_scan(project_path):
+        raise AssertionError("project rescanned")
+
+    monkeypatch.setattr("src.pipelines.project.prepare_vector_store.scan_project", fail_scan)
+    _, context = run_prepare(project, [], inventory=FileInventory(str(project), []))
+    assert context.intermediates["indexed_rules"] == 0
+
+
+def test_failed_update_is_retried_on_next_run(project, monkeypatch):
+    run_prepare(project, project_rules(project))
+    (project / "a.cpp").write_text("bool validarCpf() { return false; }\n")
+
+    def failing_store_rules(self, rules):
+        raise RuntimeError("embedding API down")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(VectorStore, "store_rules", failing_store_rules)
+        with pytest.raises(RuntimeError):
+            run_prepare(project, project_rules(project, "nova"))
+
+    store, context = run_prepare(project, project_rules(project, "nova"))
+    assert context.intermediates["indexed_rules"] == 1
+    assert [d for p, _, d in rule_descriptions(store) if p.endswith("a.cpp")] == ["nova"]
+
+
+def test_streaming_only_updates_changed_and_removed_files(project):
+    run_prepare(project, project_rules(project), streaming=True)
+    (project / "b.cpp").unlink()
+
+    store, context = run_prepare(project, project_rules(project)[:1], streaming=True)
+    assert context.intermediates["indexed_rules"] == 0
+    assert [p for p, _, _ in rule_descriptions(store)] == [str(project / "a.cpp")]
+
+
+def test_persistent_index_is_reused_after_reopening(tmp_path, monkeypatch):
+    settings = get_settings().vector_store
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.cpp").write_text("bool validarCpf() { return true; }\n")
+    (project / "b.cpp").write_text("bool checkLimit() { return true; }\n")
+
+    with FakeEmbeddingServer() as server:
+        monkeypatch.setattr(settings, "persistent", True)
+        monkeypatch.setattr(settings, "persist_directory", str(tmp_path / "chroma"))
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        monkeypatch.setattr(settings, "embedding_api_base", server.api_base)
+
+        run_prepare(project, project_rules(project))
+        assert server.requests
+        get_container().reset()
+
+        # Outro processo (aqui: outra VectorStore) encontra o índice em disco
+        reopened = VectorStore(project_path=str(project))
+        assert reopened.collection.count() == 2
+        reopened.close()
+
+        embedded = len(server.requests)
+        _, context = run_prepare(project, project_rules(project))
+        get_container().reset()
+
+    assert context.intermediates["index_reused"] is True
+    assert context.intermediates["indexed_rules"] == 0
+    assert len(server.requests) == embedded